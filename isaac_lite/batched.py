@@ -0,0 +1,284 @@
+import random
+import numpy as np
+from isaac_lite.game import (ROOM_W, ROOM_H, PLAYER_RADIUS, ENEMY_RADIUS, DIRECTIONS, DOOR_W, entry_position,
+                             generate_layout, room_doors, room_enemies)
+
+BULLET_RADIUS = 4
+BULLET_SPEED = 6
+BULLET_LIFETIME = 60
+ENEMY_SPEED = 1.0
+
+# Per-action lookup tables (same mapping as SimpleGame.step / SimpleGame.shoot)
+MOVE_DX = np.array([0, 0, -1, 1, 0, 0, 0, 0, 0], dtype=np.float64)
+MOVE_DY = np.array([-1, 1, 0, 0, 0, 0, 0, 0, 0], dtype=np.float64)
+SHOOT = np.array([False, False, False, False, False, True, True, True, True])
+SHOOT_DX = np.array([0, 0, 0, 0, 0, 0, 0, -1, 1], dtype=np.float64)
+SHOOT_DY = np.array([0, 0, 0, 0, 0, -1, 1, 0, 0], dtype=np.float64)
+
+
+class BatchedGame:
+    """N SimpleGames held as NumPy arrays and advanced with one vectorized step.
+
+    Every game follows the exact rules of SimpleGame, so game i produces the
+    same trajectory as a SimpleGame seeded the same way and fed the same actions.
+    """
+
+    def __init__(self, n_games, rngs=None, max_rooms=4, max_enemies=4, max_bullets=BULLET_LIFETIME):
+        self.n_games = n_games
+        self.rngs = rngs or [random.Random() for _ in range(n_games)]
+        self.max_rooms = max_rooms
+        self.max_enemies = max_enemies
+        # A bullet lives at most BULLET_LIFETIME ticks and at most one is fired
+        # per tick, so a ring of that size never overwrites a live bullet.
+        self.max_bullets = max_bullets
+
+        n, e, b = n_games, max_enemies, max_bullets
+
+        self.player_x = np.zeros(n, dtype=np.float64)
+        self.player_y = np.zeros(n, dtype=np.float64)
+        self.player_hp = np.zeros(n, dtype=np.int64)
+        self.player_speed = np.zeros(n, dtype=np.float64)
+        self.player_damage = np.zeros(n, dtype=np.float64)
+
+        self.enemy_x = np.zeros((n, e), dtype=np.float64)
+        self.enemy_y = np.zeros((n, e), dtype=np.float64)
+        self.enemy_hp = np.zeros((n, e), dtype=np.float64)
+        self.enemy_alive = np.zeros((n, e), dtype=bool)
+        self.n_enemies = np.zeros(n, dtype=np.int64)
+
+        # Bullet ring buffer; slot `bullet_head` is the next one written and,
+        # because of the ring size, also the oldest one.
+        self.bullet_x = np.zeros((n, b), dtype=np.float64)
+        self.bullet_y = np.zeros((n, b), dtype=np.float64)
+        self.bullet_dx = np.zeros((n, b), dtype=np.float64)
+        self.bullet_dy = np.zeros((n, b), dtype=np.float64)
+        self.bullet_life = np.zeros((n, b), dtype=np.int64)
+        self.bullet_head = np.zeros(n, dtype=np.int64)
+
+        self.frame = np.zeros(n, dtype=np.int64)
+        self.rooms_visited = [set([(0, 0)]) for _ in range(n)]
+
+        # Dungeon state, per game; see SimpleGame.enter_room
+        self.room = [(0, 0)] * n
+        self.rooms = [{} for _ in range(n)]
+        self.dungeon_seed = [None] * n
+        self.layout = [None] * n
+        self.doors = [()] * n
+        self.door_mask = np.zeros((n, len(DIRECTIONS)), dtype=bool)
+        # Games that went through a door on the last step
+        self.entered = np.zeros(n, dtype=bool)
+
+        self.reset()
+
+    def reset(self, seeds=None, idx=None):
+        """Reset the games in `idx` (all by default), optionally reseeding them."""
+        if idx is None:
+            idx = range(self.n_games)
+        for k, i in enumerate(idx):
+            if seeds is not None and seeds[k] is not None:
+                self.rngs[i].seed(seeds[k])
+            self._reset_one(i)
+
+    def _reset_one(self, i):
+        self.player_x[i] = ROOM_W // 2
+        self.player_y[i] = ROOM_H // 2
+        self.player_hp[i] = 10
+        self.player_speed[i] = 3.5
+        self.player_damage[i] = 1.0
+
+        self.enemy_alive[i] = False
+        self.bullet_life[i] = 0
+        self.bullet_head[i] = 0
+        self.rooms_visited[i] = set([(0, 0)])
+        self.frame[i] = 0
+        self.spawn_enemy(i)
+
+        self.room[i] = (0, 0)
+        self.rooms[i] = {}
+        if self.max_rooms > 1:
+            self.dungeon_seed[i] = self.rngs[i].getrandbits(32)
+            self.layout[i] = generate_layout(self.dungeon_seed[i], self.max_rooms)
+            self.doors[i] = room_doors(self.layout[i], (0, 0))
+        self.door_mask[i] = False
+        self.door_mask[i, list(self.doors[i])] = True
+
+    # ---------------------------------------------------------
+    def spawn_enemy(self, i):
+        # Same rng call order as SimpleGame.spawn_enemy
+        rng = self.rngs[i]
+        count = rng.randint(2, 4)
+        if count > self.max_enemies:
+            raise ValueError(f"max_enemies={self.max_enemies} is too small for {count} enemies")
+        for j in range(count):
+            self.enemy_x[i, j] = rng.randint(50, ROOM_W - 50)
+            self.enemy_y[i, j] = rng.randint(50, ROOM_H - 50)
+            self.enemy_hp[i, j] = rng.randint(1, 3)
+            self.enemy_alive[i, j] = True
+        self.n_enemies[i] = count
+
+    # ---------------------------------------------------------
+    def step(self, actions):
+        """Advances every game one tick.
+
+        Returns (damage_taken, enemies_killed, done) as arrays of length N.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+
+        # Movement + clamp inside room
+        self.player_x += MOVE_DX[actions] * self.player_speed
+        self.player_y += MOVE_DY[actions] * self.player_speed
+        np.clip(self.player_x, PLAYER_RADIUS, ROOM_W - PLAYER_RADIUS, out=self.player_x)
+        np.clip(self.player_y, PLAYER_RADIUS, ROOM_H - PLAYER_RADIUS, out=self.player_y)
+        self.entered[:] = False
+        if self.max_rooms > 1:
+            self._cross_doors(actions)
+
+        # Shooting: write into the ring slot at the head
+        shooters = np.flatnonzero(SHOOT[actions])
+        if shooters.size:
+            slot = self.bullet_head[shooters]
+            self.bullet_x[shooters, slot] = self.player_x[shooters]
+            self.bullet_y[shooters, slot] = self.player_y[shooters]
+            self.bullet_dx[shooters, slot] = SHOOT_DX[actions[shooters]]
+            self.bullet_dy[shooters, slot] = SHOOT_DY[actions[shooters]]
+            self.bullet_life[shooters, slot] = BULLET_LIFETIME
+            self.bullet_head[shooters] = (slot + 1) % self.max_bullets
+
+        # Update bullets
+        live = self.bullet_life > 0
+        self.bullet_x += np.where(live, self.bullet_dx * BULLET_SPEED, 0.0)
+        self.bullet_y += np.where(live, self.bullet_dy * BULLET_SPEED, 0.0)
+        self.bullet_life -= live
+
+        damage_taken = self._enemy_phase()
+        enemies_killed = self._bullet_phase()
+
+        self.frame += 1
+        done = self.player_hp <= 0
+        return damage_taken, enemies_killed, done
+
+    def _cross_doors(self, actions):
+        # Same test as game.door_crossing, for every game at once; the rare
+        # crossings are then handled one game at a time
+        x, y = self.player_x, self.player_y
+        mdx, mdy = MOVE_DX[actions], MOVE_DY[actions]
+        in_x = np.abs(x - ROOM_W / 2) <= DOOR_W / 2
+        in_y = np.abs(y - ROOM_H / 2) <= DOOR_W / 2
+        door = np.select([(mdy < 0) & (y <= PLAYER_RADIUS) & in_x,
+                          (mdy > 0) & (y >= ROOM_H - PLAYER_RADIUS) & in_x,
+                          (mdx < 0) & (x <= PLAYER_RADIUS) & in_y,
+                          (mdx > 0) & (x >= ROOM_W - PLAYER_RADIUS) & in_y], [0, 1, 2, 3], -1)
+        for i in np.flatnonzero(door >= 0):
+            if door[i] in self.doors[i]:
+                self.enter_room(i, int(door[i]))
+
+    def enter_room(self, i, d):
+        """Moves game i through door `d`, freezing the room it leaves."""
+        n = self.n_enemies[i]
+        alive = self.enemy_alive[i, :n]
+        self.rooms[i][self.room[i]] = np.stack(
+            [self.enemy_x[i, :n][alive], self.enemy_y[i, :n][alive], self.enemy_hp[i, :n][alive]], axis=1)
+        self.bullet_life[i] = 0
+
+        dx, dy = DIRECTIONS[d]
+        room = (self.room[i][0] + dx, self.room[i][1] + dy)
+        rows = self.rooms[i].pop(room, None)
+        if rows is None:
+            rows = np.array(room_enemies(self.dungeon_seed[i], room), dtype=np.float64).reshape(-1, 3)
+        count = len(rows)
+        if count > self.max_enemies:
+            raise ValueError(f"max_enemies={self.max_enemies} is too small for {count} enemies")
+        self.enemy_alive[i] = False
+        self.enemy_x[i, :count] = rows[:, 0]
+        self.enemy_y[i, :count] = rows[:, 1]
+        self.enemy_hp[i, :count] = rows[:, 2]
+        self.enemy_alive[i, :count] = True
+        self.n_enemies[i] = count
+
+        self.room[i] = room
+        self.doors[i] = room_doors(self.layout[i], room)
+        self.door_mask[i] = False
+        self.door_mask[i, list(self.doors[i])] = True
+        self.rooms_visited[i].add(room)
+        self.player_x[i], self.player_y[i] = entry_position(self.player_x[i], self.player_y[i], d)
+        self.entered[i] = True
+
+    def _enemy_phase(self):
+        # Enemy behavior (simple homing) + contact damage
+        alive = self.enemy_alive
+        dx = self.player_x[:, None] - self.enemy_x
+        dy = self.player_y[:, None] - self.enemy_y
+        d2 = dx * dx + dy * dy
+        dist = np.sqrt(d2)
+
+        hits = alive & (d2 < (PLAYER_RADIUS + ENEMY_RADIUS) ** 2)
+
+        # SimpleGame stops processing enemies once a hit drops hp to zero, so
+        # enemies after that one neither move nor deal damage this tick.
+        cum_hits = np.cumsum(hits, axis=1)
+        breaks = hits & ((self.player_hp[:, None] - cum_hits) <= 0)
+        before_break = (np.cumsum(breaks, axis=1) - breaks) == 0
+        processed = alive & before_break
+
+        move = processed & (dist > 0)
+        safe = np.where(move, dist, 1.0)
+        self.enemy_x += np.where(move, (dx / safe) * ENEMY_SPEED, 0.0)
+        self.enemy_y += np.where(move, (dy / safe) * ENEMY_SPEED, 0.0)
+
+        damage = (hits & processed).sum(axis=1)
+        self.player_hp -= damage
+        return damage
+
+    def _bullet_phase(self):
+        killed = np.zeros(self.n_games, dtype=np.int64)
+
+        # Broad pass over live bullets only
+        r, s = np.nonzero(self.bullet_life > 0)
+        if r.size == 0:
+            return killed
+        dx = self.bullet_x[r, s][:, None] - self.enemy_x[r]
+        dy = self.bullet_y[r, s][:, None] - self.enemy_y[r]
+        contact = self.enemy_alive[r] & (dx * dx + dy * dy < (ENEMY_RADIUS + BULLET_RADIUS) ** 2)
+        hit = contact.any(axis=1)
+        if not hit.any():
+            return killed
+        r, s, contact = r[hit], s[hit], contact[hit]
+
+        # Only games with a contact pay for the ordered resolution below.
+        # Lay their bullets out oldest-first, matching SimpleGame's list order.
+        hit_rows, local = np.unique(r, return_inverse=True)
+        age = (s - self.bullet_head[r]) % self.max_bullets
+        overlap = np.zeros((hit_rows.size, self.max_bullets, self.max_enemies), dtype=bool)
+        overlap[local, age] = contact
+
+        # Each enemy absorbs overlapping bullets in order until it dies
+        dmg = self.player_damage[hit_rows, None]
+        hp = self.enemy_hp[hit_rows]
+        needed = np.ceil(hp / dmg)
+        rank = np.cumsum(overlap, axis=1) - overlap
+        consumed = overlap & (rank < needed[:, None, :])
+
+        n_hits = consumed.sum(axis=1)
+        hp -= n_hits * dmg
+        dead = (n_hits > 0) & (hp <= 0)
+        self.enemy_hp[hit_rows] = hp
+        self.enemy_alive[hit_rows] &= ~dead
+        killed[hit_rows] = dead.sum(axis=1)
+
+        spent = consumed[local, age].any(axis=1)
+        self.bullet_life[r[spent], s[spent]] = 0
+        return killed
+
+    # ---------------------------------------------------------
+    def snapshot(self, i):
+        """Same dict SimpleGame._snapshot returns, for game i."""
+        n = self.n_enemies[i]
+        return {
+            "player": [float(self.player_x[i]), float(self.player_y[i]), int(self.player_hp[i])],
+            "enemies": [
+                [float(x), float(y), bool(a)]
+                for x, y, a in zip(self.enemy_x[i, :n], self.enemy_y[i, :n], self.enemy_alive[i, :n])
+            ],
+            "rooms_visited": self.rooms_visited[i],
+            "room": self.room[i],
+        }
@@ -0,0 +1,68 @@
+def within(ax, ay, bx, by, radius):
+    """Squared-distance circle test; same as hypot(a - b) < radius without the sqrt."""
+    dx = ax - bx
+    dy = ay - by
+    return dx * dx + dy * dy < radius * radius
+
+
+class SpatialHash:
+    """Uniform grid over the room for broad-phase circle queries.
+
+    Items are bucketed by the cell their center falls in. A query returns every
+    item in the cells touched by the query circle's bounding box, which is a
+    superset of the real hits; callers finish with `within`. Positions outside
+    the room are clamped to the border cells, so nothing is ever missed.
+    """
+
+    def __init__(self, width, height, cell_size=32):
+        self.cell_size = cell_size
+        self.cols = int(width // cell_size) + 1
+        self.rows = int(height // cell_size) + 1
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        self._used = set()
+
+    def _col(self, x):
+        c = int(x // self.cell_size)
+        return 0 if c < 0 else (self.cols - 1 if c >= self.cols else c)
+
+    def _row(self, y):
+        r = int(y // self.cell_size)
+        return 0 if r < 0 else (self.rows - 1 if r >= self.rows else r)
+
+    def insert(self, item, x, y):
+        idx = self._row(y) * self.cols + self._col(x)
+        self.cells[idx].append(item)
+        self._used.add(idx)
+
+    def remove(self, item, x, y):
+        idx = self._row(y) * self.cols + self._col(x)
+        cell = self.cells[idx]
+        cell.remove(item)
+        if not cell:
+            self._used.discard(idx)
+
+    def clear(self):
+        for idx in self._used:
+            self.cells[idx].clear()
+        self._used.clear()
+
+    def __len__(self):
+        return sum(len(self.cells[idx]) for idx in self._used)
+
+    def query(self, x, y, radius):
+        """Candidates whose cell overlaps the box around (x, y) +- radius.
+
+        The returned list may be a cell's own storage; do not mutate it.
+        """
+        c0, c1 = self._col(x - radius), self._col(x + radius)
+        r0, r1 = self._row(y - radius), self._row(y + radius)
+        cells = self.cells
+        if c0 == c1 and r0 == r1:
+            return cells[r0 * self.cols + c0]
+
+        found = []
+        for r in range(r0, r1 + 1):
+            base = r * self.cols
+            for c in range(c0, c1 + 1):
+                found.extend(cells[base + c])
+        return found
@@ -2,29 +2,99 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 import random
+import math
 import time
 import json
 import os
-import pygame
-from isaac_lite.game import SimpleGame, ROOM_W, ROOM_H, PLAYER_RADIUS, ENEMY_RADIUS
+from isaac_lite.game import SimpleGame, ROOM_W, ROOM_H, PLAYER_RADIUS
+from isaac_lite.render import RENDERERS, make_renderer
+from isaac_lite.pixels import PixelObs
+from isaac_lite.observation import NearestObs
+from isaac_lite.metrics import EpisodeMetricsSink
+from isaac_lite.profiler import StepProfiler
+from isaac_lite.rewards import reward_fn
+from isaac_lite.state import StateReader, StateWriter
+
+LENGTH_BINS = 10
+BOOST_TYPES = ["speed", "damage"]
+PICKUP_R2 = (PLAYER_RADIUS * 2) ** 2
+EPISODE_KEYS = ['time_start', 'time_alive', 'enemies_killed', 'rooms_visited', 'damage_taken', 'shots_fired',
+                'deaths', 'truncated']
+
+
+def length_histogram(counts, max_steps):
+    """Episode-length histogram as saved in episode metrics; bins split
+    [0, max_steps] evenly, like np.histogram with the last bin closed."""
+    edges = np.linspace(0, max_steps, len(counts) + 1)
+    return {"edges": edges.tolist(), "counts": [int(c) for c in counts]}
+
+
+def length_bin(length, max_steps, bins=LENGTH_BINS):
+    return min(length * bins // max_steps, bins - 1)
 
 
 class IsaacLiteEnv(gym.Env):
-    metadata = {"render_modes": ["rgb_array"], "render_fps": 30}
+    metadata = {"render_modes": list(RENDERERS), "render_fps": 30}
 
-    def __init__(self, seed=None, persona='survivor', max_steps=200, log_dir="logs"):
+    def __init__(self, seed=None, persona='survivor', max_steps=200, log_dir="logs", obs_buffer=None,
+                 render_mode=None, obs_type="vector", pixel_shape=(84, 84), grayscale=True, frame_stack=4,
+                 frame_skip=1, metrics_path=None, profile=False, max_rooms=4, k_enemies=3, k_powerups=2,
+                 reward_config=None, reward_breakdown=False):
         super().__init__()
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be >= 1, got {frame_skip}")
+        self.frame_skip = frame_skip
+        if obs_type not in ("vector", "nearest", "pixels"):
+            raise ValueError(f"obs_type must be 'vector', 'nearest' or 'pixels', got {obs_type!r}")
+        if render_mode is not None and render_mode not in self.metadata["render_modes"]:
+            raise ValueError(f"render_mode must be one of {self.metadata['render_modes']}, got {render_mode!r}")
+        self.render_mode = render_mode
+        self.renderer = None
+        self.renderer_mode = None
         self.seed_val = seed if seed is not None else int(time.time())
-        self.rng = random.Random(self.seed_val)
+        # The game and the env (powerups, confetti) draw from their own RNGs,
+        # both reseeded from seed_val on reset, so an episode is a pure
+        # function of (seed, persona, actions) and can be replayed
+        self.rng = random.Random()
 
-        self.game = SimpleGame(rng=self.rng, max_rooms=4)
+        # Rooms in the dungeon; 1 is the original single-room game
+        self.game = SimpleGame(rng=random.Random(), max_rooms=max_rooms)
         self.action_space = spaces.Discrete(9)
 
+        # "vector" is the legacy 20-dim layout (first 3 enemies, first 2
+        # powerups, absolute positions) that the saved models were trained on
         obs_dim = 20
-        self.observation_space = spaces.Box(low=-9999, high=9999, shape=(obs_dim,), dtype=np.float32)
+        self.obs_type = obs_type
+        self.pixel_obs = None
+        self.nearest_obs = None
+        if obs_type == "pixels":
+            # Channel-first uint8 frames, `frame_stack` of them stacked on axis 0
+            if obs_buffer is not None:
+                raise ValueError("obs_buffer is only supported with vector observations")
+            self.pixel_obs = PixelObs(pixel_shape, grayscale=grayscale, frame_stack=frame_stack)
+            self.observation_space = spaces.Box(low=0, high=255, shape=self.pixel_obs.shape, dtype=np.uint8)
+        elif obs_type == "nearest":
+            # k nearest live enemies / powerups, relative and normalized, with masks
+            self.nearest_obs = NearestObs(k_enemies, k_powerups)
+            obs_dim = self.nearest_obs.dim
+            self.observation_space = self.nearest_obs.space()
+        else:
+            self.observation_space = spaces.Box(low=-9999, high=9999, shape=(obs_dim,), dtype=np.float32)
+
+        # Zero-copy mode: observations are written into this caller-owned
+        # array and it is returned as-is, so it changes on every step/reset.
+        if obs_buffer is not None and (obs_buffer.shape != (obs_dim,) or obs_buffer.dtype != np.float32):
+            raise ValueError(f"obs_buffer must be a float32 array of shape ({obs_dim},), "
+                             f"got {obs_buffer.dtype} {obs_buffer.shape}")
+        self.obs_buffer = obs_buffer
 
         self.persona = persona
-        self.max_steps = max_steps
+        # Reward terms of the persona, from configs/personas.yaml unless
+        # `reward_config` names another file; reward_breakdown adds the
+        # episode's running total of every term to info["reward_terms"]
+        self.reward_fn = reward_fn(persona, reward_config)
+        self.reward_totals = np.zeros(len(self.reward_fn.names)) if reward_breakdown else None
+        self.max_steps = max_steps  # game ticks per episode; None disables truncation
         self.log_dir = log_dir
         os.makedirs(log_dir, exist_ok=True)
 
@@ -38,18 +108,28 @@ class IsaacLiteEnv(gym.Env):
         self.confetti_particles = []
         self.killed_enemy_ids = set()
 
+        # Histogram of finished episode lengths, kept across resets
+        self.length_counts = np.zeros(LENGTH_BINS, dtype=np.int64)
+
+        # Optional per-episode JSONL log; written in batches, never per step
+        self.metrics_sink = EpisodeMetricsSink(metrics_path) if metrics_path else None
+        self.episodes_done = 0
+
         # Player stat baselines (defensive if missing in game)
         self.base_speed = getattr(self.game, "player_speed", 3.0)
         self.base_damage = getattr(self.game, "player_damage", 1.0)
 
+        # Per-phase step timings, see enable_profiler()
+        self.profiler = None
+        if profile:
+            self.enable_profiler()
+
         self.seed(seed)
 
     # SEED
     def seed(self, seed=None):
         self.seed_val = seed if seed is not None else int(time.time())
-        self.rng = random.Random(self.seed_val)
         self.np_random, _ = gym.utils.seeding.np_random(self.seed_val)
-        random.seed(self.seed_val)
         return [self.seed_val]
 
     # RESET
@@ -58,6 +138,7 @@ class IsaacLiteEnv(gym.Env):
             self.seed(seed)
 
         raw = self.game.reset(seed=self.seed_val)
+        self.rng.seed(f"env-{self.seed_val}")
 
         self.steps = 0
         self.score = 0.0
@@ -68,47 +149,128 @@ class IsaacLiteEnv(gym.Env):
         self.confetti_particles.clear()
         self.killed_enemy_ids.clear()
 
-        self.episode_metrics = 
-        {
+        self.episode_metrics = {
             'time_start': time.time(),
             'time_alive': 0,
             'enemies_killed': 0,
             'rooms_visited': len(raw.get('rooms_visited', [])),
             'damage_taken': 0,
             'shots_fired': 0,
-            'deaths': 0
+            'deaths': 0,
+            'truncated': 0
         }
 
         # For movement reward
         self.last_pos = (raw['player'][0], raw['player'][1])
+        if self.reward_totals is not None:
+            self.reward_totals[:] = 0.0
 
-        return self._format_obs(raw), {}
+        if self.pixel_obs is not None:
+            return self.pixel_obs.reset(self), {}
+        return self._vector_obs(), {}
 
     # STEP
     def step(self, action: int):
-        raw, info, done = self.game.step(action)
+        """Runs `frame_skip` game ticks with the same action.
+
+        Reward, damage and kills add up over the ticks, the loop stops early on
+        death, and the observation is built once after the last tick.
+        """
+        reward = 0.0
+        info = {"damage_taken": 0, "enemies_killed": 0, "shots_fired": 0}
+        for _ in range(self.frame_skip):
+            room = self.game.room
+            tick_info, done = self.game.tick(action)
+            if self.game.room != room:
+                # A door teleports the player; that jump is not movement
+                self.last_pos = (self.game.player_x, self.game.player_y)
+            reward += self._tick(action, tick_info)
+            info["damage_taken"] += tick_info["damage_taken"]
+            info["enemies_killed"] += tick_info["enemies_killed"]
+            info["shots_fired"] += tick_info["shots_fired"]
+            truncated = self.max_steps is not None and self.steps >= self.max_steps
+            if done or truncated:
+                break
+
+        # Death wins over the time limit when both happen on the same tick
+        truncated = truncated and not done
+        metrics = self.episode_metrics
+        metrics['time_alive'] = self.steps
+        metrics['damage_taken'] += info["damage_taken"]
+        metrics['shots_fired'] += info["shots_fired"]
+        if truncated:
+            info["TimeLimit.truncated"] = True
+            metrics['truncated'] = 1
+        if self.reward_totals is not None:
+            info["reward_terms"] = dict(zip(self.reward_fn.names, self.reward_totals.tolist()))
+        if done or truncated:
+            self._end_episode()
+
+        obs = self._observe()
+        if (done or truncated) and (self.pixel_obs is not None or self.obs_buffer is not None):
+            # The last observation of an episode outlives the reset that follows
+            # (DummyVecEnv keeps it as info["terminal_observation"]), so it must
+            # not share the buffer the reset writes into
+            obs = obs.copy()
+        return obs, float(reward), bool(done), truncated, info
+
+    def _end_episode(self):
+        if self.max_steps is not None:
+            self.length_counts[length_bin(self.steps, self.max_steps)] += 1
+        if self.metrics_sink is not None:
+            self.metrics_sink.append(dict(
+                self.episode_metrics, episode=self.episodes_done, seed=self.seed_val, persona=self.persona,
+                score=self.score, time_end=time.time()))
+        self.episodes_done += 1
+
+    def _tick(self, action, info):
+        """Env bookkeeping for one game tick; returns that tick's reward."""
         self.steps += 1
 
         # Random powerup spawns
-        if random.random() < 0.01:
+        if self.rng.random() < 0.01:
             self._spawn_powerup()
 
         # Decay / expire active boosts
         self._update_boosts()
 
         # Reward shaping
-        reward = self._compute_reward(raw, info, action)
+        reward = self._compute_reward(info, action)
         self.score += reward
 
-        # Handle powerup pickup
-        px, py, _ = raw['player']
-        for p in self.powerups[:]:
-            if np.hypot(p['x'] - px, p['y'] - py) < PLAYER_RADIUS * 2:
+        # Powerup pickup and kills
+        reward += self._pickup_powerups()
+        self._count_kills(info)
+
+        # Win condition (every enemy in every room dead)
+        if self.game.cleared():
+            if not self.win_frame:
+                self.win_frame = time.time()
+                self._spawn_confetti()
+
+        # Death condition
+        if self.game.player_hp <= 0:
+            self.episode_metrics['deaths'] += 1
+            self.death_frame = time.time()
+
+        return reward
+
+    def _pickup_powerups(self):
+        """Activates powerups the player touches; returns their reward."""
+        reward = 0.0
+        # A few powerups at a time: a plain loop beats a grid
+        px, py = self.game.player_x, self.game.player_y
+        for p in list(self.powerups):
+            dx = p['x'] - px
+            dy = p['y'] - py
+            if dx * dx + dy * dy < PICKUP_R2:
                 self._activate_boost(p)
-                self.powerups.remove(p)
+                self._remove_powerup(p)
                 reward += 2.0
                 self.score += 2.0
+        return reward
 
+    def _count_kills(self, info):
         # Count kills once
         info['enemies_killed'] = 0
         for e in self.game.enemies:
@@ -118,31 +280,20 @@ class IsaacLiteEnv(gym.Env):
                 self.score += 0.5
                 info['enemies_killed'] += 1
 
-        # Win condition (all enemies dead)
-        if all(not e.alive for e in self.game.enemies):
-            if not self.win_frame:
-                self.win_frame = time.time()
-                self._spawn_confetti()
-
-        # Death condition
-        if done and raw['player'][2] <= 0:
-            self.episode_metrics['deaths'] += 1
-            self.death_frame = time.time()
-
-        obs = self._format_obs(raw)
-        self.episode_metrics['time_alive'] = self.steps
-        # truncated is False here; SimpleGame decides 'done'
-        return obs, float(reward), bool(done), False, info
-
     # POWERUPS & BOOSTS
     def _spawn_powerup(self):
-        t = random.choice(["speed", "damage"])
-        self.powerups.append({
-            "x": random.uniform(50, ROOM_W - 50),
-            "y": random.uniform(50, ROOM_H - 50),
+        rng = self.rng
+        t = rng.choice(["speed", "damage"])
+        p = {
+            "x": rng.uniform(50, ROOM_W - 50),
+            "y": rng.uniform(50, ROOM_H - 50),
             "type": t,
-            "ttl": random.randint(150, 300)
-        })
+            "ttl": rng.randint(150, 300)
+        }
+        self.powerups.append(p)
+
+    def _remove_powerup(self, p):
+        self.powerups.remove(p)
 
     def _activate_boost(self, p):
         duration = 200
@@ -179,148 +330,62 @@ class IsaacLiteEnv(gym.Env):
         for p in self.powerups[:]:
             p["ttl"] -= 1
             if p["ttl"] <= 0:
-                self.powerups.remove(p)
+                self._remove_powerup(p)
 
     # REWARD FUNCTION
-    def _compute_reward(self, raw, info, action):
-        # Base shaping
-        r = -0.01  # discourage idling
-
-        # Combat terms
-        r += info.get('enemies_killed', 0) * 0.6
-        r -= info.get('damage_taken', 0) * 0.4
-
-        # Persona-specific
-        if self.persona == 'survivor':
-            if info.get('damage_taken', 0) == 0:
-                r += 0.02
-        elif self.persona == 'explorer':
-            current_rooms = len(raw.get('rooms_visited', []))
-            prev_rooms = self.episode_metrics.get('rooms_visited', 0)
-            if current_rooms > prev_rooms:
-                r += 0.4
-                self.episode_metrics['rooms_visited'] = current_rooms
-
-        # Movement reward
-        px, py = raw['player'][0], raw['player'][1]
+    def _compute_reward(self, info, action):
+        """Reward of one tick, from the persona's compiled reward terms."""
+        kills = info.get('enemies_killed', 0)
+        damage = info.get('damage_taken', 0)
+
+        # Rooms entered for the first time this tick
+        rooms = len(self.game.rooms_visited)
+        new_rooms = rooms - self.episode_metrics['rooms_visited']
+        self.episode_metrics['rooms_visited'] = rooms
+
+        # Distance moved since the last tick
+        px, py = self.game.player_x, self.game.player_y
         dx = px - self.last_pos[0]
         dy = py - self.last_pos[1]
-        dist_moved = np.sqrt(dx * dx + dy * dy)
+        moved = math.sqrt(dx * dx + dy * dy)
         self.last_pos = (px, py)
 
-        if dist_moved > 1.0:
-            r += 0.05 * dist_moved
-        else:
-            r -= 0.01
-
-        # Encourage directional movement and shooting a bit
-        if action in (0, 1, 2, 3):   # movement actions
-            r += 0.03
-        elif action in (5, 6, 7, 8): # shooting actions
-            r += 0.01
-
-        # Boundary logic
-        if px < 0 or px > ROOM_W or py < 0 or py > ROOM_H:
-            r -= 2.0  # touching / leaving bounds
-        else:
-            r += 0.02
-
-        # Active boost encouragement
-        for b in self.active_boosts:
-            if b == "speed":
-                r += 0.02
-            elif b == "damage":
-                r += 0.05 * info.get('enemies_killed', 0)
-
-        # Survival trickle
-        r += 0.03
-
-        # Cleans up rewards
-        return float(np.clip(r, -2.0, 2.0))
+        outside = px < 0 or px > ROOM_W or py < 0 or py > ROOM_H
+        boosts = self.active_boosts
+        signals = (kills, damage, new_rooms, moved, action, outside, "speed" in boosts, "damage" in boosts)
+        if self.reward_totals is not None:
+            self.reward_totals += self.reward_fn.scalar_terms(*signals)
+        return self.reward_fn.scalar(*signals)
 
     # RENDER
-    def render(self, mode='rgb_array'):
-        # Creates an off-screen surface and draw the whole HUD+world
-        surf = pygame.Surface((ROOM_W + 150, ROOM_H))
-        surf.fill((10, 10, 10))
-
-        # World
-        game_area = pygame.Surface((ROOM_W, ROOM_H))
-        game_area.fill((15, 15, 20))
-
-        # Player
-        pygame.draw.circle(
-            game_area,
-            (0, 200, 0),
-            (int(self.game.player_x), int(self.game.player_y)),
-            PLAYER_RADIUS
-        )
-
-        # Enemies
-        for e in self.game.enemies:
-            if e.alive:
-                pygame.draw.circle(game_area, (200, 0, 0), (int(e.x), int(e.y)), ENEMY_RADIUS)
-
-        # Bullets (turns redish orange when damage-boosted)
-        bullet_color = (255, 255, 0) if "damage" not in self.active_boosts else (255, 120, 0)
-        for b in self.game.shots:
-            pygame.draw.circle(game_area, bullet_color, (int(b.x), int(b.y)), 4)
-
-        # Powerups
-        for p in self.powerups:
-            color = (0, 255, 255) if p['type'] == 'speed' else (255, 0, 255)
-            pygame.draw.circle(game_area, color, (int(p['x']), int(p['y'])), 6)
-
-        surf.blit(game_area, (0, 0))
-
-        # HUD
-        font = pygame.font.SysFont("consolas", 18)
-
-        lines = [
-            f"Score: {int(self.score)}",
-            f"Kills: {self.episode_metrics.get('enemies_killed', 0)}",
-            f"Boosts: {', '.join(self.active_boosts.keys()) or 'None'}",
-            f"Steps: {self.steps}"
-        ]
-        for i, l in enumerate(lines):
-            txt = font.render(l, True, (255, 255, 255))
-            surf.blit(txt, (ROOM_W + 10, 30 + i * 25))
-
-        # Death fade
-        if self.death_frame:
-            fade_alpha = self._get_death_fade_alpha()
-            skull_font = pygame.font.SysFont("consolas", 36, bold=True)
-            skull_text = skull_font.render("YOU DIED", True, (255, 80, 80))
-            skull_text.set_alpha(fade_alpha)
-            surf.blit(skull_text, skull_text.get_rect(center=(ROOM_W // 2, ROOM_H // 2)))
-
-        # Win
-        if self.win_frame:
-            self._update_confetti()
-            self._draw_confetti(surf)
-            win_font = pygame.font.SysFont("consolas", 36, bold=True)
-            win_text = win_font.render("YOU WON!", True, (255, 255, 100))
-            surf.blit(win_text, win_text.get_rect(center=(ROOM_W // 2, ROOM_H // 2)))
-
-        # Return RGB array (H, W, 3)
-        arr = np.transpose(np.array(pygame.surfarray.pixels3d(surf)), (1, 0, 2))
-        return arr
+    def render(self, mode=None):
+        """Returns the frame as an (H, W, 3) uint8 array.
+
+        "rgb_array" draws with pygame, "rgb_array_headless" with pure NumPy (no
+        SDL needed). The array is reused between calls; copy it to keep it.
+        """
+        mode = mode or self.render_mode or "rgb_array"
+        if self.renderer is None or self.renderer_mode != mode:
+            self.renderer = make_renderer(mode)
+            self.renderer_mode = mode
+        return self.renderer.render(self)
 
     # CONFETTI EFFECTS
     def _spawn_confetti(self):
+        rng = self.rng
         self.confetti_particles = []
         for _ in range(80):
             self.confetti_particles.append({
-                "x": random.randint(0, ROOM_W),
-                "y": random.randint(0, ROOM_H),
-                "vx": random.uniform(-2, 2),
-                "vy": random.uniform(-5, -1),
+                "x": rng.randint(0, ROOM_W),
+                "y": rng.randint(0, ROOM_H),
+                "vx": rng.uniform(-2, 2),
+                "vy": rng.uniform(-5, -1),
                 "color": (
-                    random.randint(100, 255),
-                    random.randint(100, 255),
-                    random.randint(100, 255)
+                    rng.randint(100, 255),
+                    rng.randint(100, 255),
+                    rng.randint(100, 255)
                 ),
-                "life": random.randint(30, 60)
+                "life": rng.randint(30, 60)
             })
 
     def _update_confetti(self):
@@ -332,32 +397,38 @@ class IsaacLiteEnv(gym.Env):
             if c["life"] <= 0:
                 self.confetti_particles.remove(c)
 
-    def _draw_confetti(self, surface):
-        for c in self.confetti_particles:
-            pygame.draw.circle(surface, c["color"], (int(c["x"]), int(c["y"])), 3)
-
     # OBSERVATION VECTOR
-    def _format_obs(self, raw):
-        px, py, ph = raw.get('player', (0, 0, 0))
-        obs = np.zeros(self.observation_space.shape, dtype=np.float32)
-
-        # player
-        obs[0:3] = [px, py, ph]
-
-        # enemies (up to 3)
-        enemies = raw.get("enemies", [])
-        for i, e in enumerate(enemies[:3]):
-            if isinstance(e, tuple):
-                ex, ey, alive = e if len(e) == 3 else (e[0], e[1], 1.0)
-            else:
-                ex = getattr(e, "x", 0.0)
-                ey = getattr(e, "y", 0.0)
-                alive = 1.0 if getattr(e, "alive", True) else 0.0
-            obs[3 + i * 3: 6 + i * 3] = [ex, ey, alive]
+    def _observe(self):
+        # Pixel stacks are views into PixelObs' ring, valid until the next step;
+        # step() copies the last one of an episode
+        if self.pixel_obs is not None:
+            return self.pixel_obs.push(self)
+        return self._vector_obs()
+
+    def _vector_obs(self):
+        if self.nearest_obs is not None:
+            return self.nearest_obs.observe(self, self.obs_buffer)
+        return self._format_obs(self.obs_buffer)
+
+    def _format_obs(self, out=None):
+        """Fills `out` (or a new array) with the 20-dim observation straight
+        from game/env state, without going through the snapshot dict."""
+        obs = np.empty(20, dtype=np.float32) if out is None else out
+
+        # player + enemies (up to 3) -> indices 0..11
+        self.game.write_obs(obs, max_enemies=3)
 
         # powerups (up to 2) -> indices 12..17
-        for i, p in enumerate(self.powerups[:2]):
-            obs[12 + i * 3: 15 + i * 3] = [p["x"], p["y"], 1.0]
+        powerups = self.powerups
+        for i in range(2):
+            j = 12 + i * 3
+            if i < len(powerups):
+                p = powerups[i]
+                obs[j] = p["x"]
+                obs[j + 1] = p["y"]
+                obs[j + 2] = 1.0
+            else:
+                obs[j:j + 3] = 0.0
 
         # boost flags -> indices 18,19
         obs[18] = 1.0 if "damage" in self.active_boosts else 0.0
@@ -365,6 +436,87 @@ class IsaacLiteEnv(gym.Env):
 
         return obs
 
+    # PROFILING
+    def enable_profiler(self, enabled=True):
+        """Starts (or with enabled=False stops) timing the phases of step()."""
+        if enabled and self.profiler is None:
+            self.profiler = StepProfiler()
+            self.profiler.attach(self)
+        elif not enabled and self.profiler is not None:
+            self.profiler.detach()
+            self.profiler = None
+
+    def profiler_stats(self, reset=False):
+        """Per-phase calls, total ns and mean us since the last reset; empty
+        when profiling is off."""
+        if self.profiler is None:
+            return {}
+        stats = self.profiler.stats()
+        if reset:
+            self.profiler.reset()
+        return stats
+
+    # STATE
+    def get_state(self):
+        """Everything needed to continue this episode exactly, as bytes.
+
+        Covers the game, powerups, boosts, reward/metric bookkeeping, effects,
+        the frame stack in pixel mode and the game and env RNG states.
+        Cumulative telemetry (length histogram, metrics sink) is not part of it.
+        """
+        w = StateWriter()
+        self.game.get_state(w)
+        nan = float("nan")
+        w.floats([self.seed_val, self.steps, self.score, self.last_pos[0], self.last_pos[1],
+                  self.death_frame or nan, self.win_frame or nan])
+        w.floats([v for p in self.powerups for v in (p["x"], p["y"], BOOST_TYPES.index(p["type"]), p["ttl"])])
+        w.floats([v for b, ttl in self.active_boosts.items() for v in (BOOST_TYPES.index(b), ttl)])
+        w.floats([i for i, e in enumerate(self.game.enemies) if e in self.killed_enemy_ids])
+        w.floats([self.episode_metrics[k] for k in EPISODE_KEYS])
+        w.floats([v for c in self.confetti_particles
+                  for v in (c["x"], c["y"], c["vx"], c["vy"], *c["color"], c["life"])])
+        if self.pixel_obs is not None:
+            w.floats([self.pixel_obs.pos])
+            w.bytes(self.pixel_obs.ring)
+        w.rng(self.rng)
+        return w.getvalue()
+
+    def set_state(self, state):
+        """Restores a get_state() blob and returns the current observation."""
+        r = StateReader(state)
+        self.game.set_state(r)
+        seed, steps, score, lx, ly, death, win = r.floats().tolist()
+        self.seed_val = int(seed)
+        self.steps = int(steps)
+        self.score = score
+        self.last_pos = (lx, ly)
+        self.death_frame = None if math.isnan(death) else death
+        self.win_frame = None if math.isnan(win) else win
+
+        self.powerups[:] = [{"x": x, "y": y, "type": BOOST_TYPES[int(t)], "ttl": int(ttl)}
+                            for x, y, t, ttl in r.floats().reshape(-1, 4).tolist()]
+
+        self.active_boosts = {BOOST_TYPES[int(b)]: int(ttl) for b, ttl in r.floats().reshape(-1, 2).tolist()}
+        self.killed_enemy_ids = {self.game.enemies[int(i)] for i in r.floats()}
+
+        values = r.floats().tolist()
+        self.episode_metrics = {k: (v if k == 'time_start' else int(v)) for k, v in zip(EPISODE_KEYS, values)}
+
+        self.confetti_particles = [
+            {"x": x, "y": y, "vx": vx, "vy": vy, "color": (int(cr), int(cg), int(cb)), "life": int(life)}
+            for x, y, vx, vy, cr, cg, cb, life in r.floats().reshape(-1, 8).tolist()
+        ]
+        if self.pixel_obs is not None:
+            self.pixel_obs.pos = int(r.floats()[0])
+            self.pixel_obs.ring.reshape(-1)[:] = np.frombuffer(r.bytes(), dtype=np.uint8)
+        r.rng(self.rng)
+
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        if self.pixel_obs is not None:
+            return self.pixel_obs.view()
+        return self._vector_obs()
+
     # UTILITIES
     def _get_death_fade_alpha(self):
         if not self.death_frame:
@@ -374,13 +526,24 @@ class IsaacLiteEnv(gym.Env):
         return int(255 * max(0.0, 1.0 - elapsed / fade_duration))
 
     def save_episode_metrics(self, filename="episode_metrics.json"):
+        """Snapshot of the current episode plus the length histogram; the
+        full per-episode log is the metrics_path sink, flushed here too."""
+        if self.metrics_sink is not None:
+            self.metrics_sink.flush()
         path = os.path.join(self.log_dir, filename)
+        metrics = dict(self.episode_metrics)
+        if self.max_steps is not None:
+            metrics['episode_length_hist'] = length_histogram(self.length_counts, self.max_steps)
 
         with open(path, "w") as f:
-            json.dump(self.episode_metrics, f, indent=2)
+            json.dump(metrics, f, indent=2)
 
         print(f"Saved metrics to {path} :)")
 
     
     def close(self):
-        pass
+        if self.metrics_sink is not None:
+            self.metrics_sink.close()
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None
@@ -1,13 +1,30 @@
 import random
 import math
 import numpy as np
+from isaac_lite.collision import SpatialHash, within
+from isaac_lite.state import StateReader, StateWriter
 
 ROOM_W, ROOM_H = 640, 480
 PLAYER_RADIUS = 12
 ENEMY_RADIUS = 10
 
+# Dungeon: rooms on a grid, joined by doors in the middle of their walls.
+# Up is -y, so north is the room at (rx, ry - 1).
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))  # N, S, W, E
+DOOR_W = 80
+DOOR_DEPTH = 6
+# How far inside the wall the player appears after walking through a door
+ENTRY_INSET = 3 * PLAYER_RADIUS
+
+CONTACT_R2 = (PLAYER_RADIUS + ENEMY_RADIUS) ** 2
+# Enemies in a room from which the bullet test uses the SpatialHash broad
+# phase; below it, testing every pair is faster (see src/bench_collision.py)
+GRID_MIN_ENEMIES = 32
+
 
 class Entity:
+    __slots__ = ("x", "y", "radius", "hp", "alive")
+
     def __init__(self, x, y, radius, hp=1):
         self.x = x
         self.y = y
@@ -22,6 +39,8 @@ class Entity:
 
 
 class Bullet:
+    __slots__ = ("x", "y", "dx", "dy", "radius", "speed", "lifetime")
+
     def __init__(self, x, y, dx, dy, radius=4, speed=6, lifetime=60):
         self.x = x
         self.y = y
@@ -38,12 +57,122 @@ class Bullet:
         return self.lifetime > 0
 
 
+class BulletPool:
+    """Fixed set of Bullet objects recycled through a free list.
+
+    At most one bullet is fired per tick and each lives 60 ticks, so the
+    default capacity covers steady play; the pool grows if it ever runs dry.
+    """
+
+    def __init__(self, capacity=60):
+        self.free = [Bullet(0, 0, 0, 0, lifetime=0) for _ in range(capacity)]
+
+    def acquire(self, x, y, dx, dy, lifetime=60):
+        if not self.free:
+            return Bullet(x, y, dx, dy, lifetime=lifetime)
+        b = self.free.pop()
+        b.x = x
+        b.y = y
+        b.dx = dx
+        b.dy = dy
+        b.lifetime = lifetime
+        return b
+
+    def release(self, b):
+        self.free.append(b)
+
+
+def generate_layout(seed, max_rooms):
+    """Grid cells of a dungeon: `max_rooms` connected cells grown from (0, 0)."""
+    rng = random.Random(seed)
+    cells = [(0, 0)]
+    taken = {(0, 0)}
+    while len(cells) < max_rooms:
+        x, y = rng.choice(cells)
+        dx, dy = rng.choice(DIRECTIONS)
+        if (x + dx, y + dy) not in taken:
+            taken.add((x + dx, y + dy))
+            cells.append((x + dx, y + dy))
+    return frozenset(taken)
+
+
+def room_doors(layout, room):
+    """Indices into DIRECTIONS of the doors of `room`."""
+    x, y = room
+    return tuple(d for d, (dx, dy) in enumerate(DIRECTIONS) if (x + dx, y + dy) in layout)
+
+
+def room_enemies(seed, room):
+    """Spawn table of a room as (x, y, hp) rows. It depends only on the dungeon
+    seed and the room, so a room is the same whenever it is first entered."""
+    rng = random.Random(f"{seed}:{room[0]}:{room[1]}")
+    return [(rng.randint(50, ROOM_W - 50), rng.randint(50, ROOM_H - 50), rng.randint(1, 3))
+            for _ in range(rng.randint(2, 4))]
+
+
+def door_crossing(x, y, dx, dy):
+    """Direction index of the door a player at (x, y), pushing against the
+    wall by moving (dx, dy), walks through; -1 if none."""
+    in_x = abs(x - ROOM_W / 2) <= DOOR_W / 2
+    in_y = abs(y - ROOM_H / 2) <= DOOR_W / 2
+    if dy < 0 and y <= PLAYER_RADIUS and in_x:
+        return 0
+    if dy > 0 and y >= ROOM_H - PLAYER_RADIUS and in_x:
+        return 1
+    if dx < 0 and x <= PLAYER_RADIUS and in_y:
+        return 2
+    if dx > 0 and x >= ROOM_W - PLAYER_RADIUS and in_y:
+        return 3
+    return -1
+
+
+def entry_position(x, y, d):
+    """Where a player who left through door `d` at (x, y) stands in the next room."""
+    if d == 0:
+        return x, ROOM_H - ENTRY_INSET
+    if d == 1:
+        return x, ENTRY_INSET
+    if d == 2:
+        return ROOM_W - ENTRY_INSET, y
+    return ENTRY_INSET, y
+
+
+def door_rect(d):
+    """(x0, y0, x1, y1) of door `d` on the room's wall, for drawing."""
+    if d < 2:
+        x0 = ROOM_W // 2 - DOOR_W // 2
+        y0 = 0 if d == 0 else ROOM_H - DOOR_DEPTH
+        return x0, y0, x0 + DOOR_W, y0 + DOOR_DEPTH
+    y0 = ROOM_H // 2 - DOOR_W // 2
+    x0 = 0 if d == 2 else ROOM_W - DOOR_DEPTH
+    return x0, y0, x0 + DOOR_DEPTH, y0 + DOOR_W
+
+
+# Directions: up=5, down=6, left=7, right=8
+SHOT_DIRS = {
+    5: (0, -1),
+    6: (0, 1),
+    7: (-1, 0),
+    8: (1, 0)
+}
+
+
 class SimpleGame:
-    """Game"""
+    """Game
+
+    With max_rooms > 1 the game is a dungeon of that many rooms. Only the
+    room the player is in is simulated: a room is generated from the seed
+    the first time it is entered, and when the player leaves, its live
+    enemies are frozen into a small array until they return.
+    """
 
     def __init__(self, rng=None, max_rooms=4):
         self.rng = rng or random.Random()
         self.max_rooms = max_rooms
+        self._enemy_grid = SpatialHash(ROOM_W, ROOM_H)
+        self.bullet_pool = BulletPool()
+        self.shots = []
+        self._snap = {"player": [0, 0, 0], "enemies": [], "rooms_visited": None}
         self.reset()
 
     def reset(self, seed=None):
@@ -57,11 +186,23 @@ class SimpleGame:
         self.player_damage = 1.0
 
         self.enemies = []
-        self.shots = []
+        for b in self.shots:
+            self.bullet_pool.release(b)
+        self.shots.clear()
         self.rooms_visited = set([(0, 0)])
         self.frame = 0
         self.spawn_enemy()
 
+        self.room = (0, 0)
+        self.rooms = {}  # frozen rooms -> float array of live enemies (x, y, hp)
+        self.dungeon_seed = None
+        self.layout = None
+        self.doors = ()
+        if self.max_rooms > 1:
+            self.dungeon_seed = self.rng.getrandbits(32)
+            self.layout = generate_layout(self.dungeon_seed, self.max_rooms)
+            self.doors = room_doors(self.layout, self.room)
+
         return self._snapshot()
 
     # ---------------------------------------------------------
@@ -75,6 +216,11 @@ class SimpleGame:
     # ---------------------------------------------------------
     def step(self, action):
         """Performs a game tick based on an integer action."""
+        info, done = self.tick(action)
+        return self._snapshot(), info, done
+
+    def tick(self, action):
+        """step() without the snapshot, for callers that read game state directly."""
         dx = dy = 0
 
         # Movement
@@ -99,14 +245,21 @@ class SimpleGame:
         self.player_x = max(PLAYER_RADIUS, min(ROOM_W - PLAYER_RADIUS, self.player_x))
         self.player_y = max(PLAYER_RADIUS, min(ROOM_H - PLAYER_RADIUS, self.player_y))
 
+        # Walking into a door moves the player to the next room
+        if self.doors and (dx or dy):
+            d = door_crossing(self.player_x, self.player_y, dx, dy)
+            if d in self.doors:
+                self.enter_room(d)
+
         # Shooting
-        if action in (5, 6, 7, 8):
+        shot = action in (5, 6, 7, 8)
+        if shot:
             self.shoot(action)
 
         # Update bullets
-        self.shots = [b for b in self.shots if b.step()]
+        self._sweep_shots(advance=True)
 
-        info = {"damage_taken": 0, "enemies_killed": 0}
+        info = {"damage_taken": 0, "enemies_killed": 0, "shots_fired": int(shot)}
 
         # Enemy behavior (simple homing)
         for e in self.enemies:
@@ -115,50 +268,203 @@ class SimpleGame:
             ex, ey = e.x, e.y
             dx = self.player_x - ex
             dy = self.player_y - ey
-            dist = math.sqrt(dx * dx + dy * dy)
-            if dist > 0:
+            if dx or dy:
+                dist = math.sqrt(dx * dx + dy * dy)
                 e.x += (dx / dist) * 1.0
                 e.y += (dy / dist) * 1.0
 
-            # Collision with player
-            if dist < PLAYER_RADIUS + ENEMY_RADIUS:
+            # Collision with player (tested at the pre-move position)
+            if dx * dx + dy * dy < CONTACT_R2:
                 self.player_hp -= 1
                 info["damage_taken"] += 1
                 if self.player_hp <= 0:
                     break
 
-        # Bullet collision
-        for b in self.shots:
-            for e in self.enemies:
-                if e.alive and math.hypot(b.x - e.x, b.y - e.y) < e.radius + b.radius:
-                    e.hit(self.player_damage)
-                    if not e.alive:
-                        info["enemies_killed"] += 1
-                    b.lifetime = 0
-
-        self.shots = [b for b in self.shots if b.lifetime > 0]
+        # Bullet collision, in enemy order. A room holds a handful of enemies,
+        # where testing every pair beats rebuilding the grid each tick; the
+        # grid broad phase only pays off from GRID_MIN_ENEMIES up
+        if self.shots:
+            if len(self.enemies) < GRID_MIN_ENEMIES:
+                for b in self.shots:
+                    bx, by = b.x, b.y
+                    for e in self.enemies:
+                        if not e.alive:
+                            continue
+                        dx = bx - e.x
+                        dy = by - e.y
+                        r = e.radius + b.radius
+                        if dx * dx + dy * dy < r * r:
+                            e.hit(self.player_damage)
+                            if not e.alive:
+                                info["enemies_killed"] += 1
+                            b.lifetime = 0
+            else:
+                grid = self._enemy_grid
+                grid.clear()
+                for i, e in enumerate(self.enemies):
+                    if e.alive:
+                        grid.insert(i, e.x, e.y)
+                for b in self.shots:
+                    for i in sorted(grid.query(b.x, b.y, ENEMY_RADIUS + b.radius)):
+                        e = self.enemies[i]
+                        if e.alive and within(b.x, b.y, e.x, e.y, e.radius + b.radius):
+                            e.hit(self.player_damage)
+                            if not e.alive:
+                                info["enemies_killed"] += 1
+                            b.lifetime = 0
+
+        self._sweep_shots(advance=False)
         self.frame += 1
 
-        done = self.player_hp <= 0
-        return self._snapshot(), info, done
+        return info, self.player_hp <= 0
+
+    # ---------------------------------------------------------
+    def enter_room(self, d):
+        """Leaves the current room through door `d`."""
+        # Freeze the room being left; dead enemies are dropped
+        self.rooms[self.room] = np.array([(e.x, e.y, e.hp) for e in self.enemies if e.alive],
+                                         dtype=np.float64).reshape(-1, 3)
+        for b in self.shots:
+            self.bullet_pool.release(b)
+        self.shots.clear()
+
+        dx, dy = DIRECTIONS[d]
+        self.room = (self.room[0] + dx, self.room[1] + dy)
+        rows = self.rooms.pop(self.room, None)
+        if rows is None:
+            rows = room_enemies(self.dungeon_seed, self.room)
+        else:
+            rows = rows.tolist()
+        self.enemies = [Entity(x, y, ENEMY_RADIUS, hp=hp) for x, y, hp in rows]
+        self.doors = room_doors(self.layout, self.room)
+        self.rooms_visited.add(self.room)
+        self.player_x, self.player_y = entry_position(self.player_x, self.player_y, d)
+
+    def cleared(self):
+        """True once every enemy of every room of the dungeon is dead."""
+        if any(e.alive for e in self.enemies):
+            return False
+        if self.layout is None:
+            return True
+        return len(self.rooms_visited) == len(self.layout) and not any(len(r) for r in self.rooms.values())
 
     # ---------------------------------------------------------
     def shoot(self, action):
-        # Directions: up=5, down=6, left=7, right=8
-        dirs = {
-            5: (0, -1),
-            6: (0, 1),
-            7: (-1, 0),
-            8: (1, 0)
-        }
-        dx, dy = dirs.get(action, (0, 0))
-        b = Bullet(self.player_x, self.player_y, dx, dy)
-        self.shots.append(b)
+        dx, dy = SHOT_DIRS.get(action, (0, 0))
+        self.shots.append(self.bullet_pool.acquire(self.player_x, self.player_y, dx, dy))
+
+    def _sweep_shots(self, advance):
+        # Compacts self.shots in place, keeping order; spent bullets go back to the pool
+        shots = self.shots
+        pool = self.bullet_pool
+        n = 0
+        for b in shots:
+            if b.step() if advance else b.lifetime > 0:
+                shots[n] = b
+                n += 1
+            else:
+                pool.release(b)
+        del shots[n:]
+
+    # ---------------------------------------------------------
+    def write_obs(self, out, max_enemies=3):
+        """Writes player (x, y, hp) and the first `max_enemies` enemies
+        (x, y, alive) into out[0 : 3 + 3 * max_enemies]; missing enemies are zeros."""
+        out[0] = self.player_x
+        out[1] = self.player_y
+        out[2] = self.player_hp
+
+        enemies = self.enemies
+        n = min(len(enemies), max_enemies)
+        for i in range(n):
+            e = enemies[i]
+            j = 3 + 3 * i
+            out[j] = e.x
+            out[j + 1] = e.y
+            out[j + 2] = 1.0 if e.alive else 0.0
+        out[3 + 3 * n:3 + 3 * max_enemies] = 0.0
+        return out
+
+    # ---------------------------------------------------------
+    def get_state(self, writer=None):
+        """Full game state, RNG included, as a bytes blob for set_state().
+
+        With a StateWriter the sections are appended to it instead, so the
+        env can wrap the game state in its own blob.
+        """
+        w = writer or StateWriter()
+        w.floats([self.player_x, self.player_y, self.player_hp, self.player_speed, self.player_damage,
+                  self.frame])
+        w.floats([v for e in self.enemies for v in (e.x, e.y, e.radius, e.hp, e.alive)])
+        w.floats([v for b in self.shots for v in (b.x, b.y, b.dx, b.dy, b.radius, b.speed, b.lifetime)])
+        w.floats([v for room in sorted(self.rooms_visited) for v in room])
+        w.floats([self.room[0], self.room[1], math.nan if self.dungeon_seed is None else self.dungeon_seed])
+        w.floats([v for room, rows in self.rooms.items() for v in (room[0], room[1], len(rows), *rows.ravel())])
+        w.rng(self.rng)
+        return w.getvalue() if writer is None else None
+
+    def set_state(self, state):
+        """Restores a get_state() blob (or continues reading a StateReader).
+        Enemies are rebuilt as new Entity objects; bullets come from the pool."""
+        r = state if isinstance(state, StateReader) else StateReader(state)
+        px, py, hp, speed, damage, frame = r.floats().tolist()
+        self.player_x, self.player_y = px, py
+        self.player_hp = int(hp)
+        self.player_speed = speed
+        self.player_damage = damage
+        self.frame = int(frame)
+
+        self.enemies = []
+        for x, y, radius, hp, alive in r.floats().reshape(-1, 5).tolist():
+            e = Entity(x, y, int(radius), hp=hp)
+            e.alive = bool(alive)
+            self.enemies.append(e)
+
+        for b in self.shots:
+            self.bullet_pool.release(b)
+        self.shots.clear()
+        for x, y, dx, dy, radius, speed, lifetime in r.floats().reshape(-1, 7).tolist():
+            b = self.bullet_pool.acquire(x, y, dx, dy, lifetime=int(lifetime))
+            b.radius = int(radius)
+            b.speed = speed
+            self.shots.append(b)
+
+        self.rooms_visited = {(int(x), int(y)) for x, y in r.floats().reshape(-1, 2).tolist()}
+
+        rx, ry, seed = r.floats().tolist()
+        self.room = (int(rx), int(ry))
+        self.dungeon_seed = None if math.isnan(seed) else int(seed)
+        self.layout = None if self.dungeon_seed is None else generate_layout(self.dungeon_seed, self.max_rooms)
+        self.doors = () if self.layout is None else room_doors(self.layout, self.room)
+        self.rooms = {}
+        frozen, i = r.floats(), 0
+        while i < len(frozen):
+            n = int(frozen[i + 2])
+            self.rooms[(int(frozen[i]), int(frozen[i + 1]))] = frozen[i + 3:i + 3 + 3 * n].reshape(n, 3).copy()
+            i += 3 + 3 * n
+        r.rng(self.rng)
 
     # ---------------------------------------------------------
     def _snapshot(self):
-        return {
-            "player": (self.player_x, self.player_y, self.player_hp),
-            "enemies": [(e.x, e.y, e.alive) for e in self.enemies],
-            "rooms_visited": self.rooms_visited,
-        }
+        """Current state as a dict of [x, y, ...] lists.
+
+        The dict and its lists are updated in place and reused between calls;
+        copy anything that has to outlive the next step.
+        """
+        snap = self._snap
+        player = snap["player"]
+        player[0] = self.player_x
+        player[1] = self.player_y
+        player[2] = self.player_hp
+
+        rows = snap["enemies"]
+        if len(rows) != len(self.enemies):
+            rows[:] = [[0, 0, True] for _ in self.enemies]
+        for row, e in zip(rows, self.enemies):
+            row[0] = e.x
+            row[1] = e.y
+            row[2] = e.alive
+
+        snap["rooms_visited"] = self.rooms_visited
+        snap["room"] = self.room
+        return snap
@@ -0,0 +1,61 @@
+import json
+import os
+import time
+
+
+class EpisodeMetricsSink:
+    """Append-only JSONL log with one line per finished episode.
+
+    append() only buffers the record; lines are written once `flush_every`
+    episodes have accumulated or `flush_interval` seconds have passed since the
+    last write, and on close(). Each flush is a single O_APPEND write, so
+    several processes (e.g. vec env workers) can share one file without
+    interleaving partial lines.
+    """
+
+    def __init__(self, path, flush_every=64, flush_interval=30.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.written = 0
+        self._last_flush = time.monotonic()
+
+        out_dir = os.path.dirname(path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def append(self, record):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.buffer and self.fd is not None:
+            data = "".join(json.dumps(r) + "\n" for r in self.buffer).encode()
+            os.write(self.fd, data)
+            self.written += len(self.buffer)
+            self.buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self.fd is not None:
+            self.flush()
+            os.close(self.fd)
+            self.fd = None
+
+    def __len__(self):
+        return self.written + len(self.buffer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_episode_metrics(path):
+    """Loads a sink file into a pandas DataFrame, one row per episode."""
+    import pandas as pd
+    return pd.read_json(path, lines=True)
@@ -0,0 +1,122 @@
+import numpy as np
+from gymnasium import spaces
+from isaac_lite.game import ROOM_W, ROOM_H
+
+MAX_HP = 10
+# Entity count from which _nearest_one uses NumPy instead of a plain sort
+NUMPY_MIN_ENTITIES = 64
+
+
+def _nearest(block, px, py, x, y, live):
+    """Writes the live entities nearest to each player into `block`
+    (N, k, 3) as (dx, dy, present), nearest first.
+
+    x, y and live are (N, M). argpartition picks the k nearest in O(M) per
+    row; only those k are sorted.
+    """
+    n, m = x.shape
+    k = block.shape[1]
+    block[:] = 0.0
+    if m == 0 or k == 0:
+        return
+    dx = x - px[:, None]
+    dy = y - py[:, None]
+    d2 = dx * dx + dy * dy
+    d2[~live] = np.inf
+    if m > k:
+        idx = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(d2, idx, 1), axis=1, kind="stable")
+        idx = np.take_along_axis(idx, order, 1)
+    else:
+        idx = np.argsort(d2, axis=1, kind="stable")
+    present = np.isfinite(np.take_along_axis(d2, idx, 1))
+    j = idx.shape[1]
+    block[:, :j, 0] = np.take_along_axis(dx, idx, 1) * present / ROOM_W
+    block[:, :j, 1] = np.take_along_axis(dy, idx, 1) * present / ROOM_H
+    block[:, :j, 2] = present
+
+
+def _nearest_one(out, px, py, xs, ys):
+    # Single-player version of _nearest into the flat (3 * k,) block, from
+    # coordinate lists. A plain sort wins at the few entities a room holds;
+    # argpartition pays off from NUMPY_MIN_ENTITIES up (crossover ~64-96).
+    k = len(out) // 3
+    out[:] = 0.0
+    if not xs or k == 0:
+        return
+    if len(xs) < NUMPY_MIN_ENTITIES:
+        nearest = sorted(zip(xs, ys), key=lambda p: (p[0] - px) ** 2 + (p[1] - py) ** 2)[:k]
+        for i, (x, y) in enumerate(nearest):
+            out[3 * i] = (x - px) / ROOM_W
+            out[3 * i + 1] = (y - py) / ROOM_H
+            out[3 * i + 2] = 1.0
+        return
+    dx = np.subtract(xs, px)
+    dy = np.subtract(ys, py)
+    d2 = dx * dx + dy * dy
+    idx = np.argpartition(d2, k - 1)[:k] if len(xs) > k else np.arange(len(xs))
+    idx = idx[np.argsort(d2[idx], kind="stable")]
+    block = out.reshape(-1, 3)
+    block[:len(idx), 0] = dx[idx] / ROOM_W
+    block[:len(idx), 1] = dy[idx] / ROOM_H
+    block[:len(idx), 2] = 1.0
+
+
+class NearestObs:
+    """Fixed-size observation of the k nearest live enemies and powerups.
+
+    Layout, float32, every value in [-1, 1]:
+        player x / ROOM_W, y / ROOM_H, hp / MAX_HP              3
+        k_enemies  x (dx / ROOM_W, dy / ROOM_H, present)        3 * k_enemies
+        k_powerups x (dx / ROOM_W, dy / ROOM_H, present)        3 * k_powerups
+        damage boost, speed boost                               2
+        door N, S, W, E                                         4
+    Positions are relative to the player; entities are sorted nearest first
+    and empty slots are zeros with present = 0.
+    """
+
+    def __init__(self, k_enemies=3, k_powerups=2):
+        self.k_enemies = k_enemies
+        self.k_powerups = k_powerups
+        self.dim = 3 + 3 * k_enemies + 3 * k_powerups + 2 + 4
+
+    def space(self):
+        return spaces.Box(low=-1.0, high=1.0, shape=(self.dim,), dtype=np.float32)
+
+    def fill(self, out, px, py, hp, ex, ey, enemy_live, ux, uy, powerup_live, damage, speed, doors):
+        """Fills `out` (N, dim) from per-row arrays: player (N,), enemies and
+        powerups (N, M), boost flags (N,) and door flags (N, 4)."""
+        ke, kp = self.k_enemies, self.k_powerups
+        out[:, 0] = px / ROOM_W
+        out[:, 1] = py / ROOM_H
+        out[:, 2] = hp / MAX_HP
+        j = 3 + 3 * ke
+        _nearest(out[:, 3:j].reshape(-1, ke, 3), px, py, ex, ey, enemy_live)
+        _nearest(out[:, j:j + 3 * kp].reshape(-1, kp, 3), px, py, ux, uy, powerup_live)
+        j += 3 * kp
+        out[:, j] = damage
+        out[:, j + 1] = speed
+        out[:, j + 2:j + 6] = doors
+        return out
+
+    def observe(self, env, out=None):
+        """Observation of an IsaacLiteEnv, into `out` (dim,) or a new array."""
+        obs = np.empty(self.dim, dtype=np.float32) if out is None else out
+        g = env.game
+        px, py = g.player_x, g.player_y
+        obs[0] = px / ROOM_W
+        obs[1] = py / ROOM_H
+        obs[2] = g.player_hp / MAX_HP
+        j = 3 + 3 * self.k_enemies
+        alive = [e for e in g.enemies if e.alive]
+        _nearest_one(obs[3:j], px, py, [e.x for e in alive], [e.y for e in alive])
+        _nearest_one(obs[j:j + 3 * self.k_powerups], px, py,
+                     [p["x"] for p in env.powerups], [p["y"] for p in env.powerups])
+        j += 3 * self.k_powerups
+        obs[j] = "damage" in env.active_boosts
+        obs[j + 1] = "speed" in env.active_boosts
+        obs[j + 2:j + 6] = 0.0
+        for d in g.doors:
+            obs[j + 2 + d] = 1.0
+        return obs
+
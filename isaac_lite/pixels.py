@@ -0,0 +1,109 @@
+import numpy as np
+from isaac_lite.game import ROOM_W, ROOM_H
+from isaac_lite.render import ROOM_COLOR, scene_circles, scene_rects
+
+
+def _luma(rgb):
+    r, g, b = rgb
+    return int(round(0.299 * r + 0.587 * g + 0.114 * b))
+
+
+class PixelObs:
+    """Small uint8 frames drawn straight from game state, with frame stacking.
+
+    Frames are channel-first (C, H, W), C = 1 (grayscale) or 3 (RGB), drawn
+    directly at the target resolution rather than downsampled from render().
+    Each new frame is written into slot `pos` of a ring of 2 * frame_stack
+    slots and mirrored into slot `pos + frame_stack`, so the newest
+    `frame_stack` frames are always one contiguous slice: the observation is
+    a view into the ring, shape (frame_stack * C, H, W), oldest frame first.
+    The view is only valid until the next push.
+    """
+
+    def __init__(self, shape=(84, 84), grayscale=True, frame_stack=4):
+        self.h, self.w = shape
+        self.c = 1 if grayscale else 3
+        self.k = frame_stack
+        self.grayscale = grayscale
+        self.ring = np.zeros((2 * frame_stack * self.c, self.h, self.w), dtype=np.uint8)
+        self.pos = 0
+
+        self.sx = self.w / ROOM_W
+        self.sy = self.h / ROOM_H
+        self.scale = min(self.sx, self.sy)
+        self._colors = {}
+        self._offsets = {}
+        self._background = self._color(ROOM_COLOR)[:, None, None]
+
+    @property
+    def shape(self):
+        return (self.k * self.c, self.h, self.w)
+
+    def _color(self, rgb):
+        color = self._colors.get(rgb)
+        if color is None:
+            value = [_luma(rgb)] if self.grayscale else rgb
+            color = self._colors[rgb] = np.array(value, dtype=np.uint8)
+        return color
+
+    def _disc(self, r):
+        # (dy, dx) offsets of a filled disc of pixel radius r (r = 0 is one pixel)
+        offsets = self._offsets.get(r)
+        if offsets is None:
+            yy, xx = np.mgrid[-r:r + 1, -r:r + 1]
+            inside = xx * xx + yy * yy <= r * r
+            offsets = self._offsets[r] = (yy[inside], xx[inside])
+        return offsets
+
+    def draw(self, env, out):
+        """Draws the current scene into `out`, a (C, H, W) uint8 array."""
+        out[:] = self._background
+        for (x0, y0, x1, y1), color in scene_rects(env):
+            # At least one pixel thick at any resolution
+            px0, py0 = int(x0 * self.sx), int(y0 * self.sy)
+            px1, py1 = max(int(x1 * self.sx), px0 + 1), max(int(y1 * self.sy), py0 + 1)
+            out[:, py0:py1, px0:px1] = self._color(color)[:, None, None]
+        circles = scene_circles(env)
+        if not circles:
+            return out
+
+        n = len(circles)
+        cx = np.fromiter((c[0] for c in circles), dtype=np.float64, count=n) * self.sx
+        cy = np.fromiter((c[1] for c in circles), dtype=np.float64, count=n) * self.sy
+        rp = np.rint(np.fromiter((c[2] for c in circles), dtype=np.float64, count=n) * self.scale)
+        cx = cx.astype(np.int64)
+        cy = cy.astype(np.int64)
+        rp = rp.astype(np.int64)
+        colors = np.stack([self._color(c[3]) for c in circles])
+
+        # Largest discs first so bullets stay visible on top at low resolution
+        for r in np.unique(rp)[::-1]:
+            sel = np.flatnonzero(rp == r)
+            dy, dx = self._disc(int(r))
+            ys = (cy[sel, None] + dy).ravel()
+            xs = (cx[sel, None] + dx).ravel()
+            cols = np.repeat(colors[sel], dy.size, axis=0)
+            keep = (ys >= 0) & (ys < self.h) & (xs >= 0) & (xs < self.w)
+            out[:, ys[keep], xs[keep]] = cols[keep].T
+        return out
+
+    def _slot(self, i):
+        return self.ring[i * self.c:(i + 1) * self.c]
+
+    def view(self):
+        start = (self.pos + 1) * self.c
+        return self.ring[start:start + self.k * self.c]
+
+    def reset(self, env):
+        """Fills the whole stack with the first frame of the episode."""
+        self.pos = 0
+        first = self.draw(env, self._slot(0))
+        for i in range(1, 2 * self.k):
+            self._slot(i)[:] = first
+        return self.view()
+
+    def push(self, env):
+        self.pos = (self.pos + 1) % self.k
+        frame = self.draw(env, self._slot(self.pos))
+        self._slot(self.pos + self.k)[:] = frame
+        return self.view()
@@ -0,0 +1,68 @@
+import time
+
+# Timed phases of IsaacLiteEnv.step; "step" is the whole call, so
+# step minus the rest is the env's own bookkeeping
+PHASES = ["step", "game", "reward", "pickup", "kills", "obs"]
+
+
+class StepProfiler:
+    """perf_counter_ns accumulators for the phases of IsaacLiteEnv.step.
+
+    attach() shadows the phase methods with timed wrappers as instance
+    attributes and detach() removes them again, so an env that is not being
+    profiled runs its plain methods and pays nothing.
+    """
+
+    def __init__(self):
+        self.acc = {name: [0, 0] for name in PHASES}  # [calls, total ns]
+        self._targets = []
+
+    def _wrap(self, obj, attr, name):
+        fn = getattr(obj, attr)
+        acc = self.acc[name]
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            t0 = clock()
+            out = fn(*args, **kwargs)
+            acc[1] += clock() - t0
+            acc[0] += 1
+            return out
+
+        setattr(obj, attr, timed)
+        self._targets.append((obj, attr))
+
+    def attach(self, env):
+        self._wrap(env, "step", "step")
+        self._wrap(env.game, "tick", "game")
+        self._wrap(env, "_compute_reward", "reward")
+        self._wrap(env, "_pickup_powerups", "pickup")
+        self._wrap(env, "_count_kills", "kills")
+        self._wrap(env, "_observe", "obs")
+
+    def detach(self):
+        for obj, attr in self._targets:
+            del obj.__dict__[attr]
+        self._targets.clear()
+
+    def reset(self):
+        for acc in self.acc.values():
+            acc[0] = acc[1] = 0
+
+    def stats(self):
+        """{phase: {"calls", "total_ns", "mean_us"}} since the last reset."""
+        return {name: {"calls": calls, "total_ns": total, "mean_us": total / calls / 1e3 if calls else 0.0}
+                for name, (calls, total) in self.acc.items()}
+
+
+def merge_stats(stats):
+    """Sums the stats() of several envs into one dict of the same shape."""
+    out = {}
+    for s in stats:
+        for name, st in s.items():
+            acc = out.setdefault(name, {"calls": 0, "total_ns": 0})
+            acc["calls"] += st["calls"]
+            acc["total_ns"] += st["total_ns"]
+    for acc in out.values():
+        acc["mean_us"] = acc["total_ns"] / acc["calls"] / 1e3 if acc["calls"] else 0.0
+    return out
@@ -0,0 +1,205 @@
+import json
+import os
+import time
+import numpy as np
+
+MAGIC = b"ISLREC1\n"
+HEADER_ALIGN = 64
+# Action-log value marking an env.reset() between episodes
+RESET = 255
+# Simulation version written into action logs. Bump it with every change to
+# game, env or reward logic that changes what a replayed action log produces;
+# replay_file refuses logs recorded under another version.
+SIM_VERSION = 1
+
+
+def record_dtype(obs_dim=20):
+    """One fixed-width, packed record: 4 * obs_dim + 5 bytes."""
+    return np.dtype([("obs", "<f4", (obs_dim,)), ("action", "u1"), ("reward", "<f4")])
+
+
+def _write_header(f, header):
+    # magic, uint32 length, JSON, space padding up to a 64-byte boundary
+    body = json.dumps(header).encode()
+    size = len(MAGIC) + 4 + len(body)
+    body += b" " * (-size % HEADER_ALIGN)
+    f.write(MAGIC)
+    f.write(np.uint32(len(body)).tobytes())
+    f.write(body)
+
+
+def read_header(path):
+    """Returns (header dict, byte offset of the first record)."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        n = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+        header = json.loads(f.read(n))
+    return header, len(MAGIC) + 4 + n
+
+
+class SessionRecorder:
+    """Streams (obs, action, reward) records to disk while a session runs.
+
+    Records are staged in a fixed `chunk`-row buffer that is written out
+    whenever it fills, so memory stays flat however long the session is.
+    The file is a small JSON header followed by packed records; see
+    load_session() for reading it back.
+    """
+
+    def __init__(self, path, persona=None, seed=None, obs_dim=20, chunk=256, **meta):
+        self.path = path
+        self.dtype = record_dtype(obs_dim)
+        self.buf = np.zeros(chunk, dtype=self.dtype)
+        self.n = 0
+        self.total = 0
+
+        out_dir = os.path.dirname(path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        self.f = open(path, "wb")
+        header = {
+            "schema": [[name, self.dtype[name].base.str, list(self.dtype[name].shape)] for name in self.dtype.names],
+            "obs_dim": obs_dim,
+            "persona": persona,
+            "seed": seed,
+            "created": time.time(),
+        }
+        header.update(meta)
+        _write_header(self.f, header)
+
+    def append(self, obs, action, reward):
+        row = self.buf[self.n]
+        row["obs"] = obs
+        row["action"] = action
+        row["reward"] = reward
+        self.n += 1
+        if self.n == len(self.buf):
+            self.flush()
+
+    def extend(self, obs, actions, rewards):
+        """Appends many records at once (arrays with a leading record axis)."""
+        recs = np.zeros(len(actions), dtype=self.dtype)
+        recs["obs"] = obs
+        recs["action"] = actions
+        recs["reward"] = rewards
+        self.flush()
+        self.f.write(recs.tobytes())
+        self.total += len(recs)
+
+    def flush(self):
+        if self.n:
+            self.f.write(self.buf[:self.n].tobytes())
+            self.total += self.n
+            self.n = 0
+        self.f.flush()
+
+    def close(self):
+        if not self.f.closed:
+            self.flush()
+            self.f.close()
+
+    def __len__(self):
+        return self.total + self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ActionRecorder:
+    """Streams only the actions of a session, one byte per step.
+
+    The env is deterministic given (seed, persona, env settings), so the
+    header plus the action stream is enough to rebuild observations, rewards
+    and frames with isaac_lite.replay, as long as the simulation has not
+    changed since (the header's "version"). Call reset() whenever the env is
+    reset.
+    """
+
+    def __init__(self, path, persona=None, seed=None, chunk=4096, **env_kwargs):
+        self.path = path
+        self.buf = np.zeros(chunk, dtype=np.uint8)
+        self.n = 0
+        self.total = 0
+
+        out_dir = os.path.dirname(path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        self.f = open(path, "wb")
+        _write_header(self.f, {
+            "schema": [["action", "|u1", []]],
+            "kind": "actions",
+            "version": SIM_VERSION,
+            "persona": persona,
+            "seed": seed,
+            "env": env_kwargs,
+            "created": time.time(),
+        })
+
+    def append(self, action):
+        self.buf[self.n] = action
+        self.n += 1
+        if self.n == len(self.buf):
+            self.flush()
+
+    def reset(self):
+        self.append(RESET)
+
+    def flush(self):
+        if self.n:
+            self.f.write(self.buf[:self.n].tobytes())
+            self.total += self.n
+            self.n = 0
+        self.f.flush()
+
+    def close(self):
+        if not self.f.closed:
+            self.flush()
+            self.f.close()
+
+    def __len__(self):
+        return self.total + self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_session(path, mmap=True):
+    """Returns (header, records); records is a structured array with fields
+    obs, action and reward (only action for an action log), memory-mapped
+    read-only unless mmap=False."""
+    header, offset = read_header(path)
+    dtype = np.dtype([(name, dt, tuple(shape)) for name, dt, shape in header["schema"]])
+    n = (os.path.getsize(path) - offset) // dtype.itemsize
+    if mmap:
+        if n == 0:
+            return header, np.zeros(0, dtype=dtype)
+        return header, np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(n,))
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return header, np.fromfile(f, dtype=dtype, count=n)
+
+
+def convert_json(json_path, out_path=None, persona=None, seed=None):
+    """Converts a legacy solo.py JSON session (a list of {obs, action, reward})
+    to the binary format. Observations keep their recorded width; older
+    sessions have 19 values instead of 20."""
+    with open(json_path) as f:
+        data = json.load(f)
+    if out_path is None:
+        out_path = os.path.splitext(json_path)[0] + ".rec"
+
+    obs_dim = len(data[0]["obs"]) if data else 20
+    obs = np.array([d["obs"] for d in data], dtype=np.float32).reshape(len(data), obs_dim)
+    actions = np.array([d["action"] for d in data], dtype=np.uint8)
+    rewards = np.array([d["reward"] for d in data], dtype=np.float32)
+    with SessionRecorder(out_path, persona=persona, seed=seed, obs_dim=obs_dim,
+                         source=os.path.basename(json_path)) as rec:
+        rec.extend(obs, actions, rewards)
+    return out_path
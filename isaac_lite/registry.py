@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import zipfile
+from collections import OrderedDict
+
+DEFAULT_INDEX = os.path.join("logs", "checkpoints.db")
+
+# algo, persona, seed and run are read from our file names, e.g.
+# ppo_explorer_run12_final.zip, a2c_survivor_run1_20251025_043751.zip, ppo_explorer_seed7.zip
+_NAME_RE = re.compile(r"(?P<algo>ppo|a2c)_(?:bc_pretrained_)?(?P<persona>[a-z]+)"
+                      r"(?:_run(?P<run>\d+))?(?:_seed(?P<seed>\d+))?")
+
+
+def _key(path):
+    # Paths are stored relative to the working directory, like the repo's log paths
+    return os.path.relpath(os.path.abspath(path))
+
+
+def _sha1(path, chunk=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_checkpoint_meta(path):
+    """Algo, timesteps, seed and observation shape of an SB3 .zip, read from
+    its JSON 'data' entry without unpickling anything."""
+    meta = {"algo": None, "persona": None, "seed": None, "run": None, "timesteps": None, "obs_shape": None}
+    m = _NAME_RE.search(os.path.basename(path).lower())
+    if m:
+        meta.update(algo=m["algo"], persona=m["persona"],
+                    run=int(m["run"]) if m["run"] else None, seed=int(m["seed"]) if m["seed"] else None)
+    try:
+        with zipfile.ZipFile(path) as z:
+            data = json.loads(z.read("data"))
+    except (zipfile.BadZipFile, KeyError, ValueError):
+        return meta
+    # PPO is the only one of our algorithms with a clip range
+    meta["algo"] = "ppo" if "clip_range" in data else "a2c"
+    meta["timesteps"] = data.get("num_timesteps")
+    if meta["seed"] is None and isinstance(data.get("seed"), int):
+        meta["seed"] = data["seed"]
+    shape = data.get("observation_space", {}).get("_shape")
+    if shape is not None:
+        meta["obs_shape"] = json.dumps(shape)
+    return meta
+
+
+class CheckpointRegistry:
+    """SQLite index of model checkpoints under one or more log roots.
+
+    scan() only re-reads files whose size or mtime changed since they were
+    indexed and drops entries whose files are gone, so rescans are cheap.
+    Identical files in different directories share a sha1; queries return
+    one path per hash unless dedupe=False.
+    """
+
+    def __init__(self, index_path=DEFAULT_INDEX):
+        self.index_path = index_path
+        out_dir = os.path.dirname(index_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        self.db = sqlite3.connect(index_path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                path TEXT PRIMARY KEY, algo TEXT, persona TEXT, seed INTEGER, run INTEGER,
+                timesteps INTEGER, obs_shape TEXT, size INTEGER, mtime_ns INTEGER, sha1 TEXT,
+                eval_score REAL, eval_episodes INTEGER, eval_time REAL, indexed_at REAL)""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS by_query ON checkpoints (persona, algo)")
+        self.db.commit()
+
+    def scan(self, roots=("logs",)):
+        """Indexes every .zip under `roots`; returns (added or updated, removed)."""
+        known = {r["path"]: (r["size"], r["mtime_ns"])
+                 for r in self.db.execute("SELECT path, size, mtime_ns FROM checkpoints")}
+        seen, changed = set(), 0
+        for root in roots:
+            for dirpath, _, files in os.walk(root):
+                for name in files:
+                    if not name.endswith(".zip"):
+                        continue
+                    path = _key(os.path.join(dirpath, name))
+                    st = os.stat(path)
+                    seen.add(path)
+                    if known.get(path) == (st.st_size, st.st_mtime_ns):
+                        continue
+                    meta = read_checkpoint_meta(path)
+                    # A changed file keeps no stale eval score
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO checkpoints (path, algo, persona, seed, run, timesteps, obs_shape,"
+                        " size, mtime_ns, sha1, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (path, meta["algo"], meta["persona"], meta["seed"], meta["run"], meta["timesteps"],
+                         meta["obs_shape"], st.st_size, st.st_mtime_ns, _sha1(path), time.time()))
+                    changed += 1
+
+        roots = [_key(r) for r in roots]
+        gone = [p for p in known if p not in seen
+                and any(r == os.curdir or p.startswith(r + os.sep) for r in roots)]
+        self.db.executemany("DELETE FROM checkpoints WHERE path = ?", [(p,) for p in gone])
+        self.db.commit()
+        return changed, len(gone)
+
+    def find(self, algo=None, persona=None, seed=None, order_by="eval_score", dedupe=True, limit=None):
+        """Indexed checkpoints as dicts, best first by `order_by`
+        (eval_score, timesteps or mtime_ns); unevaluated entries sort last."""
+        if order_by not in ("eval_score", "timesteps", "mtime_ns"):
+            raise ValueError(f"order_by must be eval_score, timesteps or mtime_ns, got {order_by!r}")
+        where, args = [], []
+        for col, val in (("algo", algo), ("persona", persona), ("seed", seed)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                args.append(val)
+        sql = "SELECT * FROM checkpoints"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} IS NULL, {order_by} DESC, mtime_ns DESC, path"
+        rows, hashes = [], set()
+        for r in self.db.execute(sql, args):
+            if dedupe:
+                if r["sha1"] in hashes:
+                    continue
+                hashes.add(r["sha1"])
+            rows.append(dict(r))
+            if limit is not None and len(rows) >= limit:
+                break
+        return rows
+
+    def best(self, algo=None, persona=None, order_by="eval_score"):
+        """Path of the top checkpoint for a query, or None."""
+        rows = self.find(algo=algo, persona=persona, order_by=order_by, limit=1)
+        return rows[0]["path"] if rows else None
+
+    def get(self, path):
+        r = self.db.execute("SELECT * FROM checkpoints WHERE path = ?", (_key(path),)).fetchone()
+        return dict(r) if r else None
+
+    def record_eval(self, path, score, episodes):
+        """Stores an eval score for `path` and every identical copy of it."""
+        row = self.get(path)
+        if row is None:
+            return
+        self.db.execute("UPDATE checkpoints SET eval_score = ?, eval_episodes = ?, eval_time = ? WHERE sha1 = ?",
+                        (float(score), int(episodes), time.time(), row["sha1"]))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+class ModelCache:
+    """LRU cache of loaded policies keyed by path and mtime, so an overwritten
+    checkpoint is reloaded but repeated picks of the same one are free."""
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self.models = OrderedDict()
+
+    def load(self, path, algo=None, device="cpu"):
+        key = (_key(path), os.stat(path).st_mtime_ns)
+        model = self.models.get(key)
+        if model is not None:
+            self.models.move_to_end(key)
+            return model
+
+        from stable_baselines3 import A2C, PPO
+        algo = algo or read_checkpoint_meta(path)["algo"]
+        model = (A2C if algo == "a2c" else PPO).load(path, device=device)
+        self.models[key] = model
+        if len(self.models) > self.maxsize:
+            self.models.popitem(last=False)
+        return model
+
+
+_cache = ModelCache()
+
+
+def load_model(path, algo=None, device="cpu"):
+    """Loads a checkpoint through the process-wide ModelCache."""
+    return _cache.load(path, algo=algo, device=device)
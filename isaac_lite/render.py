@@ -0,0 +1,325 @@
+import numpy as np
+from isaac_lite.game import ROOM_W, ROOM_H, PLAYER_RADIUS, ENEMY_RADIUS, door_rect
+
+HUD_W = 150
+FRAME_W, FRAME_H = ROOM_W + HUD_W, ROOM_H
+
+BG_COLOR = (10, 10, 10)
+ROOM_COLOR = (15, 15, 20)
+PLAYER_COLOR = (0, 200, 0)
+ENEMY_COLOR = (200, 0, 0)
+BULLET_COLOR = (255, 255, 0)
+BOOSTED_BULLET_COLOR = (255, 120, 0)
+POWERUP_COLORS = {"speed": (0, 255, 255), "damage": (255, 0, 255)}
+DOOR_COLOR = (120, 90, 60)
+TEXT_COLOR = (255, 255, 255)
+DIED_COLOR = (255, 80, 80)
+WON_COLOR = (255, 255, 100)
+
+
+def scene_circles(env):
+    """World as (x, y, radius, color) circles, in draw order."""
+    game = env.game
+    circles = [(int(game.player_x), int(game.player_y), PLAYER_RADIUS, PLAYER_COLOR)]
+    for e in game.enemies:
+        if e.alive:
+            circles.append((int(e.x), int(e.y), ENEMY_RADIUS, ENEMY_COLOR))
+
+    # Bullets turn redish orange when damage-boosted
+    bullet_color = BOOSTED_BULLET_COLOR if "damage" in env.active_boosts else BULLET_COLOR
+    for b in game.shots:
+        circles.append((int(b.x), int(b.y), 4, bullet_color))
+
+    for p in env.powerups:
+        circles.append((int(p["x"]), int(p["y"]), 6, POWERUP_COLORS[p["type"]]))
+    return circles
+
+
+def scene_rects(env):
+    """Doors of the current room as ((x0, y0, x1, y1), color), drawn under the circles."""
+    return [(door_rect(d), DOOR_COLOR) for d in env.game.doors]
+
+
+def hud_lines(env):
+    return (
+        f"Score: {int(env.score)}",
+        f"Kills: {env.episode_metrics.get('enemies_killed', 0)}",
+        f"Boosts: {', '.join(env.active_boosts.keys()) or 'None'}",
+        f"Steps: {env.steps}",
+        f"Rooms: {len(env.game.rooms_visited)}",
+    )
+
+
+def _clip_rect(x0, y0, x1, y1, w, h):
+    return max(0, x0), max(0, y0), min(w, x1), min(h, y1)
+
+
+class Renderer:
+    """Draws IsaacLiteEnv into a reusable (H, W, 3) uint8 framebuffer.
+
+    Only regions that changed since the last frame are redrawn: the boxes
+    around last frame's circles are cleared, this frame's circles drawn, and
+    the HUD is repainted only when its text changes. End-of-episode overlays
+    (death fade, confetti) force a full redraw while they are on screen.
+    Subclasses provide the actual drawing primitives.
+
+    The returned framebuffer is overwritten by the next call; copy it to keep it.
+    """
+
+    def __init__(self):
+        self.frame = np.zeros((FRAME_H, FRAME_W, 3), dtype=np.uint8)
+        self._prev_rects = []
+        self._prev_hud = None
+        self._full = True
+
+    def invalidate(self):
+        """Forces the next frame to be drawn from scratch."""
+        self._full = True
+
+    def render(self, env):
+        overlay = bool(env.death_frame or env.win_frame)
+        full = self._full or overlay
+        dirty = []
+
+        if full:
+            self._restore((0, 0, FRAME_W, FRAME_H))
+            self._prev_hud = None
+            dirty.append((0, 0, FRAME_W, FRAME_H))
+        else:
+            for rect in self._prev_rects:
+                self._restore(rect)
+            dirty.extend(self._prev_rects)
+
+        # World, clipped to the room; doors are redrawn every frame like
+        # the circles, so a room change clears the old ones
+        rects = []
+        for rect, color in scene_rects(env):
+            self._rect(rect, color)
+            rects.append(rect)
+        for x, y, r, color in scene_circles(env):
+            rect = self._draw_circle(x, y, r, color, ROOM_W, ROOM_H)
+            if rect:
+                rects.append(rect)
+        dirty.extend(rects)
+        self._prev_rects = rects
+
+        # HUD
+        lines = hud_lines(env)
+        if lines != self._prev_hud:
+            hud = (ROOM_W, 0, FRAME_W, FRAME_H)
+            self._restore(hud)
+            for i, line in enumerate(lines):
+                self._text(line, ROOM_W + 10, 30 + i * 25, TEXT_COLOR)
+            self._prev_hud = lines
+            dirty.append(hud)
+
+        # Death fade
+        if env.death_frame:
+            self._banner("YOU DIED", DIED_COLOR, env._get_death_fade_alpha())
+
+        # Win
+        if env.win_frame:
+            env._update_confetti()
+            for c in env.confetti_particles:
+                self._draw_circle(int(c["x"]), int(c["y"]), 3, c["color"], FRAME_W, FRAME_H)
+            self._banner("YOU WON!", WON_COLOR, 255)
+
+        # A full redraw is needed again once the overlay goes away
+        self._full = overlay
+        self._sync(dirty)
+        return self.frame
+
+    def _draw_circle(self, x, y, r, color, w, h):
+        # Clips to (0, 0, w, h); returns the drawn box or None if fully outside
+        rect = _clip_rect(x - r, y - r, x + r + 1, y + r + 1, w, h)
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            return None
+        self._circle(x, y, r, color, rect)
+        return rect
+
+    # Drawing primitives -------------------------------------------------
+    def _restore(self, rect):
+        # Copies the empty background (HUD panel + room) back into rect
+        raise NotImplementedError
+
+    def _circle(self, x, y, r, color, rect):
+        raise NotImplementedError
+
+    def _rect(self, rect, color):
+        raise NotImplementedError
+
+    def _text(self, text, x, y, color):
+        raise NotImplementedError
+
+    def _banner(self, text, color, alpha):
+        raise NotImplementedError
+
+    def _sync(self, dirty):
+        # Copies dirty rects into self.frame (no-op when drawing into it directly)
+        pass
+
+    def close(self):
+        pass
+
+
+class PygameRenderer(Renderer):
+    """Pygame drawing onto one cached Surface, with fonts and text surfaces cached."""
+
+    def __init__(self):
+        super().__init__()
+        import pygame
+        self.pygame = pygame
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.surface = pygame.Surface((FRAME_W, FRAME_H))
+        self.background = pygame.Surface((FRAME_W, FRAME_H))
+        self.background.fill(BG_COLOR)
+        self.background.fill(ROOM_COLOR, (0, 0, ROOM_W, ROOM_H))
+        self.font = pygame.font.SysFont("consolas", 18)
+        self.big_font = pygame.font.SysFont("consolas", 36, bold=True)
+        self._text_cache = {}
+
+    def _restore(self, rect):
+        x0, y0, x1, y1 = rect
+        self.surface.blit(self.background, (x0, y0), (x0, y0, x1 - x0, y1 - y0))
+
+    def _circle(self, x, y, r, color, rect):
+        x0, y0, x1, y1 = rect
+        self.surface.set_clip((x0, y0, x1 - x0, y1 - y0))
+        self.pygame.draw.circle(self.surface, color, (x, y), r)
+        self.surface.set_clip(None)
+
+    def _rect(self, rect, color):
+        x0, y0, x1, y1 = rect
+        self.surface.fill(color, (x0, y0, x1 - x0, y1 - y0))
+
+    def _rendered(self, text, font, color):
+        key = (text, id(font), color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) > 256:
+                self._text_cache.clear()
+            surf = self._text_cache[key] = font.render(text, True, color)
+        return surf
+
+    def _text(self, text, x, y, color):
+        self.surface.blit(self._rendered(text, self.font, color), (x, y))
+
+    def _banner(self, text, color, alpha):
+        txt = self._rendered(text, self.big_font, color)
+        txt.set_alpha(alpha)
+        self.surface.blit(txt, txt.get_rect(center=(ROOM_W // 2, ROOM_H // 2)))
+
+    def _sync(self, dirty):
+        pixels = self.pygame.surfarray.pixels3d(self.surface)  # (W, H, 3) view, no copy
+        frame = self.frame
+        for x0, y0, x1, y1 in dirty:
+            frame[y0:y1, x0:x1] = pixels[x0:x1, y0:y1].transpose(1, 0, 2)
+        del pixels  # unlock the surface
+
+
+# 3x5 bitmap font for the SDL-free renderer; '#' is a lit pixel
+_GLYPHS = {
+    "A": (" # ", "# #", "###", "# #", "# #"), "B": ("## ", "# #", "## ", "# #", "## "),
+    "C": (" ##", "#  ", "#  ", "#  ", " ##"), "D": ("## ", "# #", "# #", "# #", "## "),
+    "E": ("###", "#  ", "## ", "#  ", "###"), "F": ("###", "#  ", "## ", "#  ", "#  "),
+    "G": (" ##", "#  ", "# #", "# #", " ##"), "H": ("# #", "# #", "###", "# #", "# #"),
+    "I": ("###", " # ", " # ", " # ", "###"), "J": ("  #", "  #", "  #", "# #", " # "),
+    "K": ("# #", "# #", "## ", "# #", "# #"), "L": ("#  ", "#  ", "#  ", "#  ", "###"),
+    "M": ("# #", "###", "###", "# #", "# #"), "N": ("## ", "# #", "# #", "# #", "# #"),
+    "O": (" # ", "# #", "# #", "# #", " # "), "P": ("## ", "# #", "## ", "#  ", "#  "),
+    "Q": (" # ", "# #", "# #", "## ", " ##"), "R": ("## ", "# #", "## ", "# #", "# #"),
+    "S": (" ##", "#  ", " # ", "  #", "## "), "T": ("###", " # ", " # ", " # ", " # "),
+    "U": ("# #", "# #", "# #", "# #", "###"), "V": ("# #", "# #", "# #", "# #", " # "),
+    "W": ("# #", "# #", "###", "###", "# #"), "X": ("# #", "# #", " # ", "# #", "# #"),
+    "Y": ("# #", "# #", " # ", " # ", " # "), "Z": ("###", "  #", " # ", "#  ", "###"),
+    "0": ("###", "# #", "# #", "# #", "###"), "1": (" # ", "## ", " # ", " # ", "###"),
+    "2": ("## ", "  #", " # ", "#  ", "###"), "3": ("## ", "  #", " # ", "  #", "## "),
+    "4": ("# #", "# #", "###", "  #", "  #"), "5": ("###", "#  ", "## ", "  #", "## "),
+    "6": (" ##", "#  ", "###", "# #", "###"), "7": ("###", "  #", " # ", " # ", " # "),
+    "8": ("###", "# #", "###", "# #", "###"), "9": ("###", "# #", "###", "  #", "## "),
+    ":": ("   ", " # ", "   ", " # ", "   "), ",": ("   ", "   ", "   ", " # ", "#  "),
+    "!": (" # ", " # ", " # ", "   ", " # "), "-": ("   ", "   ", "###", "   ", "   "),
+    ".": ("   ", "   ", "   ", "   ", " # "), " ": ("   ", "   ", "   ", "   ", "   "),
+}
+_GLYPH_MASKS = {c: np.array([[ch == "#" for ch in row] for row in rows]) for c, rows in _GLYPHS.items()}
+
+
+class NumpyRenderer(Renderer):
+    """Pure-NumPy rasterizer that needs neither SDL nor a display.
+
+    Circles are stamped from cached per-radius masks and text uses a small
+    built-in bitmap font, so it runs on headless servers without pygame.
+    """
+
+    HUD_SCALE = 2
+    BANNER_SCALE = 6
+
+    def __init__(self):
+        super().__init__()
+        self._discs = {}
+        self._glyphs = {}
+        self.background = np.empty_like(self.frame)
+        self.background[:] = BG_COLOR
+        self.background[:, :ROOM_W] = ROOM_COLOR
+
+    def _disc(self, r):
+        mask = self._discs.get(r)
+        if mask is None:
+            yy, xx = np.mgrid[-r:r + 1, -r:r + 1]
+            mask = self._discs[r] = xx * xx + yy * yy <= r * r
+        return mask
+
+    def _glyph(self, ch, scale):
+        key = (ch, scale)
+        mask = self._glyphs.get(key)
+        if mask is None:
+            base = _GLYPH_MASKS.get(ch.upper(), _GLYPH_MASKS[" "])
+            mask = self._glyphs[key] = base.repeat(scale, axis=0).repeat(scale, axis=1)
+        return mask
+
+    def _restore(self, rect):
+        x0, y0, x1, y1 = rect
+        self.frame[y0:y1, x0:x1] = self.background[y0:y1, x0:x1]
+
+    def _circle(self, x, y, r, color, rect):
+        x0, y0, x1, y1 = rect
+        mask = self._disc(r)[y0 - (y - r):y1 - (y - r), x0 - (x - r):x1 - (x - r)]
+        self.frame[y0:y1, x0:x1][mask] = color
+
+    def _rect(self, rect, color):
+        x0, y0, x1, y1 = rect
+        self.frame[y0:y1, x0:x1] = color
+
+    def _draw_text(self, text, x, y, color, scale, alpha=255):
+        h, advance = 5 * scale, 4 * scale
+        color = np.array(color, dtype=np.float32)
+        for i, ch in enumerate(text):
+            gx = x + i * advance
+            x0, y0, x1, y1 = _clip_rect(gx, y, gx + 3 * scale, y + h, FRAME_W, FRAME_H)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            mask = self._glyph(ch, scale)[y0 - y:y1 - y, x0 - gx:x1 - gx]
+            region = self.frame[y0:y1, x0:x1]
+            if alpha >= 255:
+                region[mask] = color
+            else:
+                a = alpha / 255.0
+                region[mask] = (region[mask] * (1.0 - a) + color * a).astype(np.uint8)
+
+    def _text(self, text, x, y, color):
+        self._draw_text(text, x, y, color, self.HUD_SCALE)
+
+    def _banner(self, text, color, alpha):
+        s = self.BANNER_SCALE
+        w, h = len(text) * 4 * s - s, 5 * s
+        self._draw_text(text, ROOM_W // 2 - w // 2, ROOM_H // 2 - h // 2, color, s, alpha)
+
+
+RENDERERS = {"rgb_array": PygameRenderer, "rgb_array_headless": NumpyRenderer}
+
+
+def make_renderer(render_mode):
+    if render_mode not in RENDERERS:
+        raise ValueError(f"Unknown render_mode {render_mode!r}; expected one of {sorted(RENDERERS)}")
+    return RENDERERS[render_mode]()
@@ -0,0 +1,86 @@
+import concurrent.futures as cf
+import functools
+import numpy as np
+from isaac_lite.env import IsaacLiteEnv
+from isaac_lite.recording import RESET, SIM_VERSION, load_session
+
+
+def iter_replay(env, actions):
+    """Plays an action log through `env` from a reset, yielding
+    (episode, action, obs, reward, done, truncated) after every step.
+
+    The env must have been built with the settings of the recording. RESET
+    entries reset it and start the next episode. Between steps the env holds
+    the replayed state, so env.render() re-renders that step.
+    """
+    env.reset()
+    episode = 0
+    for a in actions:
+        a = int(a)
+        if a == RESET:
+            env.reset()
+            episode += 1
+            continue
+        obs, reward, done, truncated, _ = env.step(a)
+        yield episode, a, obs, reward, done, truncated
+
+
+def replay(seed, persona="survivor", actions=(), **env_kwargs):
+    """Rebuilds a trajectory from (seed, persona, actions).
+
+    Returns a dict of arrays with one row per step: obs, action, reward,
+    done, truncated and episode. Rows match what the env returned when the
+    actions were first played, bit for bit.
+    """
+    actions = np.asarray(actions, dtype=np.uint8)
+    n = int(np.count_nonzero(actions != RESET))
+    env_kwargs.setdefault("log_dir", "logs")
+    env = IsaacLiteEnv(seed=seed, persona=persona, **env_kwargs)
+    space = env.observation_space
+    out = {
+        "obs": np.zeros((n,) + space.shape, dtype=space.dtype),
+        "action": np.zeros(n, dtype=np.uint8),
+        "reward": np.zeros(n, dtype=np.float32),
+        "done": np.zeros(n, dtype=bool),
+        "truncated": np.zeros(n, dtype=bool),
+        "episode": np.zeros(n, dtype=np.int32),
+    }
+    try:
+        for t, (episode, a, obs, reward, done, truncated) in enumerate(iter_replay(env, actions)):
+            out["obs"][t] = obs
+            out["action"][t] = a
+            out["reward"][t] = reward
+            out["done"][t] = done
+            out["truncated"][t] = truncated
+            out["episode"][t] = episode
+    finally:
+        env.close()
+    return out
+
+
+def replay_file(path, **env_kwargs):
+    """Replays an ActionRecorder file; returns (header, trajectory).
+
+    Raises ValueError when the log was recorded under another SIM_VERSION,
+    since replaying it would quietly produce a different trajectory.
+    """
+    header, records = load_session(path)
+    if header.get("kind") != "actions":
+        raise ValueError(f"{path} is not an action log")
+    version = header.get("version")
+    if version != SIM_VERSION:
+        found = "no simulation version" if version is None else f"simulation version {version}"
+        raise ValueError(f"{path} was recorded with {found}; this build replays version {SIM_VERSION}, "
+                         f"so its trajectories would not match")
+    kwargs = dict(header.get("env") or {}, **env_kwargs)
+    return header, replay(header["seed"], header["persona"] or "survivor", records["action"], **kwargs)
+
+
+def replay_files(paths, workers=0, **env_kwargs):
+    """Replays many action logs, on `workers` processes when workers > 0.
+    Returns (header, trajectory) pairs in the order of `paths`."""
+    fn = functools.partial(replay_file, **env_kwargs)
+    if workers <= 0 or len(paths) < 2:
+        return [fn(p) for p in paths]
+    with cf.ProcessPoolExecutor(min(workers, len(paths))) as pool:
+        return list(pool.map(fn, paths))
@@ -0,0 +1,95 @@
+import functools
+import os
+import numpy as np
+import yaml
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configs", "personas.yaml")
+
+# Per-tick signals every term is written in; the envs compute these once
+SIGNALS = ("kills", "damage", "new_rooms", "moved", "action", "outside", "speed_boost", "damage_boost")
+
+# name -> (scalar expression, array expression) of the signals. A persona
+# multiplies each term it uses by a weight; booleans count as 0 / 1.
+TERMS = {
+    "step_cost": ("1.0", "1.0"),
+    "survival": ("1.0", "1.0"),
+    "kills": ("kills", "kills"),
+    "damage": ("damage", "damage"),
+    "no_damage": ("(damage == 0)", "(damage == 0)"),
+    "new_room": ("(new_rooms > 0)", "(new_rooms > 0)"),
+    "moving": ("(moved if moved > 1.0 else 0.0)", "where(moved > 1.0, moved, 0.0)"),
+    "standing": ("(moved <= 1.0)", "(moved <= 1.0)"),
+    "move_action": ("(action <= 3)", "(action <= 3)"),
+    "shoot_action": ("(action >= 5)", "(action >= 5)"),
+    "out_of_bounds": ("outside", "outside"),
+    "in_bounds": ("(not outside)", "~outside"),
+    "speed_boost": ("speed_boost", "speed_boost"),
+    "damage_boost_kills": ("(kills if damage_boost else 0)", "where(damage_boost, kills, 0)"),
+}
+
+
+class RewardFn:
+    """One persona's reward, compiled from its weighted terms.
+
+    `scalar(*signals)` and `batch(*signals)` return the clipped total for one
+    env (plain Python math) or for arrays of envs (NumPy); a persona without
+    terms earns 0, and `batch` returns one value per env even when every term
+    is a constant. `scalar_terms` and `batch_terms` return the weighted,
+    unclipped value of every term instead, in `names` order, for diagnostics.
+    """
+
+    def __init__(self, persona, terms, clip=None):
+        unknown = sorted(set(terms) - set(TERMS))
+        if unknown:
+            raise ValueError(f"persona {persona!r}: unknown reward terms {unknown}; expected some of {sorted(TERMS)}")
+        self.persona = persona
+        self.names = list(terms)
+        self.weights = [float(terms[n]) for n in self.names]
+        self.clip = clip
+
+        scalar = [self._weighted(w, TERMS[n][0]) for n, w in zip(self.names, self.weights)]
+        batch = [self._weighted(w, TERMS[n][1]) for n, w in zip(self.names, self.weights)]
+        # No terms is a zero reward; batch results are broadcast to one value
+        # per env even when every term is a constant
+        total = " + ".join(scalar) or "0.0"
+        batch_total = f"zeros_like(moved) + ({' + '.join(batch) or '0.0'})"
+        if clip is not None:
+            lo, hi = float(clip[0]), float(clip[1])
+            total = f"min(max({total}, {lo!r}), {hi!r})"
+            batch_total = f"clip({batch_total}, {lo!r}, {hi!r})"
+        self.scalar = self._compile(total)
+        self.batch = self._compile(batch_total)
+        batch = [f"broadcast_to({t}, moved.shape)" if TERMS[n][1] == "1.0" else t for n, t in zip(self.names, batch)]
+        self.scalar_terms = self._compile(self._tuple(scalar))
+        self.batch_terms = self._compile(self._tuple(batch))
+
+    @staticmethod
+    def _weighted(weight, expr):
+        # Constant terms fold to their weight
+        return f"{weight!r}" if expr == "1.0" else f"{weight!r} * {expr}"
+
+    @staticmethod
+    def _tuple(exprs):
+        return f"({', '.join(exprs)},)" if exprs else "()"
+
+    @staticmethod
+    def _compile(body):
+        namespace = {"where": np.where, "clip": np.clip, "zeros_like": np.zeros_like, "broadcast_to": np.broadcast_to}
+        return eval(f"lambda {', '.join(SIGNALS)}: {body}", namespace)
+
+
+@functools.lru_cache(maxsize=None)
+def load_personas(path=DEFAULT_CONFIG):
+    """persona name -> RewardFn for every persona in a personas YAML file."""
+    with open(path) as f:
+        cfg = yaml.safe_load(f) or {}
+    clip = cfg.get("clip")
+    return {name: RewardFn(name, spec.get("terms", {}), spec.get("clip", clip))
+            for name, spec in cfg.get("personas", {}).items()}
+
+
+def reward_fn(persona, path=None):
+    personas = load_personas(path or DEFAULT_CONFIG)
+    if persona not in personas:
+        raise ValueError(f"Unknown persona {persona!r}; {path or DEFAULT_CONFIG} defines {sorted(personas)}")
+    return personas[persona]
@@ -0,0 +1,69 @@
+import math
+import struct
+import numpy as np
+
+# Section kinds in a state blob
+FLOATS, RNG, BYTES = 0, 1, 2
+
+
+class StateWriter:
+    """Builds a state blob out of typed sections written in a fixed order.
+
+    Sections are float64 vectors, random.Random states (624 uint32 words plus
+    index and gauss_next) and raw byte arrays; the reader must ask for them in
+    the same order they were written.
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def floats(self, values):
+        arr = np.asarray(values, dtype=np.float64).ravel()
+        self.parts.append(struct.pack("<BI", FLOATS, arr.size))
+        self.parts.append(arr.tobytes())
+
+    def rng(self, rng):
+        # Works for random.Random instances and for the random module itself
+        version, internal, gauss = rng.getstate()
+        arr = np.array(internal, dtype=np.uint32)
+        self.parts.append(struct.pack("<BIId", RNG, arr.size, version, math.nan if gauss is None else gauss))
+        self.parts.append(arr.tobytes())
+
+    def bytes(self, arr):
+        data = np.ascontiguousarray(arr).tobytes()
+        self.parts.append(struct.pack("<BI", BYTES, len(data)))
+        self.parts.append(data)
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+
+class StateReader:
+    def __init__(self, blob):
+        self.buf = memoryview(blob)
+        self.pos = 0
+
+    def _header(self, fmt, kind):
+        fields = struct.unpack_from(fmt, self.buf, self.pos)
+        if fields[0] != kind:
+            raise ValueError(f"corrupt state blob: expected section {kind} at byte {self.pos}, got {fields[0]}")
+        self.pos += struct.calcsize(fmt)
+        return fields[1:]
+
+    def floats(self):
+        n, = self._header("<BI", FLOATS)
+        arr = np.frombuffer(self.buf, dtype=np.float64, count=n, offset=self.pos)
+        self.pos += arr.nbytes
+        return arr
+
+    def rng(self, rng):
+        n, version, gauss = self._header("<BIId", RNG)
+        arr = np.frombuffer(self.buf, dtype=np.uint32, count=n, offset=self.pos)
+        self.pos += arr.nbytes
+        rng.setstate((version, tuple(arr.tolist()), None if math.isnan(gauss) else gauss))
+
+    def bytes(self):
+        n, = self._header("<BI", BYTES)
+        data = self.buf[self.pos:self.pos + n]
+        self.pos += n
+        return data
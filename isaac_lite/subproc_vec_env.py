@@ -0,0 +1,226 @@
+import multiprocessing as mp
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+from isaac_lite.vec_env import IsaacLiteVecEnv
+from isaac_lite.observation import NearestObs
+
+OBS_DIM = 20
+
+
+def _layout(n_envs, n_slots, obs_dim=OBS_DIM):
+    # (name, shape, dtype) of every array carved out of the shared segment
+    return [
+        ("actions", (n_envs,), np.int64),
+        ("obs", (n_slots, n_envs, obs_dim), np.float32),
+        ("rewards", (n_slots, n_envs), np.float32),
+        ("dones", (n_slots, n_envs), np.bool_),
+        ("truncated", (n_slots, n_envs), np.bool_),
+        ("damage_taken", (n_slots, n_envs), np.int64),
+        ("enemies_killed", (n_slots, n_envs), np.int64),
+        ("terminal_obs", (n_envs, obs_dim), np.float32),
+    ]
+
+
+def _nbytes(layout):
+    # 64-byte alignment per array keeps workers off each other's cache lines
+    return sum(-(-int(np.prod(shape)) * np.dtype(dt).itemsize // 64) * 64 for _, shape, dt in layout)
+
+
+def _views(buf, layout):
+    arrays, offset = {}, 0
+    for name, shape, dt in layout:
+        arrays[name] = np.ndarray(shape, dtype=dt, buffer=buf, offset=offset)
+        offset += -(-int(np.prod(shape)) * np.dtype(dt).itemsize // 64) * 64
+    return arrays
+
+
+def _worker(conn, shm_name, n_envs, n_slots, start, stop, env_kwargs):
+    # Workers share the parent's resource tracker, so attaching here does not
+    # register a second owner; the parent unlinks the segment in close()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = slice(start, stop)
+    env = IsaacLiteVecEnv(stop - start, **env_kwargs)
+    bufs = _views(shm.buf, _layout(n_envs, n_slots, env.observation_space.shape[0]))
+
+    try:
+        while True:
+            cmd, data = conn.recv()
+            if cmd == "step":
+                slot = data
+                obs, rewards, dones, infos = env.step(bufs["actions"][block])
+                bufs["obs"][slot, block] = obs
+                bufs["rewards"][slot, block] = rewards
+                bufs["dones"][slot, block] = dones
+                for i, info in enumerate(infos):
+                    bufs["damage_taken"][slot, start + i] = info["damage_taken"]
+                    bufs["enemies_killed"][slot, start + i] = info["enemies_killed"]
+                    if "terminal_observation" in info:
+                        bufs["terminal_obs"][start + i] = info["terminal_observation"]
+                        bufs["truncated"][slot, start + i] = info["TimeLimit.truncated"]
+                conn.send(None)
+            elif cmd == "reset":
+                slot, seeds = data
+                env._seeds = seeds
+                bufs["obs"][slot, block] = env.reset()
+                conn.send(None)
+            elif cmd == "env_method":
+                name, args, kwargs, indices = data
+                conn.send(env.env_method(name, *args, indices=indices, **kwargs))
+            elif cmd == "get_attr":
+                name, indices = data
+                conn.send(env.get_attr(name, indices))
+            elif cmd == "set_attr":
+                name, value, indices = data
+                conn.send(env.set_attr(name, value, indices))
+            elif cmd == "close":
+                env.close()
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del bufs
+        shm.close()
+        conn.close()
+
+
+class SubprocIsaacLiteVecEnv(VecEnv):
+    """IsaacLiteVecEnv blocks spread over worker processes.
+
+    Each worker hosts a contiguous block of envs and writes observations,
+    rewards and dones straight into a shared-memory ring of `n_slots` step
+    slots; only tiny command messages travel over the pipes. Step t lands in
+    slot t % n_slots, so the returned arrays stay valid for n_slots - 1
+    further steps without being copied.
+    """
+
+    def __init__(self, n_envs, n_workers, seed=None, persona='survivor', max_steps=200,
+                 log_dir="logs", n_slots=4, start_method=None, metrics_path=None, max_rooms=4,
+                 obs_type="vector", k_enemies=3, k_powerups=2, reward_config=None):
+        if not 1 <= n_workers <= n_envs:
+            raise ValueError(f"n_workers must be between 1 and n_envs ({n_envs}), got {n_workers}")
+        if n_slots < 2:
+            raise ValueError("n_slots must be at least 2")
+
+        self.seed_val = seed if seed is not None else int(time.time())
+        self.persona = persona
+        self.n_slots = n_slots
+        self.slot = 0
+        self.closed = False
+
+        if obs_type == "nearest":
+            observation_space = NearestObs(k_enemies, k_powerups).space()
+        else:
+            observation_space = spaces.Box(low=-9999, high=9999, shape=(OBS_DIM,), dtype=np.float32)
+        layout = _layout(n_envs, n_slots, observation_space.shape[0])
+        self.shm = shared_memory.SharedMemory(create=True, size=_nbytes(layout))
+        self._bufs = _views(self.shm.buf, layout)
+
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.blocks = [(int(b[0]), int(b[-1]) + 1) for b in np.array_split(np.arange(n_envs), n_workers)]
+        self.remotes, self.processes = [], []
+        for start, stop in self.blocks:
+            # Workers share one metrics file; the sink appends whole lines atomically
+            env_kwargs = dict(seed=self.seed_val + start, persona=persona, max_steps=max_steps, log_dir=log_dir,
+                              metrics_path=metrics_path, env_offset=start, max_rooms=max_rooms,
+                              obs_type=obs_type, k_enemies=k_enemies, k_powerups=k_powerups,
+                              reward_config=reward_config)
+            remote, work_remote = ctx.Pipe()
+            proc = ctx.Process(
+                target=_worker,
+                args=(work_remote, self.shm.name, n_envs, n_slots, start, stop, env_kwargs),
+                daemon=True,
+            )
+            proc.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(proc)
+
+        super().__init__(n_envs, observation_space, spaces.Discrete(9))
+
+    # RESET / STEP
+    def reset(self):
+        self.slot = (self.slot + 1) % self.n_slots
+        for remote, (start, stop) in zip(self.remotes, self.blocks):
+            remote.send(("reset", (self.slot, self._seeds[start:stop])))
+        for remote in self.remotes:
+            remote.recv()
+        self._reset_seeds()
+        self._reset_options()
+        return self._bufs["obs"][self.slot]
+
+    def step_async(self, actions):
+        self.slot = (self.slot + 1) % self.n_slots
+        self._bufs["actions"][:] = np.asarray(actions).reshape(self.num_envs)
+        for remote in self.remotes:
+            remote.send(("step", self.slot))
+
+    def step_wait(self):
+        for remote in self.remotes:
+            remote.recv()
+
+        s = self.slot
+        dones = self._bufs["dones"][s]
+        infos = [
+            {"damage_taken": d, "enemies_killed": k}
+            for d, k in zip(self._bufs["damage_taken"][s].tolist(), self._bufs["enemies_killed"][s].tolist())
+        ]
+        truncated = self._bufs["truncated"][s]
+        for i in np.flatnonzero(dones):
+            infos[i]["terminal_observation"] = self._bufs["terminal_obs"][i].copy()
+            infos[i]["TimeLimit.truncated"] = bool(truncated[i])
+        return self._bufs["obs"][s], self._bufs["rewards"][s], dones, infos
+
+    # UTILITIES
+    def _route(self, indices):
+        # Group global env indices by worker, as (remote, local indices)
+        if indices is None:
+            indices = range(self.num_envs)
+        elif isinstance(indices, (int, np.integer)):
+            indices = [indices]
+        routes = []
+        for remote, (start, stop) in zip(self.remotes, self.blocks):
+            local = [i - start for i in indices if start <= i < stop]
+            if local:
+                routes.append((remote, local))
+        return routes
+
+    def _gather(self, cmd, data_fn, indices):
+        routes = self._route(indices)
+        for remote, local in routes:
+            remote.send((cmd, data_fn(local)))
+        results = []
+        for remote, _ in routes:
+            results.extend(remote.recv())
+        return results
+
+    def get_attr(self, attr_name, indices=None):
+        return self._gather("get_attr", lambda local: (attr_name, local), indices)
+
+    def set_attr(self, attr_name, value, indices=None):
+        for remote, local in self._route(indices):
+            remote.send(("set_attr", (attr_name, value, local)))
+            remote.recv()
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        return self._gather("env_method", lambda local: (method_name, method_args, method_kwargs, local), indices)
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _, local in self._route(indices) for _ in local]
+
+    def close(self):
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for proc in self.processes:
+            proc.join()
+        del self._bufs
+        self.shm.close()
+        self.shm.unlink()
+        self.closed = True
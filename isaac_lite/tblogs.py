@@ -0,0 +1,189 @@
+import concurrent.futures as cf
+import os
+import struct
+import numpy as np
+import pandas as pd
+from tensorboard.compat.proto.event_pb2 import Event
+from isaac_lite.registry import _NAME_RE
+
+DEFAULT_CACHE = os.path.join("logs", "tb_cache")
+REWARD_TAG = "rollout/ep_rew_mean"
+
+_DT_FLOAT, _DT_DOUBLE = 1, 2
+_CATEGORIES = ("path", "run_dir", "algo", "persona", "tag")
+_COLUMNS = ["path", "run_dir", "algo", "persona", "seed", "run", "tag", "step", "wall_time", "value"]
+
+
+def _records(data):
+    # TFRecord framing: u64 length, u32 length crc, payload, u32 payload crc.
+    # A partly written last record (a live run) is left for the next scan.
+    pos, end = 0, len(data)
+    while pos + 12 <= end:
+        (n,) = struct.unpack_from("<Q", data, pos)
+        if pos + 12 + n + 4 > end:
+            return
+        yield data[pos + 12:pos + 12 + n]
+        pos += 12 + n + 4
+
+
+def _scalar(v):
+    if v.HasField("simple_value"):
+        return v.simple_value
+    t = v.tensor
+    if t.dtype == _DT_FLOAT:
+        vals = t.float_val or np.frombuffer(t.tensor_content, "<f4")
+    elif t.dtype == _DT_DOUBLE:
+        vals = t.double_val or np.frombuffer(t.tensor_content, "<f8")
+    else:
+        return None
+    return float(vals[0]) if len(vals) == 1 else None
+
+
+def read_scalars(path):
+    """Every scalar in one tfevents file as a DataFrame (tag, step, wall_time, value)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    tags, steps, times, values = [], [], [], []
+    event = Event()
+    for record in _records(data):
+        event.ParseFromString(record)
+        if not event.HasField("summary"):
+            continue
+        for v in event.summary.value:
+            x = _scalar(v)
+            if x is not None:
+                tags.append(v.tag)
+                steps.append(event.step)
+                times.append(event.wall_time)
+                values.append(x)
+    return pd.DataFrame({"tag": tags, "step": np.array(steps, dtype=np.int64),
+                         "wall_time": np.array(times, dtype=np.float64),
+                         "value": np.array(values, dtype=np.float64)})
+
+
+def run_meta(path):
+    """algo, persona, seed and run read from a run's directory names, like
+    the checkpoint registry does for .zip names."""
+    m = _NAME_RE.search(os.path.dirname(path).lower())
+    if not m:
+        return {"algo": None, "persona": None, "seed": None, "run": None}
+    return {"algo": m["algo"], "persona": m["persona"],
+            "seed": int(m["seed"]) if m["seed"] else None, "run": int(m["run"]) if m["run"] else None}
+
+
+def _ingest(path):
+    df = read_scalars(path)
+    meta = run_meta(path)
+    df.insert(0, "path", path)
+    df.insert(1, "run_dir", os.path.dirname(path))
+    for i, col in enumerate(("algo", "persona", "seed", "run")):
+        df.insert(2 + i, col, meta[col])
+    return df
+
+
+class ScalarStore:
+    """Parquet cache of the TensorBoard scalars under one or more log roots.
+
+    scan() parses only tfevents files whose size or mtime changed since the
+    last scan (on `workers` processes) and drops files that are gone; the
+    rest is read back from the cache. Files are keyed by absolute path, so the
+    cache works from any working directory. Queries load a single Parquet file with
+    filters pushed down, so they stay fast for hundreds of runs.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE):
+        self.cache_dir = cache_dir
+        self.scalars_path = os.path.join(cache_dir, "scalars.parquet")
+        self.files_path = os.path.join(cache_dir, "files.parquet")
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _files(self):
+        if not os.path.exists(self.files_path):
+            return pd.DataFrame({"path": pd.Series([], dtype=object), "size": pd.Series([], dtype=np.int64),
+                                 "mtime_ns": pd.Series([], dtype=np.int64)})
+        return pd.read_parquet(self.files_path)
+
+    def scan(self, roots=("logs",), workers=0):
+        """Ingests new or changed tfevents files under `roots`; returns
+        (added or updated, removed)."""
+        files = self._files()
+        known = dict(zip(files["path"], zip(files["size"].tolist(), files["mtime_ns"].tolist())))
+        seen, changed = {}, []
+        roots = [os.path.abspath(r) for r in roots]
+        for root in roots:
+            for dirpath, _, names in os.walk(root):
+                for name in names:
+                    if "tfevents" not in name:
+                        continue
+                    path = os.path.join(dirpath, name)
+                    st = os.stat(path)
+                    seen[path] = (st.st_size, st.st_mtime_ns)
+                    if known.get(path) != seen[path]:
+                        changed.append(path)
+
+        gone = [p for p in known if p not in seen and any(p.startswith(r + os.sep) for r in roots)]
+        if not changed and not gone:
+            return 0, 0
+
+        if workers > 0 and len(changed) > 1:
+            with cf.ProcessPoolExecutor(min(workers, len(changed))) as pool:
+                frames = list(pool.map(_ingest, changed))
+        else:
+            frames = [_ingest(p) for p in changed]
+
+        # Keep cached rows of untouched files, swap in the re-read ones
+        stale = set(changed) | set(gone)
+        if os.path.exists(self.scalars_path):
+            old = pd.read_parquet(self.scalars_path)
+            frames.insert(0, old[~old["path"].isin(stale)])
+        self._write(self.scalars_path, _tidy(pd.concat(frames, ignore_index=True)))
+
+        files = files[~files["path"].isin(stale)]
+        new = pd.DataFrame({"path": changed, "size": np.array([seen[p][0] for p in changed], dtype=np.int64),
+                            "mtime_ns": np.array([seen[p][1] for p in changed], dtype=np.int64)})
+        self._write(self.files_path, pd.concat([files, new], ignore_index=True))
+        return len(changed), len(gone)
+
+    @staticmethod
+    def _write(path, df):
+        # Written aside and renamed, so a crash never leaves half a cache
+        tmp = path + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    # QUERIES
+    def scalars(self, tag=None, algo=None, persona=None, seed=None, columns=None):
+        """Tidy DataFrame of cached scalars, one row per (file, tag, step)."""
+        if not os.path.exists(self.scalars_path):
+            return _tidy(pd.DataFrame({c: [] for c in _COLUMNS}))
+        filters = [(col, "==", val) for col, val in (("tag", tag), ("algo", algo), ("persona", persona),
+                                                     ("seed", seed)) if val is not None]
+        return pd.read_parquet(self.scalars_path, columns=columns, filters=filters or None)
+
+    def reward_curves(self, algo=None, persona=None, seed=None, tag=REWARD_TAG):
+        """Mean episode reward over training steps, per run."""
+        df = self.scalars(tag=tag, algo=algo, persona=persona, seed=seed,
+                          columns=["algo", "persona", "seed", "run", "run_dir", "step", "wall_time", "value"])
+        return df.sort_values(["run_dir", "step"], ignore_index=True)
+
+    def tags(self):
+        return sorted(self.scalars(columns=["tag"])["tag"].unique())
+
+    def runs(self):
+        """One row per cached run directory with its algo, persona, seed and row count."""
+        df = self.scalars(columns=["run_dir", "algo", "persona", "seed", "run"])
+        return df.groupby("run_dir", observed=True, dropna=False).agg(
+            algo=("algo", "first"), persona=("persona", "first"), seed=("seed", "first"),
+            run=("run", "first"), rows=("algo", "size")).reset_index()
+
+
+def _tidy(df):
+    df = df.reindex(columns=_COLUMNS)
+    for col in _CATEGORIES:
+        df[col] = df[col].astype("category")
+    for col in ("seed", "run"):
+        df[col] = df[col].astype("Int64")
+    df["step"] = df["step"].astype(np.int64)
+    df["wall_time"] = df["wall_time"].astype(np.float64)
+    df["value"] = df["value"].astype(np.float64)
+    return df
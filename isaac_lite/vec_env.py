@@ -0,0 +1,388 @@
+import random
+import time
+import json
+import os
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+from isaac_lite.batched import BatchedGame, SHOOT
+from isaac_lite.game import ROOM_W, ROOM_H, PLAYER_RADIUS
+from isaac_lite.env import LENGTH_BINS, length_histogram
+from isaac_lite.metrics import EpisodeMetricsSink
+from isaac_lite.observation import NearestObs
+from isaac_lite.rewards import reward_fn
+
+SPEED, DAMAGE = 0, 1
+BOOST_DURATION = 200
+MAX_POWERUPS = 8
+# Powerup spawn rolls drawn ahead per env, one used per step
+SPAWN_BLOCK = 256
+
+
+class IsaacLiteVecEnv(VecEnv):
+    """N IsaacLiteEnvs in one process, stepped as array operations.
+
+    Game logic runs on BatchedGame; reward shaping, powerups, boosts and the
+    20-dim observation follow IsaacLiteEnv but are computed for all envs at once.
+    Finished envs are reset automatically, like DummyVecEnv does.
+    """
+
+    def __init__(self, n_envs, seed=None, persona='survivor', max_steps=200, log_dir="logs", metrics_path=None,
+                 env_offset=0, max_rooms=4, obs_type="vector", k_enemies=3, k_powerups=2, reward_config=None,
+                 reward_breakdown=False):
+        self.seed_val = seed if seed is not None else int(time.time())
+        self.persona = persona
+        self.reward_fn = reward_fn(persona, reward_config)
+        self.max_steps = max_steps
+        self.log_dir = log_dir
+        self.render_mode = None
+        os.makedirs(log_dir, exist_ok=True)
+
+        self.game = BatchedGame(n_envs, rngs=[random.Random() for _ in range(n_envs)], max_rooms=max_rooms)
+        self.env_seeds = [self.seed_val + i for i in range(n_envs)]
+
+        # Same observation types as IsaacLiteEnv, minus pixels
+        if obs_type not in ("vector", "nearest"):
+            raise ValueError(f"obs_type must be 'vector' or 'nearest', got {obs_type!r}")
+        self.obs_type = obs_type
+        self.nearest_obs = NearestObs(k_enemies, k_powerups) if obs_type == "nearest" else None
+        if self.nearest_obs is not None:
+            observation_space = self.nearest_obs.space()
+        else:
+            observation_space = spaces.Box(low=-9999, high=9999, shape=(20,), dtype=np.float32)
+        super().__init__(n_envs, observation_space, spaces.Discrete(9))
+
+        n = n_envs
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.float64)
+        self.last_x = np.zeros(n, dtype=np.float64)
+        self.last_y = np.zeros(n, dtype=np.float64)
+
+        # Powerup slots; `pu_born` keeps spawn order so obs shows the oldest two
+        self.pu_x = np.zeros((n, MAX_POWERUPS), dtype=np.float64)
+        self.pu_y = np.zeros((n, MAX_POWERUPS), dtype=np.float64)
+        self.pu_type = np.zeros((n, MAX_POWERUPS), dtype=np.int64)
+        self.pu_ttl = np.zeros((n, MAX_POWERUPS), dtype=np.int64)
+        self.pu_born = np.zeros((n, MAX_POWERUPS), dtype=np.int64)
+
+        # Each env draws its powerups from its own generator, reseeded from its
+        # seed on every reset, so a seed always plays the same game no matter
+        # what the other envs do. Spawn rolls are drawn SPAWN_BLOCK at a time.
+        self.pu_rngs = [None] * n
+        self.pu_rolls = np.zeros((n, SPAWN_BLOCK), dtype=np.float64)
+        self.pu_cursor = np.zeros(n, dtype=np.int64)
+
+        # Remaining ticks per boost, indexed by SPEED / DAMAGE
+        self.boost_ttl = np.zeros((n, 2), dtype=np.int64)
+
+        self.base_speed = 3.5
+        self.base_damage = 1.0
+
+        self.ep_enemies_killed = np.zeros(n, dtype=np.int64)
+        self.ep_rooms_visited = np.zeros(n, dtype=np.int64)
+        self.ep_deaths = np.zeros(n, dtype=np.int64)
+        self.ep_time_start = np.zeros(n, dtype=np.float64)
+        self.ep_damage_taken = np.zeros(n, dtype=np.int64)
+        self.ep_shots_fired = np.zeros(n, dtype=np.int64)
+        self.length_counts = np.zeros((n, LENGTH_BINS), dtype=np.int64)
+
+        # Per-episode running total of every reward term, see IsaacLiteEnv
+        self.reward_totals = np.zeros((n, len(self.reward_fn.names))) if reward_breakdown else None
+
+        # Optional per-episode JSONL log; `env_offset` numbers envs globally
+        # when this is one worker's block of a SubprocIsaacLiteVecEnv
+        self.metrics_sink = EpisodeMetricsSink(metrics_path) if metrics_path else None
+        self.env_offset = env_offset
+        self.episodes_done = 0
+
+        self._obs = np.zeros((n,) + observation_space.shape, dtype=np.float32)
+        self._rows = np.arange(n)
+        self._enemy_slots = np.arange(self.game.max_enemies)
+        self._actions = np.zeros(n, dtype=np.int64)
+
+    # RESET
+    def reset(self):
+        for i, s in enumerate(self._seeds):
+            if s is not None:
+                self.env_seeds[i] = s
+        self._reset_envs(self._rows)
+        self._reset_seeds()
+        self._reset_options()
+        return self._format_obs().copy()
+
+    def _reset_envs(self, idx):
+        # Like IsaacLiteEnv.reset, each env replays its own seed on reset
+        self.game.reset(seeds=[self.env_seeds[i] for i in idx], idx=idx)
+        self.game.player_speed[idx] = self.base_speed
+        self.game.player_damage[idx] = self.base_damage
+
+        self.steps[idx] = 0
+        self.score[idx] = 0.0
+        self.pu_ttl[idx] = 0
+        self.boost_ttl[idx] = 0
+        for i in idx:
+            self.pu_rngs[i] = np.random.default_rng(self.env_seeds[i])
+            self._draw_rolls(i)
+        self.last_x[idx] = self.game.player_x[idx]
+        self.last_y[idx] = self.game.player_y[idx]
+
+        self.ep_enemies_killed[idx] = 0
+        self.ep_rooms_visited[idx] = [len(self.game.rooms_visited[i]) for i in idx]
+        self.ep_deaths[idx] = 0
+        self.ep_time_start[idx] = time.time()
+        self.ep_damage_taken[idx] = 0
+        self.ep_shots_fired[idx] = 0
+        if self.reward_totals is not None:
+            self.reward_totals[idx] = 0.0
+
+    def reset_env(self, i, seed=None):
+        """Resets env i, optionally onto a new seed, and returns its observation.
+
+        Per-env like save_episode_metrics, so it also works through env_method
+        on SubprocIsaacLiteVecEnv.
+        """
+        if seed is not None:
+            self.env_seeds[i] = seed
+        self._reset_envs(np.array([i]))
+        return self._format_obs()[i].copy()
+
+    # STEP
+    def step_async(self, actions):
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        actions = self._actions
+        damage_taken, enemies_killed, dones = self.game.step(actions)
+        self.steps += 1
+
+        # Random powerup spawns
+        self._spawn_powerups(self._spawn_rolls() < 0.01)
+
+        # Decay / expire active boosts
+        self._update_boosts()
+
+        # Reward shaping
+        rewards = self._compute_reward(damage_taken, enemies_killed, actions)
+
+        # Handle powerup pickup
+        rewards += self._pickup_powerups()
+        self.score += rewards
+
+        # Kills (BatchedGame reports each kill exactly once)
+        self.ep_enemies_killed += enemies_killed
+        self.score += 0.5 * enemies_killed
+        self.ep_deaths += dones
+        self.ep_damage_taken += damage_taken
+        self.ep_shots_fired += SHOOT[actions]
+
+        # Time limit; death wins when both happen on the same tick
+        if self.max_steps is not None:
+            truncated = ~dones & (self.steps >= self.max_steps)
+            ended = dones | truncated
+        else:
+            truncated = np.zeros_like(dones)
+            ended = dones
+
+        obs = self._format_obs()
+        infos = [
+            {"damage_taken": d, "enemies_killed": k}
+            for d, k in zip(damage_taken.tolist(), enemies_killed.tolist())
+        ]
+        if self.reward_totals is not None:
+            names = self.reward_fn.names
+            for info, totals in zip(infos, self.reward_totals.tolist()):
+                info["reward_terms"] = dict(zip(names, totals))
+
+        done_idx = np.flatnonzero(ended)
+        if done_idx.size:
+            if self.max_steps is not None:
+                bins = np.minimum(self.steps[done_idx] * LENGTH_BINS // self.max_steps, LENGTH_BINS - 1)
+                np.add.at(self.length_counts, (done_idx, bins), 1)
+            for i in done_idx:
+                infos[i]["terminal_observation"] = obs[i].copy()
+                infos[i]["TimeLimit.truncated"] = bool(truncated[i])
+                if self.metrics_sink is not None:
+                    self.metrics_sink.append(dict(
+                        self._episode_metrics(i), truncated=int(truncated[i]), env=self.env_offset + int(i),
+                        episode=self.episodes_done, seed=self.env_seeds[i], persona=self.persona,
+                        score=float(self.score[i]), time_end=time.time()))
+                self.episodes_done += 1
+            self._reset_envs(done_idx)
+            obs = self._format_obs()
+
+        return obs.copy(), rewards.astype(np.float32), ended, infos
+
+    # POWERUPS & BOOSTS
+    def _draw_rolls(self, i):
+        self.pu_rolls[i] = self.pu_rngs[i].random(SPAWN_BLOCK)
+        self.pu_cursor[i] = 0
+
+    def _spawn_rolls(self):
+        # This step's spawn roll of every env
+        rolls = self.pu_rolls[self._rows, self.pu_cursor]
+        self.pu_cursor += 1
+        for i in np.flatnonzero(self.pu_cursor == SPAWN_BLOCK):
+            self._draw_rolls(i)
+        return rolls
+
+    def _spawn_powerups(self, spawn):
+        rows = np.flatnonzero(spawn)
+        if rows.size == 0:
+            return
+        # First free slot per env; envs with every slot taken skip this spawn
+        free = self.pu_ttl[rows] <= 0
+        has_free = free.any(axis=1)
+        rows = rows[has_free]
+        slot = free[has_free].argmax(axis=1)
+        for i, j in zip(rows.tolist(), slot.tolist()):
+            rng = self.pu_rngs[i]
+            self.pu_type[i, j] = rng.integers(0, 2)
+            self.pu_x[i, j] = rng.uniform(50, ROOM_W - 50)
+            self.pu_y[i, j] = rng.uniform(50, ROOM_H - 50)
+            self.pu_ttl[i, j] = rng.integers(150, 301)
+        self.pu_born[rows, slot] = self.steps[rows]
+
+    def _update_boosts(self):
+        active = self.boost_ttl > 0
+        self.boost_ttl -= active
+        expired = active & (self.boost_ttl <= 0)
+        self.game.player_speed[expired[:, SPEED]] = self.base_speed
+        self.game.player_damage[expired[:, DAMAGE]] = self.base_damage
+
+        # Powerup TTL
+        self.pu_ttl -= self.pu_ttl > 0
+
+    def _pickup_powerups(self):
+        dx = self.pu_x - self.game.player_x[:, None]
+        dy = self.pu_y - self.game.player_y[:, None]
+        picked = (self.pu_ttl > 0) & (dx * dx + dy * dy < (PLAYER_RADIUS * 2) ** 2)
+        if not picked.any():
+            return 0.0
+
+        # Activating a boost that is already on only refreshes its timer
+        for b, attr, base in ((SPEED, "player_speed", self.base_speed),
+                              (DAMAGE, "player_damage", self.base_damage)):
+            got = (picked & (self.pu_type == b)).any(axis=1)
+            getattr(self.game, attr)[got] = base * 1.5
+            self.boost_ttl[got, b] = BOOST_DURATION
+
+        self.pu_ttl[picked] = 0
+        return 2.0 * picked.sum(axis=1)
+
+    # REWARD FUNCTION
+    def _compute_reward(self, damage_taken, enemies_killed, actions):
+        # Same signals as IsaacLiteEnv._compute_reward, for every env at once
+        rooms = np.fromiter(map(len, self.game.rooms_visited), dtype=np.int64, count=self.num_envs)
+        new_rooms = rooms - self.ep_rooms_visited
+        self.ep_rooms_visited[:] = rooms
+
+        px, py = self.game.player_x, self.game.player_y
+        # A door teleports the player; that jump is not movement
+        entered = self.game.entered
+        self.last_x[entered] = px[entered]
+        self.last_y[entered] = py[entered]
+        dx = px - self.last_x
+        dy = py - self.last_y
+        moved = np.sqrt(dx * dx + dy * dy)
+        self.last_x[:] = px
+        self.last_y[:] = py
+
+        outside = (px < 0) | (px > ROOM_W) | (py < 0) | (py > ROOM_H)
+        signals = (enemies_killed, damage_taken, new_rooms, moved, actions, outside,
+                   self.boost_ttl[:, SPEED] > 0, self.boost_ttl[:, DAMAGE] > 0)
+        if self.reward_totals is not None:
+            for j, term in enumerate(self.reward_fn.batch_terms(*signals)):
+                self.reward_totals[:, j] += term
+        return self.reward_fn.batch(*signals)
+
+    # OBSERVATION VECTOR
+    def _format_obs(self):
+        if self.nearest_obs is not None:
+            return self._nearest_obs()
+        obs = self._obs
+        g = self.game
+
+        obs[:, 0] = g.player_x
+        obs[:, 1] = g.player_y
+        obs[:, 2] = g.player_hp
+
+        # enemies (up to 3); slots past n_enemies stay zero like the single env
+        exists = self._enemy_slots[:3] < g.n_enemies[:, None]
+        enemies = obs[:, 3:12].reshape(-1, 3, 3)
+        enemies[:, :, 0] = np.where(exists, g.enemy_x[:, :3], 0.0)
+        enemies[:, :, 1] = np.where(exists, g.enemy_y[:, :3], 0.0)
+        enemies[:, :, 2] = exists & g.enemy_alive[:, :3]
+
+        # powerups (oldest two) -> indices 12..17
+        live = self.pu_ttl > 0
+        order = np.argsort(np.where(live, self.pu_born, np.iinfo(np.int64).max), axis=1, kind="stable")[:, :2]
+        rows = self._rows[:, None]
+        present = live[rows, order]
+        powerups = obs[:, 12:18].reshape(-1, 2, 3)
+        powerups[:, :, 0] = np.where(present, self.pu_x[rows, order], 0.0)
+        powerups[:, :, 1] = np.where(present, self.pu_y[rows, order], 0.0)
+        powerups[:, :, 2] = present
+
+        # boost flags -> indices 18,19
+        obs[:, 18] = self.boost_ttl[:, DAMAGE] > 0
+        obs[:, 19] = self.boost_ttl[:, SPEED] > 0
+        return obs
+
+    def _nearest_obs(self):
+        g = self.game
+        enemy_live = g.enemy_alive & (self._enemy_slots < g.n_enemies[:, None])
+        return self.nearest_obs.fill(
+            self._obs, g.player_x, g.player_y, g.player_hp, g.enemy_x, g.enemy_y, enemy_live,
+            self.pu_x, self.pu_y, self.pu_ttl > 0, self.boost_ttl[:, DAMAGE] > 0, self.boost_ttl[:, SPEED] > 0,
+            g.door_mask)
+
+    # UTILITIES
+    def _episode_metrics(self, i):
+        # Same keys as IsaacLiteEnv.episode_metrics
+        return {
+            'time_start': float(self.ep_time_start[i]),
+            'time_alive': int(self.steps[i]),
+            'enemies_killed': int(self.ep_enemies_killed[i]),
+            'rooms_visited': int(self.ep_rooms_visited[i]),
+            'damage_taken': int(self.ep_damage_taken[i]),
+            'shots_fired': int(self.ep_shots_fired[i]),
+            'deaths': int(self.ep_deaths[i]),
+            'truncated': 0
+        }
+
+    def save_episode_metrics(self, i=0, filename="episode_metrics.json"):
+        if self.metrics_sink is not None:
+            self.metrics_sink.flush()
+        path = os.path.join(self.log_dir, filename)
+        metrics = self._episode_metrics(i)
+        if self.max_steps is not None:
+            metrics['episode_length_hist'] = length_histogram(self.length_counts[i], self.max_steps)
+        with open(path, "w") as f:
+            json.dump(metrics, f, indent=2)
+
+        print(f"Saved metrics to {path} :)")
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, (int, np.integer)):
+            return [indices]
+        return indices
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name) for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        # Per-env methods take the env index as their first argument
+        method = getattr(self, method_name)
+        return [method(i, *method_args, **method_kwargs) for i in self._indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
+
+    def close(self):
+        if self.metrics_sink is not None:
+            self.metrics_sink.close()
@@ -0,0 +1,260 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+import numpy as np
+from isaac_lite.game import SimpleGame, Entity, ROOM_W, ROOM_H, ENEMY_RADIUS
+from isaac_lite.env import IsaacLiteEnv
+from isaac_lite.vec_env import IsaacLiteVecEnv
+
+# name -> (unit, factory); a factory takes the size scale and returns
+# (fn, work) where one call of fn does `work` units of work. Every result is
+# a throughput, so higher is always better.
+BENCHMARKS = {}
+
+
+def benchmark(name, unit):
+    def register(factory):
+        BENCHMARKS[name] = (unit, factory)
+        return factory
+    return register
+
+
+def _actions(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.randrange(9) for _ in range(n)]
+
+
+# ---------------------------------------------------------
+def _crowded_game(n_enemies, n_bullets, seed=0):
+    """A game with a fixed crowd that never dies, and stationary bullets that
+    never expire, so every timed pass simulates the same load."""
+    rng = random.Random(seed)
+    game = SimpleGame(rng=random.Random(seed))
+    game.player_hp = 10 ** 9
+    game.enemies = [Entity(rng.uniform(50, ROOM_W - 50), rng.uniform(50, ROOM_H - 50), ENEMY_RADIUS, hp=10 ** 9)
+                    for _ in range(n_enemies)]
+    for _ in range(n_bullets):
+        game.shots.append(game.bullet_pool.acquire(rng.uniform(0, ROOM_W), rng.uniform(0, ROOM_H), 0, 0,
+                                                   lifetime=10 ** 9))
+    return game
+
+
+def _game_bench(n_enemies, n_bullets):
+    def factory(scale):
+        game = _crowded_game(n_enemies, n_bullets)
+        blob = game.get_state()
+        # Movement only, so the player fires nothing. Bullets that hit an
+        # enemy are spent, so the pool is topped back up after every tick to
+        # keep the live bullet count at n_bullets.
+        actions = [a % 4 for a in _actions(2000 * scale)]
+        rng = random.Random(1)
+        spots = [(rng.uniform(0, ROOM_W), rng.uniform(0, ROOM_H)) for _ in range(997)]
+        shots, pool = game.shots, game.bullet_pool
+
+        def run():
+            game.set_state(blob)
+            k = 0
+            for a in actions:
+                game.tick(a)
+                while len(shots) < n_bullets:
+                    x, y = spots[k % 997]
+                    shots.append(pool.acquire(x, y, 0, 0, lifetime=10 ** 9))
+                    k += 1
+        return run, len(actions)
+    return factory
+
+
+for _e, _b in ((4, 0), (16, 16), (64, 60)):
+    benchmark(f"game.tick[enemies={_e},bullets={_b}]", "ticks/s")(_game_bench(_e, _b))
+
+
+# ---------------------------------------------------------
+def _env_step_bench(**env_kwargs):
+    def factory(scale):
+        env = IsaacLiteEnv(seed=0, log_dir="logs", **env_kwargs)
+        actions = _actions(2000 * scale)
+
+        def run():
+            env.reset()
+            for a in actions:
+                _, _, done, truncated, _ = env.step(a)
+                if done or truncated:
+                    env.reset()
+        return run, len(actions)
+    return factory
+
+
+benchmark("env.step", "steps/s")(_env_step_bench())
+benchmark("env.step[pixels]", "steps/s")(_env_step_bench(obs_type="pixels"))
+
+
+@benchmark("env.reset", "resets/s")
+def env_reset(scale):
+    env = IsaacLiteEnv(seed=0, log_dir="logs")
+    n = 500 * scale
+
+    def run():
+        for i in range(n):
+            env.reset(seed=i)
+    return run, n
+
+
+@benchmark("env.render[headless]", "frames/s")
+def env_render(scale):
+    env = IsaacLiteEnv(seed=0, log_dir="logs")
+    env.reset()
+    for a in _actions(50):
+        env.step(a)
+    n = 100 * scale
+
+    def run():
+        for _ in range(n):
+            env.render("rgb_array_headless")
+    return run, n
+
+
+# ---------------------------------------------------------
+def _vec_bench(n_envs):
+    def factory(scale):
+        env = IsaacLiteVecEnv(n_envs, seed=0, log_dir="logs")
+        rng = np.random.default_rng(0)
+        steps = max(1, 4000 * scale // n_envs)
+        actions = rng.integers(0, 9, size=(steps, n_envs))
+
+        def run():
+            env.reset()
+            for a in actions:
+                env.step(a)
+        return run, steps * n_envs
+    return factory
+
+
+for _n in (1, 8, 64):
+    benchmark(f"vec.step[n_envs={_n}]", "env-steps/s")(_vec_bench(_n))
+
+
+# ---------------------------------------------------------
+@benchmark("imitate.train_epoch", "samples/s")
+def bc_epoch(scale):
+    import torch
+    from stable_baselines3 import PPO
+    from imitate import _batches, train_epoch
+
+    torch.manual_seed(0)
+    rng = np.random.default_rng(0)
+    n = 20000 * scale
+    obs = rng.normal(size=(n, 20)).astype(np.float32)
+    actions = rng.integers(0, 9, size=n)
+    loader = _batches(obs, actions, 256, shuffle=True)
+    policy = PPO("MlpPolicy", IsaacLiteEnv(seed=0, log_dir="logs"), device="cpu", seed=0).policy
+    optimizer = torch.optim.Adam(policy.parameters(), lr=1e-3)
+
+    def run():
+        train_epoch(policy, optimizer, loader)
+    return run, n
+
+
+@benchmark("eval.evaluate", "episodes/s")
+def eval_episodes(scale):
+    from stable_baselines3 import PPO
+    from eval import evaluate
+
+    env = IsaacLiteVecEnv(16, seed=0, log_dir="logs")
+    model = PPO("MlpPolicy", env, device="cpu", seed=0)
+    episodes = 32 * scale
+
+    def run():
+        evaluate(model, env, episodes, seed=0)
+    return run, episodes
+
+
+# ---------------------------------------------------------
+def run_benchmarks(names, scale=1, repeat=5):
+    """Best-of-`repeat` throughput of each benchmark, after one warm-up call."""
+    results = {}
+    for name in names:
+        unit, factory = BENCHMARKS[name]
+        fn, work = factory(scale)
+        fn()
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        results[name] = {"value": work / best, "unit": unit, "seconds": best, "work": work}
+        print(f"{name:<36} {work / best:>14,.0f} {unit}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Prints each benchmark against the baseline; returns the names that got
+    slower by more than `threshold` (a fraction)."""
+    slower = []
+    print(f"\n{'benchmark':<36} {'baseline':>14} {'now':>14} {'change':>8}")
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<36} {'-':>14} {r['value']:>14,.0f}      new")
+            continue
+        change = r["value"] / base["value"] - 1
+        flag = ""
+        if change < -threshold:
+            slower.append(name)
+            flag = "  SLOWER"
+        print(f"{name:<36} {base['value']:>14,.0f} {r['value']:>14,.0f} {change:>+7.1%}{flag}")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmarks for the game, env, vec env, BC and eval")
+    parser.add_argument("-k", dest="select", default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    parser.add_argument("--scale", type=int, default=1, help="multiplies the work done per timed call")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default="logs/bench/latest.json")
+    parser.add_argument("--baseline", default="configs/bench_baseline.json",
+                        help="results to compare against (tracked in git, unlike --out); missing means no comparison")
+    parser.add_argument("--save-baseline", action="store_true", help="also store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="fail when a benchmark is this much slower than the baseline (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    names = [n for n in BENCHMARKS if args.select is None or args.select in n]
+    if args.list:
+        print("\n".join(names))
+        return
+    if not names:
+        parser.error(f"no benchmark matches -k {args.select!r}")
+
+    results = run_benchmarks(names, scale=args.scale, repeat=args.repeat)
+    report = {
+        "meta": {"time": time.time(), "python": platform.python_version(), "numpy": np.__version__,
+                 "machine": platform.machine(), "cpus": os.cpu_count(), "scale": args.scale},
+        "results": results,
+    }
+    paths = [args.out] + ([args.baseline] if args.save_baseline else [])
+    for path in paths:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"Saved {' and '.join(paths)}")
+
+    if args.save_baseline:
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, nothing to compare against; record one with --save-baseline")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("scale") != args.scale:
+        print(f"warning: baseline ran at --scale {baseline['meta'].get('scale')}, this run at {args.scale}")
+    slower = compare(results, baseline["results"], args.threshold)
+    if slower:
+        print(f"\n{len(slower)} benchmark(s) more than {args.threshold:.0%} slower than {args.baseline}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import random
+import sys
+import tracemalloc
+from isaac_lite.game import SimpleGame
+from isaac_lite.env import IsaacLiteEnv
+
+
+def game_loop(game, actions):
+    def loop():
+        for a in actions:
+            _, _, done = game.step(a)
+            if done:
+                game.reset(seed=0)
+    return loop
+
+
+def env_loop(env, actions):
+    def loop():
+        for a in actions:
+            _, _, done, _, _ = env.step(a)
+            if done:
+                env.reset()
+    return loop
+
+
+def measure(loop, steps):
+    """Retained bytes per step and transient peak over one pass of `loop`."""
+    tracemalloc.start()
+    loop()  # first pass settles pools and lazily created caches
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    loop()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / steps, peak - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that steady-state allocations per step stay bounded")
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-bytes-per-step", type=float, default=1.0)
+    parser.add_argument("--max-peak-bytes", type=int, default=16 * 1024)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    actions = [rng.randrange(9) for _ in range(args.steps)]
+
+    game = SimpleGame(rng=random.Random(0))
+    env = IsaacLiteEnv(seed=0, log_dir="logs")
+    env.reset()
+    pool_size = len(game.bullet_pool.free)
+
+    failed = False
+    for name, loop in (("SimpleGame.step", game_loop(game, actions)),
+                       ("IsaacLiteEnv.step", env_loop(env, actions))):
+        per_step, peak = measure(loop, args.steps)
+        ok = per_step <= args.max_bytes_per_step and peak <= args.max_peak_bytes
+        failed |= not ok
+        print(f"{name:<20} retained {per_step:8.2f} B/step  peak +{peak / 1024:7.1f} KiB  {'ok' if ok else 'FAIL'}")
+
+    # Every bullet fired must have come from (and gone back to) the pool
+    in_use = len(game.bullet_pool.free) + len(game.shots)
+    ok = in_use == pool_size
+    failed |= not ok
+    print(f"{'bullet pool':<20} {in_use} / {pool_size} bullets accounted for  {'ok' if ok else 'FAIL'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
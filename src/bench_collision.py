@@ -0,0 +1,92 @@
+import argparse
+import math
+import random
+import timeit
+from isaac_lite.collision import SpatialHash, within
+from isaac_lite.game import ROOM_W, ROOM_H, ENEMY_RADIUS
+
+BULLET_RADIUS = 4
+HIT_DIST = ENEMY_RADIUS + BULLET_RADIUS
+
+
+def make_points(n, rng):
+    return [(rng.uniform(0, ROOM_W), rng.uniform(0, ROOM_H)) for _ in range(n)]
+
+
+def brute_hypot(bullets, enemies):
+    # Every bullet against every enemy with math.hypot
+    hits = 0
+    for bx, by in bullets:
+        for ex, ey in enemies:
+            if math.hypot(bx - ex, by - ey) < HIT_DIST:
+                hits += 1
+    return hits
+
+
+def brute_squared(bullets, enemies):
+    hits = 0
+    for bx, by in bullets:
+        for ex, ey in enemies:
+            if within(bx, by, ex, ey, HIT_DIST):
+                hits += 1
+    return hits
+
+
+def brute_inline(bullets, enemies):
+    # What SimpleGame.tick does below GRID_MIN_ENEMIES: the squared test inlined
+    hits = 0
+    r2 = HIT_DIST * HIT_DIST
+    for bx, by in bullets:
+        for ex, ey in enemies:
+            dx = bx - ex
+            dy = by - ey
+            if dx * dx + dy * dy < r2:
+                hits += 1
+    return hits
+
+
+_grid = SpatialHash(ROOM_W, ROOM_H)
+
+
+def grid(bullets, enemies):
+    # Cleared and refilled every call, like SimpleGame does each tick from GRID_MIN_ENEMIES up
+    g = _grid
+    g.clear()
+    for i, (ex, ey) in enumerate(enemies):
+        g.insert(i, ex, ey)
+    hits = 0
+    for bx, by in bullets:
+        for i in g.query(bx, by, HIT_DIST):
+            ex, ey = enemies[i]
+            if within(bx, by, ex, ey, HIT_DIST):
+                hits += 1
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broad-phase collision scaling: n bullets vs n enemies")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 8, 16, 32, 64, 125, 250, 500])
+    parser.add_argument("--bullets", type=int, default=None,
+                        help="fixed bullet count instead of n (60 is a full stream of shots)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'n':>5} {'hypot us':>12} {'squared us':>12} {'inline us':>12} {'grid us':>12} {'grid/inline':>12}")
+    for n in args.sizes:
+        bullets = make_points(args.bullets or n, rng)
+        enemies = make_points(n, rng)
+        assert brute_hypot(bullets, enemies) == brute_inline(bullets, enemies) == grid(bullets, enemies)
+
+        number = max(1, 20000 // (len(bullets) * n))
+        times = []
+        for fn in (brute_hypot, brute_squared, brute_inline, grid):
+            best = min(timeit.repeat(lambda: fn(bullets, enemies), number=number, repeat=args.repeat))
+            times.append(best / number * 1e6)
+        print(f"{n:>5} {times[0]:>12.1f} {times[1]:>12.1f} {times[2]:>12.1f} {times[3]:>12.1f} "
+              f"{times[3] / times[2]:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
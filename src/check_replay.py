@@ -0,0 +1,72 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from isaac_lite.env import IsaacLiteEnv
+from isaac_lite.recording import ActionRecorder, SessionRecorder, load_session
+from isaac_lite.replay import replay_files
+
+
+def record(rec_path, act_path, seed, persona, steps, rng):
+    """Plays sticky random actions, saving the session both ways. Episodes
+    reset on death, truncation and, like solo.py, on a win."""
+    env = IsaacLiteEnv(seed=seed, persona=persona, log_dir=os.path.dirname(rec_path))
+    env.reset()
+    with SessionRecorder(rec_path, persona=persona, seed=seed) as full, \
+            ActionRecorder(act_path, persona=persona, seed=seed, max_steps=env.max_steps,
+                           max_rooms=env.game.max_rooms) as log:
+        action = 8
+        for _ in range(steps):
+            if rng.random() < 0.2:
+                action = rng.randrange(env.action_space.n)
+            obs, reward, done, truncated, _ = env.step(action)
+            full.append(obs, action, reward)
+            log.append(action)
+            if done or truncated or env.win_frame:
+                env.reset()
+                log.reset()
+    env.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that replaying action logs rebuilds sessions bit for bit")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=2000, help="steps per session")
+    parser.add_argument("--persona", default="survivor")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="replay on N processes")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        recs, acts = [], []
+        for i in range(args.sessions):
+            recs.append(os.path.join(tmp, f"session_{i}.rec"))
+            acts.append(os.path.join(tmp, f"session_{i}.act"))
+            record(recs[-1], acts[-1], args.seed + i, args.persona, args.steps, rng)
+
+        start = time.perf_counter()
+        replayed = replay_files(acts, workers=args.workers, log_dir=tmp)
+        elapsed = time.perf_counter() - start
+
+        ok = True
+        for rec, act, (_, traj) in zip(recs, acts, replayed):
+            _, records = load_session(rec)
+            match = (np.array_equal(records["obs"], traj["obs"])
+                     and np.array_equal(records["action"], traj["action"])
+                     and np.array_equal(records["reward"], traj["reward"]))
+            ok &= match
+            print(f"{os.path.basename(act)}: {len(records)} steps, {traj['episode'][-1] + 1} episodes, "
+                  f"{os.path.getsize(rec)} -> {os.path.getsize(act)} bytes "
+                  f"({os.path.getsize(rec) / os.path.getsize(act):.0f}x)  {'ok' if match else 'MISMATCH'}")
+
+    total = args.sessions * args.steps
+    print(f"replayed {total} steps in {elapsed:.2f}s ({total / elapsed:.0f} steps/s)")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
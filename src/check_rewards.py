@@ -0,0 +1,124 @@
+import argparse
+import numpy as np
+from isaac_lite.env import IsaacLiteEnv
+from isaac_lite.game import ROOM_W, ROOM_H
+from isaac_lite.rewards import TERMS, RewardFn
+from isaac_lite.vec_env import IsaacLiteVecEnv
+
+# Middle of each wall's door, in DIRECTIONS order (N, S, W, E)
+DOOR_XY = ((ROOM_W / 2, 0.0), (ROOM_W / 2, ROOM_H), (0.0, ROOM_H / 2), (ROOM_W, ROOM_H / 2))
+
+
+def door_action(x, y, d):
+    """Move action heading for the middle of door `d`."""
+    dx, dy = DOOR_XY[d][0] - x, DOOR_XY[d][1] - y
+    if abs(dx) > abs(dy):
+        return 3 if dx > 0 else 2
+    return 1 if dy > 0 else 0
+
+
+def target(doors, t):
+    """Door to walk to at step t: cycles through the room's doors."""
+    return doors[t // 97 % len(doors)] if doors else t // 97 % 4
+
+
+def check_env(seed, persona, steps):
+    """Walks one IsaacLiteEnv from door to door; returns (crossings, moving
+    reward paid on crossing steps)."""
+    env = IsaacLiteEnv(seed=seed, persona=persona, max_steps=None, reward_breakdown=True, log_dir="/tmp")
+    env.reset()
+    g = env.game
+    crossings, paid, last = 0, 0.0, 0.0
+    for t in range(steps):
+        room = g.room
+        _, _, done, truncated, info = env.step(door_action(g.player_x, g.player_y, target(g.doors, t)))
+        moving = info["reward_terms"]["moving"]
+        if g.room != room:
+            crossings += 1
+            paid += moving - last
+        last = moving
+        if done or truncated:
+            break
+    env.close()
+    return crossings, paid
+
+
+def check_vec(seed, persona, steps, n_envs):
+    """Same walk on IsaacLiteVecEnv, every env at once."""
+    env = IsaacLiteVecEnv(n_envs=n_envs, seed=seed, persona=persona, max_steps=None, reward_breakdown=True,
+                          log_dir="/tmp")
+    env.reset()
+    g = env.game
+    crossings, paid = 0, 0.0
+    last = np.zeros(n_envs)
+    for t in range(steps):
+        actions = np.array([door_action(g.player_x[i], g.player_y[i], target(g.doors[i], t))
+                            for i in range(n_envs)])
+        _, _, dones, infos = env.step(actions)
+        moving = np.array([info["reward_terms"]["moving"] for info in infos])
+        entered = g.entered & ~dones
+        crossings += int(entered.sum())
+        paid += float((moving - last)[entered].sum())
+        last = np.where(dones, 0.0, moving)
+    env.close()
+    return crossings, paid
+
+
+def random_signals(rng, n):
+    """One tick's signals for n envs, as arrays, in SIGNALS order."""
+    return (rng.integers(0, 2, n), rng.integers(0, 2, n), rng.integers(0, 2, n), rng.uniform(0, 5, n),
+            rng.integers(0, 9, n), rng.random(n) < 0.1, rng.random(n) < 0.5, rng.random(n) < 0.5)
+
+
+def check_personas(n_envs):
+    """Empty and constant-only personas, and scalar/batch agreement for a
+    persona using every term; returns a list of failures."""
+    rng = np.random.default_rng(0)
+    signals = random_signals(rng, n_envs)
+    failures = []
+    for fn in (RewardFn("empty", {}), RewardFn("empty_clipped", {}, clip=(-2.0, 2.0)),
+               RewardFn("constant", {"survival": 0.03, "step_cost": -0.01}, clip=(-2.0, 2.0)),
+               RewardFn("every_term", {name: 0.1 * (i + 1) for i, name in enumerate(TERMS)}, clip=(-2.0, 2.0))):
+        batch = fn.batch(*signals)
+        terms = fn.batch_terms(*signals)
+        if np.shape(batch) != (n_envs,) or any(np.shape(t) != (n_envs,) for t in terms):
+            failures.append(f"{fn.persona}: batch shapes {np.shape(batch)}, {[np.shape(t) for t in terms]}")
+        if len(fn.scalar_terms(*(s[0].item() for s in signals))) != len(fn.names) or len(terms) != len(fn.names):
+            failures.append(f"{fn.persona}: expected {len(fn.names)} terms")
+        scalar = [fn.scalar(*(s[i].item() for s in signals)) for i in range(n_envs)]
+        if not np.allclose(scalar, batch):
+            failures.append(f"{fn.persona}: scalar and batch rewards differ")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check reward edge cases: empty and constant personas, "
+                                                 "and walking through a door is not movement")
+    parser.add_argument("--seeds", type=int, default=4)
+    parser.add_argument("--persona", default="explorer")
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument("--n-envs", type=int, default=8)
+    args = parser.parse_args()
+
+    failures = check_personas(args.n_envs)
+    for f in failures:
+        print(f"FAIL {f}")
+    print(f"personas: {'ok' if not failures else 'FAIL'}")
+    ok = not failures
+    for seed in range(args.seeds):
+        crossings, paid = check_env(seed, args.persona, args.steps)
+        good = crossings > 0 and paid == 0.0
+        ok &= good
+        print(f"env seed {seed}: {crossings} door crossings, moving reward on them {paid:.3f} "
+              f"{'ok' if good else 'FAIL'}")
+    crossings, paid = check_vec(0, args.persona, args.steps, args.n_envs)
+    good = crossings > 0 and paid == 0.0
+    ok &= good
+    print(f"vec env x{args.n_envs}: {crossings} door crossings, moving reward on them {paid:.3f} "
+          f"{'ok' if good else 'FAIL'}")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import random
+import timeit
+import numpy as np
+from isaac_lite.env import IsaacLiteEnv
+
+
+def run(env, actions):
+    """Steps `actions` and returns everything the env hands back, for comparison."""
+    out = []
+    for a in actions:
+        obs, reward, done, truncated, info = env.step(a)
+        out.append((np.array(obs, copy=True), reward, done, truncated, dict(info)))
+        if done or truncated:
+            break
+    return out
+
+
+def same(a, b):
+    if len(a) != len(b):
+        return False
+    for (o1, r1, d1, t1, i1), (o2, r2, d2, t2, i2) in zip(a, b):
+        if not np.array_equal(o1, o2) or (r1, d1, t1, i1) != (r2, d2, t2, i2):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that set_state(get_state()) continues an episode bit for bit")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--persona", default="survivor")
+    parser.add_argument("--obs", choices=["vector", "pixels"], default="vector")
+    parser.add_argument("--warmup", type=int, default=60, help="random steps before the snapshot")
+    parser.add_argument("--steps", type=int, default=100, help="steps replayed after the snapshot")
+    args = parser.parse_args()
+
+    kwargs = dict(seed=args.seed, persona=args.persona, max_steps=None, obs_type=args.obs, log_dir="/tmp")
+    env = IsaacLiteEnv(**kwargs)
+    env.reset()
+    rng = random.Random(args.seed)
+    for _ in range(args.warmup):
+        env.step(rng.randrange(env.action_space.n))
+
+    blob = env.get_state()
+    actions = [rng.randrange(env.action_space.n) for _ in range(args.steps)]
+    first = run(env, actions)
+
+    env.set_state(blob)
+    again = run(env, actions)
+
+    fresh = IsaacLiteEnv(**dict(kwargs, seed=args.seed + 1000))
+    fresh.reset()
+    fresh.set_state(blob)
+    elsewhere = run(fresh, actions)
+
+    print(f"state blob: {len(blob)} bytes")
+    print(f"get_state: {min(timeit.repeat(env.get_state, number=200, repeat=3)) / 200 * 1e6:.1f} us")
+    print(f"set_state: {min(timeit.repeat(lambda: env.set_state(blob), number=200, repeat=3)) / 200 * 1e6:.1f} us")
+    print(f"restore in place:   {'ok' if same(first, again) else 'MISMATCH'} ({len(first)} steps)")
+    print(f"restore into fresh: {'ok' if same(first, elsewhere) else 'MISMATCH'}")
+    env.close()
+    fresh.close()
+    if not (same(first, again) and same(first, elsewhere)):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
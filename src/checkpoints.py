@@ -0,0 +1,35 @@
+import argparse
+from isaac_lite.registry import DEFAULT_INDEX, CheckpointRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index model checkpoints and query the best ones")
+    parser.add_argument("command", choices=["scan", "list", "best"])
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="SQLite index file")
+    parser.add_argument("--roots", nargs="+", default=["logs"], help="directories to scan for .zip checkpoints")
+    parser.add_argument("--algo", choices=["ppo", "a2c"])
+    parser.add_argument("--persona")
+    parser.add_argument("--order-by", choices=["eval_score", "timesteps", "mtime_ns"], default="eval_score")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--all", action="store_true", help="list identical copies too")
+    args = parser.parse_args()
+
+    registry = CheckpointRegistry(args.index)
+    changed, removed = registry.scan(args.roots)
+    if args.command == "scan":
+        print(f"Indexed {changed} new/changed checkpoints, dropped {removed} missing ({args.index})")
+    elif args.command == "best":
+        print(registry.best(algo=args.algo, persona=args.persona, order_by=args.order_by) or "no match")
+    else:
+        rows = registry.find(algo=args.algo, persona=args.persona, order_by=args.order_by,
+                             dedupe=not args.all, limit=args.limit)
+        print(f"{'algo':<5} {'persona':<9} {'run':>4} {'timesteps':>10} {'eval':>8}  path")
+        for r in rows:
+            score = f"{r['eval_score']:8.2f}" if r["eval_score"] is not None else f"{'-':>8}"
+            run = r["run"] if r["run"] is not None else "-"
+            print(f"{r['algo'] or '?':<5} {r['persona'] or '?':<9} {run:>4} {r['timesteps'] or 0:>10} {score}  {r['path']}")
+    registry.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import glob
+import os
+from isaac_lite.recording import convert_json, load_session
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert legacy JSON human sessions to the binary .rec format")
+    parser.add_argument("paths", nargs="*", default=["logs/human_sessions/"],
+                        help="session .json files or directories of them")
+    parser.add_argument("--persona", default="survivor", help="persona to record in the header")
+    parser.add_argument("--force", action="store_true", help="overwrite existing .rec files")
+    args = parser.parse_args()
+
+    files = []
+    for p in args.paths:
+        files.extend(sorted(glob.glob(os.path.join(p, "*.json"))) if os.path.isdir(p) else [p])
+
+    for path in files:
+        out = os.path.splitext(path)[0] + ".rec"
+        if os.path.exists(out) and not args.force:
+            print(f"skip {path} ({out} exists)")
+            continue
+        convert_json(path, out, persona=args.persona)
+        header, records = load_session(out)
+        print(f"{path} -> {out}: {len(records)} steps, obs_dim {header['obs_dim']}, "
+              f"{os.path.getsize(path) / 1024:.0f} KiB -> {os.path.getsize(out) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,166 @@
-import argparse, os, json, glob, pandas as pd
-from stable_baselines3 import PPO
-from isaac_lite.env import IsaacLiteEnv
+import argparse, glob, os, time, pandas as pd
+import numpy as np
+from isaac_lite.vec_env import IsaacLiteVecEnv
+from isaac_lite.subproc_vec_env import SubprocIsaacLiteVecEnv
+from isaac_lite.registry import DEFAULT_INDEX, CheckpointRegistry, load_model
+
+METRICS = ["return", "length", "enemies_killed", "damage_taken", "truncated"]
+
+
+def expand_models(paths):
+    """Model .zip paths from files, directories (searched recursively) and globs."""
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            found.extend(glob.glob(os.path.join(p, "**", "*.zip"), recursive=True))
+        else:
+            found.extend(glob.glob(p) or [p])
+    return sorted(dict.fromkeys(found))
+
+
+def evaluate(model, env, episodes, seed):
+    """Runs `episodes` episodes over the envs of `env`, episode k on game seed
+    seed + k, predicting actions for every env in one batch per step.
+    Returns one dict per episode, in episode order."""
+    n = env.num_envs
+
+    # Episode k runs on seed + k; envs that run out of episodes idle
+    episode = np.full(n, -1)
+    obs = env.reset().copy()
+    next_ep = 0
+    for i in range(min(n, episodes)):
+        obs[i] = env.env_method("reset_env", seed + next_ep, indices=i)[0]
+        episode[i] = next_ep
+        next_ep += 1
+
+    ret = np.zeros(n)
+    length = np.zeros(n, dtype=np.int64)
+    kills = np.zeros(n, dtype=np.int64)
+    damage = np.zeros(n, dtype=np.int64)
+    rows = []
+    while len(rows) < episodes:
+        actions, _ = model.predict(obs, deterministic=True)
+        obs, rewards, dones, infos = env.step(actions)
+        obs = obs.copy()
+        ret += rewards
+        length += 1
+        kills += [info["enemies_killed"] for info in infos]
+        damage += [info["damage_taken"] for info in infos]
+
+        for i in np.flatnonzero(dones):
+            if episode[i] >= 0:
+                rows.append({
+                    "episode": int(episode[i]),
+                    "seed": seed + int(episode[i]),
+                    "return": float(ret[i]),
+                    "length": int(length[i]),
+                    "enemies_killed": int(kills[i]),
+                    "damage_taken": int(damage[i]),
+                    "truncated": bool(infos[i]["TimeLimit.truncated"]),
+                })
+            ret[i] = length[i] = kills[i] = damage[i] = 0
+            if next_ep < episodes:
+                obs[i] = env.env_method("reset_env", seed + next_ep, indices=i)[0]
+                episode[i] = next_ep
+                next_ep += 1
+            else:
+                episode[i] = -1
+    return sorted(rows, key=lambda r: r["episode"])
+
+
+def summarize(df, z=1.96):
+    """Mean, std and normal-approximation confidence interval per model."""
+    out = []
+    for model, g in df.groupby("model", sort=False):
+        row = {"model": model, "episodes": len(g)}
+        for m in METRICS:
+            x = g[m].astype(float)
+            half = z * x.std(ddof=1) / np.sqrt(len(x)) if len(x) > 1 else float("nan")
+            row[f"{m}_mean"] = x.mean()
+            row[f"{m}_std"] = x.std(ddof=1)
+            row[f"{m}_ci_low"] = x.mean() - half
+            row[f"{m}_ci_high"] = x.mean() + half
+        out.append(row)
+    return pd.DataFrame(out).sort_values("return_mean", ascending=False, ignore_index=True)
+
+
+def write_table(df, path):
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
 
 def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--model", required=True)
-    parser.add_argument("--seed", type=int, default=7)
+    parser = argparse.ArgumentParser(description="Evaluate and rank checkpoints on the same seeded episodes")
+    parser.add_argument("--model", nargs="+", default=[], help="checkpoint files, directories or globs")
+    parser.add_argument("--from-registry", action="store_true",
+                        help="also evaluate every indexed checkpoint of --persona (and --algo)")
+    parser.add_argument("--algo", choices=["ppo", "a2c"], help="filter for --from-registry")
+    parser.add_argument("--registry", default=DEFAULT_INDEX, help="checkpoint index that eval scores are saved to")
+    parser.add_argument("--registry-roots", nargs="+", default=["logs"], help="directories the index covers")
+    parser.add_argument("--seed", type=int, default=7, help="episode k is played on game seed seed + k")
     parser.add_argument("--persona", default="survivor")
-    parser.add_argument("--episodes", type=int, default=50)
-    parser.add_argument("--out", default="results.csv")
+    parser.add_argument("--episodes", type=int, default=50, help="episodes per checkpoint")
+    parser.add_argument("--n-envs", type=int, default=16, help="envs stepped together, one batched predict per step")
+    parser.add_argument("--workers", type=int, default=0, help="N>0 steps the envs in N worker processes")
+    parser.add_argument("--obs", choices=["vector", "nearest"], default="vector",
+                        help="observation the checkpoints were trained on")
+    parser.add_argument("--max-steps", type=int, default=200, help="game ticks before an episode is truncated")
+    parser.add_argument("--out", default="results.csv", help="per-model summary with 95%% CIs (.csv or .parquet)")
+    parser.add_argument("--episodes-out", default=None, help="optional per-episode table (.csv or .parquet)")
     args = parser.parse_args()
-    env = IsaacLiteEnv(seed=args.seed, persona=args.persona, log_dir="eval_logs")
-    model = PPO.load(args.model)
-    for ep in range(args.episodes):
-        obs, _ = env.reset()
-        done = False
-        while not done:
-            action, _ = model.predict(obs, deterministic=True)
-            obs, rew, done, tr, info = env.step(action)
-        env.save_episode_metrics()
-    files = glob.glob("eval_logs/episode_*.json")
-    data = []
-    for f in files:
-        with open(f) as fh:
-            data.append(json.load(fh))
-    df = pd.DataFrame(data)
-    df.to_csv(args.out, index=False)
+
+    # Incremental rescan, so new checkpoints can be ranked and scored
+    registry = CheckpointRegistry(args.registry)
+    registry.scan(args.registry_roots)
+    paths = expand_models(args.model)
+    if args.from_registry:
+        paths += [r["path"] for r in registry.find(algo=args.algo, persona=args.persona)]
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        parser.error("no checkpoints matched --model / --from-registry")
+
+    n_envs = min(args.n_envs, args.episodes)
+    env_kwargs = dict(seed=args.seed, persona=args.persona, max_steps=args.max_steps, obs_type=args.obs,
+                      log_dir="eval_logs")
+    if args.workers > 0:
+        env = SubprocIsaacLiteVecEnv(n_envs, min(args.workers, n_envs), **env_kwargs)
+    else:
+        env = IsaacLiteVecEnv(n_envs, **env_kwargs)
+
+    frames = []
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            model = load_model(path)
+            if model.observation_space.shape != env.observation_space.shape:
+                print(f"{path}: skipped, observation shape {model.observation_space.shape} does not match "
+                      f"--obs {args.obs} {env.observation_space.shape}")
+                continue
+            rows = evaluate(model, env, args.episodes, args.seed)
+            df = pd.DataFrame(rows)
+            df.insert(0, "model", path)
+            frames.append(df)
+            registry.record_eval(path, df["return"].mean(), len(df))
+            print(f"{path}: return {df['return'].mean():8.2f}  length {df['length'].mean():6.1f}  "
+                  f"({time.perf_counter() - start:.1f}s)")
+    finally:
+        env.close()
+        registry.close()
+
+    if not frames:
+        parser.error("none of the checkpoints could be evaluated")
+    episodes = pd.concat(frames, ignore_index=True)
+    summary = summarize(episodes)
+    write_table(summary, args.out)
+    if args.episodes_out:
+        write_table(episodes, args.episodes_out)
+
+    print(f"\nRanking ({args.episodes} episodes each, 95% CI):")
+    for i, r in summary.iterrows():
+        print(f"{i + 1:3d}. {r['return_mean']:8.2f} [{r['return_ci_low']:8.2f}, {r['return_ci_high']:8.2f}]  "
+              f"len {r['length_mean']:6.1f}  {r['model']}")
     print("Saved", args.out)
 
 if __name__ == "__main__":
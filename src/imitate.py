@@ -1,62 +1,192 @@
+import argparse
 import json
 import os
+import time
 import numpy as np
 import torch
+import yaml
+from torch.utils.data import BatchSampler, DataLoader, RandomSampler, SequentialSampler, TensorDataset
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
 from isaac_lite.env import IsaacLiteEnv
+from isaac_lite.recording import load_session
+from isaac_lite.replay import replay_file
 
+OBS_DIM = 20
+DEFAULT_CONFIG = "configs/imitate.yml"
+# configs/imitate.yml key -> argparse dest
+CONFIG_KEYS = {"data_path": "data", "persona": "persona", "epochs": "epochs", "batch_size": "batch_size",
+               "learning_rate": "lr", "val_frac": "val_frac", "patience": "patience", "seed": "seed",
+               "output_model": "out"}
 
-def train_from_human_data(data_path="logs/human_sessions/", persona='survivor'):
-    # Auto-detect session file
+
+def load_sessions(data_path, obs_dim=OBS_DIM):
+    """Loads every session under `data_path` (or one file) as (obs, actions).
+
+    Action logs (.act) are replayed to rebuild their observations. Binary
+    .rec recordings are preferred over a legacy .json with the same name.
+    Older sessions with narrower observations are zero-padded to `obs_dim`
+    so they can be trained on together.
+    """
     if os.path.isdir(data_path):
-        json_files = [f for f in os.listdir(data_path) if f.endswith(".json")]
-        if not json_files:
-            raise FileNotFoundError(f"No JSON files found in {data_path}")
-        data_path = os.path.join(data_path, sorted(json_files)[-1])
+        names = sorted(os.listdir(data_path))
+        recs = {os.path.splitext(f)[0] for f in names if f.endswith(".rec")}
+        files = [os.path.join(data_path, f) for f in names
+                 if f.endswith((".act", ".rec")) or (f.endswith(".json") and os.path.splitext(f)[0] not in recs)]
+    else:
+        files = [data_path]
+    if not files:
+        raise FileNotFoundError(f"No session files found in {data_path}")
+
+    all_obs, all_actions = [], []
+    for path in files:
+        if path.endswith(".act"):
+            _, traj = replay_file(path)
+            obs, actions = traj["obs"], traj["action"]
+        elif path.endswith(".rec"):
+            _, records = load_session(path)
+            obs, actions = records["obs"], records["action"]
+        else:
+            with open(path, "r") as f:
+                data = json.load(f)
+            obs = np.array([d["obs"] for d in data], dtype=np.float32).reshape(len(data), -1)
+            actions = np.array([d["action"] for d in data], dtype=np.int64)
+        if len(actions) == 0:
+            continue
+
+        padded = np.zeros((len(actions), obs_dim), dtype=np.float32)
+        padded[:, :min(obs.shape[1], obs_dim)] = obs[:, :obs_dim]
+        all_obs.append(padded)
+        all_actions.append(np.asarray(actions, dtype=np.int64))
+        print(f"📁 {path}: {len(actions)} steps, obs_dim {obs.shape[1]}")
+
+    if not all_actions:
+        raise ValueError("❌ No data found in human sessions. Did you record gameplay first?")
+    return np.concatenate(all_obs), np.concatenate(all_actions)
+
+
+def _batches(obs, actions, batch_size, shuffle):
+    # Each loader item is a whole mini-batch sliced out of the tensors at once,
+    # instead of batch_size single-sample fetches and a collate
+    dataset = TensorDataset(torch.as_tensor(obs), torch.as_tensor(actions))
+    sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    return DataLoader(dataset, sampler=BatchSampler(sampler, batch_size, drop_last=False), batch_size=None)
+
 
-    print(f"📁 Using human data file: {data_path}")
+def _evaluate(policy, loader):
+    total_loss, correct, n = 0.0, 0, 0
+    with torch.no_grad():
+        for o, a in loader:
+            _, log_prob, _ = policy.evaluate_actions(o, a)
+            total_loss -= log_prob.sum().item()
+            correct += (policy.get_distribution(o).mode() == a).sum().item()
+            n += len(a)
+    return total_loss / max(n, 1), correct / max(n, 1)
 
-    # Load human session data
-    with open(data_path, "r") as f:
-        data = json.load(f)
 
-    if not data:
-        raise ValueError("❌ No data found in human session file. Did you record gameplay first?")
+def train_epoch(policy, optimizer, loader):
+    """One pass of BC over `loader`; returns (summed loss, samples seen)."""
+    policy.set_training_mode(True)
+    total_loss, seen = 0.0, 0
+    for o, a in loader:
+        _, log_prob, _ = policy.evaluate_actions(o, a)
+        loss = -log_prob.mean()
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+        total_loss += loss.item() * len(a)
+        seen += len(a)
+    return total_loss, seen
 
-    obs = np.array([d["obs"] for d in data], dtype=np.float32)
-    actions = np.array([d["action"] for d in data], dtype=np.int64)
+
+def train_from_human_data(data_path="logs/human_sessions/", persona='survivor', epochs=50, batch_size=256,
+                          lr=1e-3, val_frac=0.1, patience=5, seed=42, save_path=None):
+    obs, actions = load_sessions(data_path)
+
+    # Train / validation split over shuffled steps
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(actions))
+    n_val = int(len(order) * val_frac)
+    val_idx, train_idx = order[:n_val], order[n_val:]
+    train_loader = _batches(obs[train_idx], actions[train_idx], batch_size, shuffle=True)
+    val_loader = _batches(obs[val_idx], actions[val_idx], batch_size, shuffle=False) if n_val else None
+    print(f"Training on {len(train_idx)} steps, validating on {n_val}")
 
     # Create environment
-    seed = 42
+    torch.manual_seed(seed)
     env = make_vec_env(lambda: IsaacLiteEnv(persona=persona), n_envs=1, seed=seed)
 
-    # Initialize PPO
-    model = PPO("MlpPolicy", env, verbose=1, device="cpu")
+    # Initialize PPO; BC trains its policy network
+    model = PPO("MlpPolicy", env, verbose=0, device="cpu", seed=seed)
+    policy = model.policy
+    optimizer = torch.optim.Adam(policy.parameters(), lr=lr)
 
-    # Behavioral cloning pretraining
-    optimizer = model.policy.optimizer
-    optimizer.zero_grad()
+    best_loss, best_state, bad_epochs = float("inf"), None, 0
+    start = time.perf_counter()
+    seen = 0
+    for epoch in range(1, epochs + 1):
+        train_loss, n = train_epoch(policy, optimizer, train_loader)
+        seen += n
+        train_loss /= len(train_idx)
 
-    total_loss = 0
-    for o, a in zip(obs, actions):
-        o_tensor = torch.tensor([o], dtype=torch.float32)
-        a_tensor = torch.tensor([a], dtype=torch.long)
-        loss, _, _ = model.policy.evaluate_actions(o_tensor, a_tensor)
-        loss.mean().backward()
-        total_loss += loss.item()
+        policy.set_training_mode(False)
+        msg = f"epoch {epoch:3d}  train loss {train_loss:.4f}"
+        if val_loader is None:
+            print(msg)
+            continue
+        val_loss, val_acc = _evaluate(policy, val_loader)
+        print(f"{msg}  val loss {val_loss:.4f}  val acc {val_acc:.3f}")
 
-    optimizer.step()
+        # Early stopping on validation loss; keep the best weights
+        if val_loss < best_loss - 1e-4:
+            best_loss, bad_epochs = val_loss, 0
+            best_state = {k: v.clone() for k, v in policy.state_dict().items()}
+        else:
+            bad_epochs += 1
+            if bad_epochs >= patience:
+                print(f"Early stopping: no val improvement for {patience} epochs")
+                break
 
-    model_path = f"logs/ppo_bc_pretrained_{persona}.zip"
+    elapsed = time.perf_counter() - start
+    print(f"Throughput: {seen / elapsed:,.0f} samples/sec ({seen} samples in {elapsed:.2f}s)")
+    if best_state is not None:
+        policy.load_state_dict(best_state)
+
+    model_path = save_path or f"logs/ppo_bc_pretrained_{persona}.zip"
     model.save(model_path)
     print(f"Saved imitation-trained model to: {model_path}")
-    print(f"Average imitation loss: {total_loss / len(obs):.4f}")
+    return model
 
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Behavioral cloning from recorded human sessions")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="YAML whose values replace the defaults below")
+    parser.add_argument("--data", default="logs/human_sessions/", help="session directory or a single file")
+    parser.add_argument("--persona", default="survivor")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--val-frac", type=float, default=0.1)
+    parser.add_argument("--patience", type=int, default=5, help="epochs without val improvement before stopping")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="defaults to logs/ppo_bc_pretrained_<persona>.zip")
+    # Config values become the defaults, so command-line flags still win
+    config = parser.parse_known_args()[0].config
+    if config and os.path.exists(config):
+        with open(config) as f:
+            cfg = yaml.safe_load(f) or {}
+        parser.set_defaults(**{dest: cfg[key] for key, dest in CONFIG_KEYS.items() if key in cfg})
+    args = parser.parse_args()
+    if args.out:
+        args.out = args.out.format(persona=args.persona)
     try:
-        train_from_human_data("logs/human_sessions/", persona='survivor')
+        train_from_human_data(args.data, persona=args.persona, epochs=args.epochs, batch_size=args.batch_size,
+                              lr=args.lr, val_frac=args.val_frac, patience=args.patience, seed=args.seed,
+                              save_path=args.out)
     except Exception as e:
         print(f"Error during imitation training: {e}")
         print("Make sure you have a human gameplay recording from solo.py in 'logs/human_sessions/'")
+
+
+if __name__ == "__main__":
+    main()
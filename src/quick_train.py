@@ -1,6 +1,5 @@
-import os, time
-from stable_baselines3 import PPO, A2C
-from isaac_lite.env import IsaacLiteEnv
+import argparse, os
+from sweep import expand_jobs, run_sweep
 
 # Config
 PERSONAS = ["survivor", "explorer"]
@@ -8,20 +7,27 @@ ALGOS = ["ppo", "a2c"]
 TIMESTEPS = 10000
 RUNS_PER_PERSONA = 3
 
-for persona in PERSONAS:
-    for algo in ALGOS:
-        MODEL_DIR = f"logs/{algo}_{persona}"
-        os.makedirs(MODEL_DIR, exist_ok=True)
 
-        for run_id in range(RUNS_PER_PERSONA):
-            print(f"\n=== Training {algo.upper()} for {persona} | Run {run_id+1}/{RUNS_PER_PERSONA} ===")
-            env = IsaacLiteEnv(persona=persona, seed=run_id)
-            model_class = PPO if algo == "ppo" else A2C
-            model = model_class("MlpPolicy", env, verbose=1)
-            model.learn(total_timesteps=TIMESTEPS)
+def main():
+    parser = argparse.ArgumentParser(description="Short PPO/A2C x survivor/explorer sweep (see src/sweep.py)")
+    parser.add_argument("--n-envs", type=int, default=1, help="parallel envs; >1 uses the batched IsaacLiteVecEnv")
+    parser.add_argument("--workers", type=int, default=None, help="parallel jobs (default: one per core)")
+    parser.add_argument("--out-dir", default="logs/quick")
+    args = parser.parse_args()
 
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            model_path = f"{MODEL_DIR}/{algo}_{persona}_run{run_id+1}_{timestamp}.zip"
-            model.save(model_path)
-            print(f"Saved {algo.upper()} model: {model_path}!")
-            env.close()
+    jobs = expand_jobs({
+        "algos": ALGOS,
+        "personas": PERSONAS,
+        "runs": RUNS_PER_PERSONA,
+        "seed": 0,
+        "total_timesteps": TIMESTEPS,
+        "n_envs": args.n_envs,
+        "env": "configs/env.yaml",
+        "out_dir": args.out_dir,
+    })
+    os.makedirs(args.out_dir, exist_ok=True)
+    run_sweep(jobs, workers=args.workers, summary_path=os.path.join(args.out_dir, "results.csv"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,21 @@
 import pygame
-import json
 import time
-import os
 from isaac_lite.env import IsaacLiteEnv
+from isaac_lite.recording import ActionRecorder
 
-def play_and_record(output_path="logs/human_sessions/session.json", persona='survivor'):
+def play_and_record(output_path="logs/human_sessions/session.act", persona='survivor'):
     pygame.init()
     screen = pygame.display.set_mode((800, 600))
     pygame.display.set_caption("Isaac Lite - Human Play Mode")
     clock = pygame.time.Clock()
 
-    env = IsaacLiteEnv(persona=persona)
+    env = IsaacLiteEnv(persona=persona, max_steps=None)  # human sessions run until death or ESC
     obs, info = env.reset()
     done = False
-    data = []
+    # Only actions are stored; observations and rewards are rebuilt with
+    # isaac_lite.replay, which replays them through the same seeded env
+    recorder = ActionRecorder(output_path, persona=persona, seed=env.seed_val, max_steps=None,
+                              max_rooms=env.game.max_rooms)
     font = pygame.font.SysFont("consolas", 24)
 
     key_to_action = {
@@ -24,10 +26,6 @@ def play_and_record(output_path="logs/human_sessions/session.json", persona='sur
         pygame.K_SPACE: 4
     }
 
-    output_dir = os.path.dirname(output_path)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
-
     print("🎮 Controls: Arrow keys to move, SPACE to shoot, ESC to quit.")
 
     # Game loop
@@ -60,11 +58,7 @@ def play_and_record(output_path="logs/human_sessions/session.json", persona='sur
         clock.tick(30)
 
         # Record data
-        data.append({
-            "obs": obs.tolist(),
-            "action": int(action),
-            "reward": float(reward)
-        })
+        recorder.append(action)
 
         # Handle win/loss screens with pause
         if env.win_frame or env.death_frame:
@@ -77,17 +71,17 @@ def play_and_record(output_path="logs/human_sessions/session.json", persona='sur
             pygame.display.flip()
             time.sleep(3)
             obs, info = env.reset()
+            recorder.reset()
 
     # Cleanup
     env.close()
     pygame.quit()
 
-    # Save data
-    with open(output_path, "w") as f:
-        json.dump(data, f, indent=2)
-    print(f"Human session saved: {output_path}")
+    # Flush the last partial chunk
+    recorder.close()
+    print(f"Human session saved: {output_path} ({len(recorder)} steps)")
 
 if __name__ == "__main__":
     timestamp = int(time.time())
-    output_file = f"logs/human_sessions/session_{timestamp}.json"
+    output_file = f"logs/human_sessions/session_{timestamp}.act"
     play_and_record(output_path=output_file)
@@ -0,0 +1,185 @@
+import argparse
+import concurrent.futures as cf
+import inspect
+import itertools
+import json
+import multiprocessing as mp
+import os
+import time
+import yaml
+
+ALGO_CONFIGS = {"ppo": "configs/ppo.yaml", "a2c": "configs/a2c.yaml"}
+# Keys of configs/<algo>.yaml that describe a run rather than the algorithm
+RUN_KEYS = {"algo", "policy", "total_timesteps", "seed", "tensorboard_log", "save_path", "persona"}
+
+
+def load_yaml(path):
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
+def expand_jobs(sweep):
+    """Turns a sweep config into one job dict per algo x persona x run."""
+    env_cfg = load_yaml(sweep["env"]).get("env", {}) if sweep.get("env") else {}
+    env_kwargs = {k: env_cfg[k] for k in ("max_steps", "max_rooms") if k in env_cfg}
+    algo_files = dict(ALGO_CONFIGS, **sweep.get("algo_configs", {}))
+    seed = sweep.get("seed", env_cfg.get("seed", 0))
+
+    jobs = []
+    for algo, persona, run in itertools.product(sweep["algos"], sweep["personas"], range(1, sweep.get("runs", 1) + 1)):
+        algo_cfg = load_yaml(algo_files[algo])
+        name = f"{algo}_{persona}_run{run}"
+        jobs.append({
+            "name": name,
+            "algo": algo,
+            "persona": persona,
+            "run": run,
+            "seed": seed + run - 1,
+            "policy": algo_cfg.get("policy", "MlpPolicy"),
+            "total_timesteps": sweep.get("total_timesteps", algo_cfg.get("total_timesteps", 10000)),
+            "hyperparams": {k: v for k, v in algo_cfg.items() if k not in RUN_KEYS},
+            "hyperparams_override": sweep.get("hyperparams", {}).get(algo, {}),
+            "env_kwargs": env_kwargs,
+            "n_envs": sweep.get("n_envs", 1),
+            "checkpoint_every": sweep.get("checkpoint_every", 10000),
+            "run_dir": os.path.join(sweep["out_dir"], name),
+        })
+    return jobs
+
+
+def _init_worker(threads):
+    # Runs before torch is imported in the worker, so BLAS/OpenMP pools obey it too
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    import torch
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+
+def _save_atomic(model, path):
+    # SB3 appends .zip; write a temp file first so a kill never leaves a torn checkpoint
+    tmp = path[:-len(".zip")] + "_tmp"
+    model.save(tmp)
+    os.replace(tmp + ".zip", path)
+
+
+def run_job(job):
+    """Trains one job in its run directory, resuming from its last checkpoint."""
+    from stable_baselines3 import A2C, PPO
+    from stable_baselines3.common.callbacks import BaseCallback
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecMonitor
+    from isaac_lite.env import IsaacLiteEnv
+    from isaac_lite.vec_env import IsaacLiteVecEnv
+
+    run_dir = job["run_dir"]
+    os.makedirs(run_dir, exist_ok=True)
+    with open(os.path.join(run_dir, "job.json"), "w") as f:
+        json.dump(job, f, indent=2)
+
+    metrics_path = os.path.join(run_dir, "episodes.jsonl")
+    if job["n_envs"] > 1:
+        env = IsaacLiteVecEnv(job["n_envs"], seed=job["seed"], persona=job["persona"], log_dir=run_dir,
+                              metrics_path=metrics_path, **job["env_kwargs"])
+    else:
+        env = DummyVecEnv([lambda: IsaacLiteEnv(seed=job["seed"], persona=job["persona"], log_dir=run_dir,
+                                                metrics_path=metrics_path, **job["env_kwargs"])])
+    env = VecMonitor(env)
+
+    cls = PPO if job["algo"] == "ppo" else A2C
+    ckpt = os.path.join(run_dir, "checkpoint.zip")
+    resumed = os.path.exists(ckpt)
+    if resumed:
+        model = cls.load(ckpt, env=env, device="cpu")
+    else:
+        # Drop keys the algorithm doesn't take (a2c.yaml lists a batch_size)
+        accepted = inspect.signature(cls.__init__).parameters
+        params = dict(job["hyperparams"], **job["hyperparams_override"])
+        params = {k: v for k, v in params.items() if k in accepted}
+        model = cls(job["policy"], env, seed=job["seed"], device="cpu", verbose=0,
+                    tensorboard_log=run_dir, **params)
+
+    class Checkpoint(BaseCallback):
+        def _on_step(self):
+            if self.num_timesteps % job["checkpoint_every"] < env.num_envs:
+                _save_atomic(self.model, ckpt)
+            return True
+
+    start = time.time()
+    remaining = job["total_timesteps"] - model.num_timesteps
+    if remaining > 0:
+        model.learn(total_timesteps=remaining, reset_num_timesteps=not resumed, tb_log_name=job["name"],
+                    callback=Checkpoint())
+
+    model_path = os.path.join(run_dir, f"{job['name']}_final.zip")
+    _save_atomic(model, model_path)
+    env.close()
+
+    result = {
+        "name": job["name"], "algo": job["algo"], "persona": job["persona"], "run": job["run"],
+        "seed": job["seed"], "timesteps": model.num_timesteps, "elapsed": time.time() - start,
+        "resumed": resumed, "model_path": model_path,
+    }
+    # The done marker is written last; a job without it is rerun (and resumed)
+    with open(os.path.join(run_dir, "done.json"), "w") as f:
+        json.dump(result, f, indent=2)
+    if os.path.exists(ckpt):
+        os.remove(ckpt)
+    return result
+
+
+def run_sweep(jobs, workers=None, threads_per_job=1, summary_path=None):
+    """Runs the jobs that have no done.json yet on a process pool and writes
+    every job's result (old and new) to `summary_path` as CSV."""
+    results, todo = [], []
+    for job in jobs:
+        done = os.path.join(job["run_dir"], "done.json")
+        if os.path.exists(done):
+            with open(done) as f:
+                results.append(json.load(f))
+        else:
+            todo.append(job)
+    print(f"{len(jobs)} jobs: {len(results)} already done, {len(todo)} to run")
+
+    if todo:
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) // threads_per_job)
+        workers = min(workers, len(todo))
+        print(f"Running on {workers} worker(s) x {threads_per_job} torch thread(s)")
+        ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+        with cf.ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                                    initargs=(threads_per_job,)) as pool:
+            futures = {pool.submit(run_job, job): job for job in todo}
+            for fut in cf.as_completed(futures):
+                job = futures[fut]
+                try:
+                    r = fut.result()
+                except Exception as e:
+                    print(f"[failed] {job['name']}: {e!r}")
+                    continue
+                results.append(r)
+                print(f"[done] {r['name']}: {r['timesteps']} steps in {r['elapsed']:.1f}s"
+                      + (" (resumed)" if r["resumed"] else ""))
+
+    if summary_path and results:
+        import pandas as pd
+        pd.DataFrame(sorted(results, key=lambda r: r["name"])).to_csv(summary_path, index=False)
+        print(f"Saved {summary_path}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a config-driven training sweep on a process pool")
+    parser.add_argument("config", nargs="?", default="configs/sweep.yaml")
+    parser.add_argument("--workers", type=int, default=None, help="parallel jobs (default: cores / threads)")
+    parser.add_argument("--threads-per-job", type=int, default=1, help="torch/BLAS threads per job")
+    args = parser.parse_args()
+
+    sweep = load_yaml(args.config)
+    jobs = expand_jobs(sweep)
+    os.makedirs(sweep["out_dir"], exist_ok=True)
+    run_sweep(jobs, workers=args.workers, threads_per_job=args.threads_per_job,
+              summary_path=os.path.join(sweep["out_dir"], "results.csv"))
+
+
+if __name__ == "__main__":
+    main()
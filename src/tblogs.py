@@ -0,0 +1,41 @@
+import argparse
+import os
+import time
+from isaac_lite.tblogs import DEFAULT_CACHE, REWARD_TAG, ScalarStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache TensorBoard scalars in Parquet and query them")
+    parser.add_argument("command", choices=["scan", "runs", "tags", "curves"])
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="directory holding the Parquet cache")
+    parser.add_argument("--roots", nargs="+", default=["logs"], help="directories to scan for tfevents files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parse changed files on N processes")
+    parser.add_argument("--tag", default=REWARD_TAG, help="scalar tag for curves")
+    parser.add_argument("--algo", choices=["ppo", "a2c"])
+    parser.add_argument("--persona")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--out", default=None, help="write curves to this .csv or .parquet instead of printing")
+    args = parser.parse_args()
+
+    store = ScalarStore(args.cache)
+    start = time.perf_counter()
+    changed, removed = store.scan(args.roots, workers=args.workers)
+    if args.command == "scan":
+        print(f"Parsed {changed} new/changed event files, dropped {removed} missing "
+              f"({time.perf_counter() - start:.2f}s, {args.cache})")
+    elif args.command == "runs":
+        print(store.runs().to_string(index=False))
+    elif args.command == "tags":
+        print("\n".join(store.tags()))
+    else:
+        df = store.reward_curves(algo=args.algo, persona=args.persona, seed=args.seed, tag=args.tag)
+        if args.out is None:
+            print(df.to_string(index=False))
+        elif args.out.endswith(".parquet"):
+            df.to_parquet(args.out, index=False)
+        else:
+            df.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,38 +2,86 @@
 import argparse
 import os
 from stable_baselines3 import PPO, A2C
+from stable_baselines3.common.callbacks import BaseCallback
 from stable_baselines3.common.vec_env import DummyVecEnv, VecMonitor
 from isaac_lite.env import IsaacLiteEnv
+from isaac_lite.profiler import merge_stats
+from isaac_lite.vec_env import IsaacLiteVecEnv
+from isaac_lite.subproc_vec_env import SubprocIsaacLiteVecEnv
 
-def make_env(seed, persona):
+def make_env(seed, persona, obs_type="vector", frame_skip=1, metrics_path=None, profile=False):
     def _init():
-        env = IsaacLiteEnv(seed=seed, persona=persona)
+        env = IsaacLiteEnv(seed=seed, persona=persona, obs_type=obs_type, frame_skip=frame_skip,
+                           metrics_path=metrics_path, profile=profile)
         return env
     return _init
 
+
+class StepProfileCallback(BaseCallback):
+    """Logs the envs' per-phase step timings to TensorBoard after every rollout."""
+
+    def _on_step(self):
+        return True
+
+    def _on_rollout_end(self):
+        stats = merge_stats(self.training_env.env_method("profiler_stats", reset=True))
+        step_ns = stats.get("step", {}).get("total_ns", 0)
+        for name, st in stats.items():
+            self.logger.record(f"profile/{name}_us", st["mean_us"])
+            if name != "step" and step_ns:
+                self.logger.record(f"profile/{name}_share", st["total_ns"] / step_ns)
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--algo", choices=["ppo", "a2c"], default="ppo")
     parser.add_argument("--timesteps", type=int, default=200000)
     parser.add_argument("--seed", type=int, default=7)
-    parser.add_argument("--persona", choices=["survivor", "explorer"], default="survivor")
+    parser.add_argument("--persona", default="survivor", help="a persona from configs/personas.yaml")
     parser.add_argument("--logdir", default="logs")  # switched to logs for TensorBoard
+    parser.add_argument("--n-envs", type=int, default=1, help="parallel envs; >1 uses the batched IsaacLiteVecEnv")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="0 steps envs in-process; N>0 splits --n-envs across N worker processes")
+    parser.add_argument("--obs", choices=["vector", "nearest", "pixels"], default="vector",
+                        help="nearest observes the k nearest enemies and powerups; "
+                             "pixels trains a CnnPolicy on stacked 84x84 grayscale frames")
+    parser.add_argument("--frame-skip", type=int, default=1, help="game ticks per agent decision (action repeat)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the phases of IsaacLiteEnv.step and log them under profile/ in TensorBoard")
     args = parser.parse_args()
+    single = args.obs == "pixels" or args.frame_skip > 1 or args.profile
+    if single and args.workers > 0:
+        parser.error("--obs pixels, --frame-skip and --profile run on DummyVecEnv; drop --workers")
 
     # Create log directory
     os.makedirs(args.logdir, exist_ok=True)
+    tb_name = f"{args.algo}_{args.persona}_seed{args.seed}"
+
+    # Every finished episode is appended here (JSONL, buffered)
+    metrics_path = os.path.join(args.logdir, f"{tb_name}_episodes.jsonl")
 
     # Setup environment
-    env = DummyVecEnv([make_env(args.seed, args.persona)])
+    if single:
+        env = DummyVecEnv([make_env(args.seed + i, args.persona, args.obs, args.frame_skip, metrics_path,
+                                    args.profile) for i in range(args.n_envs)])
+    elif args.workers > 0:
+        env = SubprocIsaacLiteVecEnv(args.n_envs, args.workers, seed=args.seed, persona=args.persona,
+                                     obs_type=args.obs, metrics_path=metrics_path)
+    elif args.n_envs > 1:
+        env = IsaacLiteVecEnv(args.n_envs, seed=args.seed, persona=args.persona, obs_type=args.obs,
+                              metrics_path=metrics_path)
+    else:
+        env = DummyVecEnv([make_env(args.seed, args.persona, args.obs, metrics_path=metrics_path)])
     env = VecMonitor(env)
 
     # Network architecture
     policy_kwargs = dict(net_arch=[dict(pi=[64, 64], vf=[64, 64])])
 
+    policy = "CnnPolicy" if args.obs == "pixels" else "MlpPolicy"
+
     # Adds the tensorboard_log to both PPO and A2C
     if args.algo == "ppo":
         model = PPO(
-            "MlpPolicy",
+            policy,
             env,
             verbose=1,
             seed=args.seed,
@@ -42,7 +90,7 @@ def main():
         )
     else:
         model = A2C(
-            "MlpPolicy",
+            policy,
             env,
             verbose=1,
             seed=args.seed,
@@ -51,12 +99,13 @@ def main():
         )
 
     # Add tb_log_name for clear run separation
-    tb_name = f"{args.algo}_{args.persona}_seed{args.seed}"
-    model.learn(total_timesteps=args.timesteps, tb_log_name=tb_name)
+    model.learn(total_timesteps=args.timesteps, tb_log_name=tb_name,
+                callback=StepProfileCallback() if args.profile else None)
 
     # Save final model
     model.save(f"{args.logdir}/{args.algo}_{args.persona}_seed{args.seed}")
-    env.env_method("save_episode_metrics")
+    env.env_method("save_episode_metrics", indices=0)
+    env.close()
     print(f"Training complete. Model saved to {args.logdir}/{args.algo}_{args.persona}_seed{args.seed}")
 
 if __name__ == "__main__":
@@ -1,133 +1,239 @@
+import argparse
+import math
 import os
+import threading
+import time
 import pygame
 import numpy as np
-from stable_baselines3 import PPO, A2C
 from isaac_lite.env import IsaacLiteEnv
-from isaac_lite.game import ROOM_W, ROOM_H
+from isaac_lite.registry import CheckpointRegistry, load_model
+from isaac_lite.render import FRAME_W, FRAME_H
+from eval import expand_models
 
+LABEL_COLOR = (255, 255, 255)
+MAX_WINDOW_W = 1600
 
-def list_and_select_model(folder, algo_name):
-    """List available models and let user pick by index."""
-    if not os.path.exists(folder):
-        raise FileNotFoundError(f"Model folder not found: {folder}")
 
-    models = [f for f in os.listdir(folder) if f.endswith(".zip") and algo_name in f.lower()]
-    if not models:
-        raise FileNotFoundError(f"No models found in {folder}")
+def list_and_select_model(registry, algo_name, persona="explorer"):
+    """List indexed models, best eval score first, and let user pick by index."""
+    rows = registry.find(algo=algo_name, persona=persona)
+    if not rows:
+        raise FileNotFoundError(f"No {algo_name.upper()} {persona} models indexed; run src/checkpoints.py scan")
 
-    models.sort()
     print(f"\n=== {algo_name.upper()} MODELS FOUND ===")
-    for i, m in enumerate(models, 1):
-        print(f"[{i}] {m}")
+    for i, r in enumerate(rows, 1):
+        score = f"eval {r['eval_score']:.2f}" if r["eval_score"] is not None else "not evaluated"
+        print(f"[{i}] {r['path']} ({score})")
 
-    choice = input(f"Select {algo_name.upper()} run (1-{len(models)}), or Enter for latest: ").strip()
+    choice = input(f"Select {algo_name.upper()} run (1-{len(rows)}), or Enter for best: ").strip()
     if choice.isdigit():
         idx = int(choice)
-        selected = models[min(max(1, idx), len(models)) - 1]
+        selected = rows[min(max(1, idx), len(rows)) - 1]
     else:
-        selected = models[-1]
-
-    path = os.path.join(folder, selected)
-    print(f"Loaded {algo_name.upper()} model: {path}")
-    return path
-
-
-def load_model(path, algo):
-    """Load PPO or A2C model from disk."""
-    if algo == "ppo":
-        return PPO.load(path)
-    elif algo == "a2c":
-        return A2C.load(path)
-    else:
-        raise ValueError("Unknown algorithm type.")
-
-
-def match_obs_shape(model, obs):
-    """Ensures observation matches model’s expected input size."""
-    expected_dim = model.observation_space.shape[0]
-    if len(obs) > expected_dim:
-        return obs[:expected_dim]
-    elif len(obs) < expected_dim:
-        padded = np.zeros(expected_dim)
-        padded[:len(obs)] = obs
-        return padded
-    return obs
+        selected = rows[0]
+
+    print(f"Loaded {algo_name.upper()} model: {selected['path']}")
+    return selected["path"]
+
+
+class Spectator:
+    """Steps one IsaacLiteEnv per (checkpoint, seed) agent on a worker thread.
+
+    Each step makes one batched predict per checkpoint over all of its agents.
+    The simulation runs uncapped (or at `sim_fps`) and only renders when the
+    display asks for a frame, so a slow viewer never slows the agents down.
+    Agent j of a checkpoint plays seeds seed + j, seed + j + n_seeds, ..., so
+    every checkpoint sees the same sequence of games.
+    """
+
+    def __init__(self, paths, n_seeds=1, seed=0, persona="explorer", obs_type="vector", max_steps=200,
+                 scale=None, cols=None, sim_fps=0):
+        self.n_seeds = n_seeds
+        self.seed = seed
+        self.sim_fps = sim_fps
+
+        # Checkpoints trained on another observation are skipped, as in eval.py
+        probe = IsaacLiteEnv(obs_type=obs_type)
+        shape = probe.observation_space.shape
+        probe.close()
+        self.paths, self.models = [], []
+        for path in paths:
+            model = load_model(path)
+            if model.observation_space.shape != shape:
+                print(f"{path}: skipped, observation shape {model.observation_space.shape} does not match "
+                      f"--obs {obs_type} {shape}")
+                continue
+            self.paths.append(path)
+            self.models.append(model)
+        if not self.paths:
+            raise ValueError(f"No checkpoint matches --obs {obs_type}")
+        n = len(self.paths) * n_seeds
+        self.envs = [IsaacLiteEnv(seed=seed + j, persona=persona, obs_type=obs_type, max_steps=max_steps,
+                                  render_mode="rgb_array_headless")
+                     for _ in self.paths for j in range(n_seeds)]
+        self.obs = np.stack([env.reset()[0] for env in self.envs])
+        self.episodes = np.zeros(n, dtype=np.int64)
+        self.returns = np.zeros(n)
+        self.last_return = np.full(n, np.nan)
+        self.steps = 0
+
+        # Grid of downscaled tiles, written by the worker and read by the display;
+        # by default square-ish and about MAX_WINDOW_W wide
+        self.cols = cols or math.ceil(math.sqrt(n))
+        self.scale = scale or max(1, math.ceil(self.cols * FRAME_W / MAX_WINDOW_W))
+        self.rows = math.ceil(n / self.cols)
+        self.tile_w = len(range(0, FRAME_W, self.scale))
+        self.tile_h = len(range(0, FRAME_H, self.scale))
+        self.grid = np.zeros((self.rows * self.tile_h, self.cols * self.tile_w, 3), dtype=np.uint8)
+        self.lock = threading.Lock()
+        self.want_frame = threading.Event()
+        self.frame_ready = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    # SIMULATION
+    def start(self):
+        self.want_frame.set()
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        for env in self.envs:
+            env.close()
+
+    def _run(self):
+        period = 1.0 / self.sim_fps if self.sim_fps > 0 else 0.0
+        next_t = time.perf_counter()
+        while not self.stop_event.is_set():
+            self.step()
+            if self.want_frame.is_set():
+                self.want_frame.clear()
+                self._draw()
+                self.frame_ready.set()
+            if period:
+                next_t += period
+                delay = next_t - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_t = time.perf_counter()
+
+    def step(self):
+        actions = np.empty(len(self.envs), dtype=np.int64)
+        for m, model in enumerate(self.models):
+            rows = slice(m * self.n_seeds, (m + 1) * self.n_seeds)
+            actions[rows], _ = model.predict(self.obs[rows], deterministic=True)
+
+        for i, env in enumerate(self.envs):
+            obs, reward, done, truncated, _ = env.step(int(actions[i]))
+            self.returns[i] += reward
+            if done or truncated:
+                self.last_return[i] = self.returns[i]
+                self.returns[i] = 0.0
+                self.episodes[i] += 1
+                obs, _ = env.reset(seed=self.seed + i % self.n_seeds + int(self.episodes[i]) * self.n_seeds)
+            self.obs[i] = obs
+        self.steps += 1
+
+    def _draw(self):
+        with self.lock:
+            for i, env in enumerate(self.envs):
+                r, c = divmod(i, self.cols)
+                frame = env.render()[::self.scale, ::self.scale]
+                self.grid[r * self.tile_h:(r + 1) * self.tile_h, c * self.tile_w:(c + 1) * self.tile_w] = frame
+
+    # DISPLAY
+    def label(self, i):
+        path = self.paths[i // self.n_seeds]
+        name = os.path.splitext(os.path.basename(path))[0]
+        last = "" if np.isnan(self.last_return[i]) else f"  last {self.last_return[i]:.1f}"
+        return f"{name}  seed {self.envs[i].seed_val}  ep {self.episodes[i]}{last}"
+
+    def blit(self, screen):
+        """Copies the latest grid to `screen`; False when no new frame is ready."""
+        if not self.frame_ready.is_set():
+            return False
+        self.frame_ready.clear()
+        with self.lock:
+            pygame.surfarray.blit_array(screen, self.grid.swapaxes(0, 1))
+        self.want_frame.set()
+        return True
 
 
 def main():
-    print("🎮 Comparing PPO and A2C agents side by side. Press ESC to quit.")
+    parser = argparse.ArgumentParser(description="Watch trained agents, tiled in a grid")
+    parser.add_argument("--model", nargs="+", default=[], help="checkpoint files, directories or globs")
+    parser.add_argument("--from-registry", type=int, default=0, metavar="N",
+                        help="also watch the N best-scoring indexed checkpoints for --persona")
+    parser.add_argument("--persona", default="explorer")
+    parser.add_argument("--seeds", type=int, default=1, help="agents per checkpoint, each on its own seed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--obs", choices=["vector", "nearest"], default="vector")
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--cols", type=int, default=None, help="grid columns (default: square-ish)")
+    parser.add_argument("--scale", type=int, default=None,
+                        help="draw every Nth pixel of each frame (default: fit the grid in ~1600px)")
+    parser.add_argument("--fps", type=int, default=60, help="display refresh rate")
+    parser.add_argument("--sim-fps", type=int, default=0, help="game steps per second; 0 runs uncapped")
+    args = parser.parse_args()
 
     # Path autodetect for your project structure
     ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     LOG_DIR = os.path.join(ROOT_DIR, "logs")
 
-    ppo_dir = os.path.join(LOG_DIR, "ppo_explorer")
-    a2c_dir = os.path.join(LOG_DIR, "a2c_explorer")
-
-    # Load models interactively
-    ppo_path = list_and_select_model(ppo_dir, "ppo")
-    a2c_path = list_and_select_model(a2c_dir, "a2c")
-
-    model_ppo = load_model(ppo_path, "ppo")
-    model_a2c = load_model(a2c_path, "a2c")
-
-    # Create environments
-    env_left = IsaacLiteEnv(persona='explorer')
-    env_right = IsaacLiteEnv(persona='explorer')
-
-    obs_left, _ = env_left.reset()
-    obs_right, _ = env_right.reset()
+    # Checkpoint index; the rescan only touches new or changed files
+    registry = CheckpointRegistry(os.path.join(LOG_DIR, "checkpoints.db"))
+    registry.scan([LOG_DIR])
+    paths = expand_models(args.model)
+    if args.from_registry:
+        paths += [r["path"] for r in registry.find(persona=args.persona, limit=args.from_registry)]
+    if not paths:
+        # Classic PPO vs A2C comparison, picked interactively
+        paths = [list_and_select_model(registry, "ppo", args.persona),
+                 list_and_select_model(registry, "a2c", args.persona)]
+    registry.close()
+    paths = list(dict.fromkeys(paths))
+
+    spectator = Spectator(paths, n_seeds=args.seeds, seed=args.seed, persona=args.persona, obs_type=args.obs,
+                          max_steps=args.max_steps, scale=args.scale, cols=args.cols, sim_fps=args.sim_fps)
+    n, scale = len(spectator.envs), spectator.scale
+    print(f"🎮 Watching {n} agents ({len(spectator.paths)} checkpoints x {args.seeds} seeds). Press ESC to quit.")
 
     # Init display
     pygame.init()
-    screen_width = (ROOM_W + 150) * 2
-    screen_height = ROOM_H
-    screen = pygame.display.set_mode((screen_width, screen_height))
-    pygame.display.set_caption("PPO vs A2C Comparison")
-
+    screen = pygame.display.set_mode(spectator.grid.shape[1::-1])
+    font = pygame.font.SysFont(None, max(14, 24 // scale + 8))
     clock = pygame.time.Clock()
-    running = True
-
-    while running:
-        # Handle input events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                running = False
-
-        # Match shapes automatically before prediction
-        obs_left = match_obs_shape(model_ppo, obs_left)
-        obs_right = match_obs_shape(model_a2c, obs_right)
-
-        # Predict actions
-        action_ppo, _ = model_ppo.predict(obs_left, deterministic=True)
-        action_a2c, _ = model_a2c.predict(obs_right, deterministic=True)
-
-        # Step both environments
-        obs_left, _, done_left, _, _ = env_left.step(int(action_ppo))
-        obs_right, _, done_right, _, _ = env_right.step(int(action_a2c))
-
-        # Render frames
-        frame_left = env_left.render()
-        frame_right = env_right.render()
 
-        surf_left = pygame.surfarray.make_surface(np.transpose(frame_left, (1, 0, 2)))
-        surf_right = pygame.surfarray.make_surface(np.transpose(frame_right, (1, 0, 2)))
-
-        screen.blit(surf_left, (0, 0))
-        screen.blit(surf_right, (ROOM_W + 150, 0))
-
-        pygame.display.flip()
-        clock.tick(30)
-
-        # Auto-reset on episode end
-        if done_left:
-            obs_left, _ = env_left.reset()
-        if done_right:
-            obs_right, _ = env_right.reset()
-
-    pygame.quit()
+    spectator.start()
+    running = True
+    last_steps, last_t = 0, time.perf_counter()
+    try:
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    running = False
+
+            if spectator.blit(screen):
+                for i in range(n):
+                    r, c = divmod(i, spectator.cols)
+                    text = font.render(spectator.label(i), True, LABEL_COLOR)
+                    screen.blit(text, (c * spectator.tile_w + 4, (r + 1) * spectator.tile_h - text.get_height() - 2))
+                pygame.display.flip()
+
+            # Simulation speed in the title, about once a second
+            now = time.perf_counter()
+            if now - last_t >= 1.0:
+                steps = spectator.steps
+                pygame.display.set_caption(f"{n} agents - {(steps - last_steps) / (now - last_t):.0f} steps/s")
+                last_steps, last_t = steps, now
+            clock.tick(args.fps)
+    finally:
+        spectator.stop()
+        pygame.quit()
 
 
 if __name__ == "__main__":